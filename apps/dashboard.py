@@ -5,12 +5,13 @@ Web dashboard for trading strategy
 import streamlit as st
 import sys
 sys.path.append('scripts')
+sys.path.append('.')
 
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
-import yfinance as yf
+from src.data.data_source import get_data_source
 
 st.set_page_config(
     page_title="Trading Strategy Dashboard",
@@ -34,8 +35,7 @@ def main():
     
     try:
         # Get stock data
-        ticker = yf.Ticker(symbol)
-        data = ticker.history(period=period)
+        data = get_data_source().history(symbol, period=period)
         
         if not data.empty:
             current_price = data['Close'].iloc[-1]
@@ -3,14 +3,16 @@
 Symbol Manager - Search and manage trading symbols
 """
 from flask import Blueprint, render_template, jsonify, request
-import yfinance as yf
 import json
 import os
 import sqlite3
 from datetime import datetime
-import requests
 import pandas as pd
 
+from src.data.data_source import get_data_source
+from src.data.metadata_store import get_metadata_store
+from src.utils.http_client import get_http_client
+
 symbol_bp = Blueprint('symbols', __name__, url_prefix='/symbols')
 
 # Database setup
@@ -66,7 +68,7 @@ def search_symbols():
         try:
             url = f"https://query2.finance.yahoo.com/v1/finance/search?q={query}&quotesCount=20&newsCount=0"
             headers = {'User-Agent': 'Mozilla/5.0'}
-            response = requests.get(url, headers=headers)
+            response = get_http_client().get(url, headers=headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -77,18 +79,7 @@ def search_symbols():
                             
                             if market == 'all' or market.lower() == market_type.lower():
                                 # Get current price
-                                price = None
-                                change = None
-                                try:
-                                    ticker = yf.Ticker(quote['symbol'])
-                                    hist = ticker.history(period='2d')
-                                    if not hist.empty:
-                                        price = hist['Close'].iloc[-1]
-                                        if len(hist) > 1:
-                                            prev_close = hist['Close'].iloc[-2]
-                                            change = ((price - prev_close) / prev_close) * 100
-                                except:
-                                    pass
+                                price, change = get_price_and_change(quote['symbol'])
                                 
                                 results.append({
                                     'symbol': quote['symbol'],
@@ -104,8 +95,7 @@ def search_symbols():
         if not results:
             try:
                 # Try exact symbol match
-                ticker = yf.Ticker(query)
-                info = ticker.info
+                info = get_data_source().info(query)
                 
                 if info and 'symbol' in info:
                     market_type = get_market_type(info)
@@ -133,18 +123,7 @@ def search_symbols():
                 if (query_upper in symbol) or (query_lower in data['name'].lower()):
                     if market == 'all' or market.lower() == data['market'].lower():
                         # Try to get current price
-                        price = None
-                        change = None
-                        try:
-                            ticker = yf.Ticker(symbol)
-                            hist = ticker.history(period='2d')
-                            if not hist.empty:
-                                price = hist['Close'].iloc[-1]
-                                if len(hist) > 1:
-                                    prev_close = hist['Close'].iloc[-2]
-                                    change = ((price - prev_close) / prev_close) * 100
-                        except:
-                            pass
+                        price, change = get_price_and_change(symbol)
                         
                         results.append({
                             'symbol': symbol,
@@ -163,6 +142,22 @@ def search_symbols():
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+def get_price_and_change(symbol):
+    """Get the latest price and percentage change from the previous close"""
+    price = None
+    change = None
+    try:
+        hist = get_data_source().history(symbol, period='2d')
+        if not hist.empty:
+            price = hist['Close'].iloc[-1]
+            if len(hist) > 1:
+                prev_close = hist['Close'].iloc[-2]
+                change = ((price - prev_close) / prev_close) * 100
+    except:
+        pass
+    
+    return price, change
+
 def get_market_type_from_quote(quote):
     """Determine market type from Yahoo Finance quote"""
     if 'quoteType' in quote:
@@ -305,28 +300,21 @@ def get_watchlist():
         cursor.execute('SELECT * FROM watchlist ORDER BY added_date DESC')
         rows = cursor.fetchall()
         
+        # Sector comes from the local metadata table, one query for the whole list
+        metadata = get_metadata_store().get_many([row['symbol'] for row in rows])
+        
         watchlist = []
         for row in rows:
             symbol = row['symbol']
             
             # Try to get current price and change
-            price = None
-            change = None
-            try:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period='2d')
-                if not hist.empty:
-                    price = hist['Close'].iloc[-1]
-                    if len(hist) > 1:
-                        prev_close = hist['Close'].iloc[-2]
-                        change = ((price - prev_close) / prev_close) * 100
-            except:
-                pass
+            price, change = get_price_and_change(symbol)
             
             watchlist.append({
                 'symbol': symbol,
                 'name': row['name'],
                 'market': row['market'],
+                'sector': metadata.get(symbol, {}).get('sector'),
                 'price': price,
                 'change': change
             })
@@ -370,6 +358,9 @@ def add_to_watchlist():
         conn.commit()
         conn.close()
         
+        # Cache the symbol's metadata so later sector lookups stay local
+        get_metadata_store().refresh_many([symbol])
+        
         return jsonify({'status': 'success', 'message': f'{symbol} added to watchlist'})
     
     except Exception as e:
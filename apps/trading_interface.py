@@ -3,9 +3,12 @@
 Trading Interface - Execute trades and manage your trading strategy
 """
 import streamlit as st
+import sys
+sys.path.append('.')
+
 import pandas as pd
 import plotly.graph_objects as go
-import yfinance as yf
+from src.data.data_source import get_data_source
 from datetime import datetime, timedelta
 import time
 
@@ -48,8 +51,7 @@ def main():
     
     # Get current price
     try:
-        ticker = yf.Ticker(symbol)
-        data = ticker.history(period="1d")
+        data = get_data_source().history(symbol, period="1d")
         if not data.empty:
             current_price = data['Close'].iloc[-1]
             st.metric("Current Price", f"₹{current_price:.2f}")
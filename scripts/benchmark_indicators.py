@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Indicator micro-benchmarks.
+
+Times every TechnicalIndicators method and add_all_indicators on synthetic
+OHLCV data at several sizes and dtypes, and reports wall time, peak memory and
+throughput. Results are written as JSON so runs from different versions can
+be compared:
+
+    python scripts/benchmark_indicators.py
+    python scripts/benchmark_indicators.py --sizes 1000 100000 --compare data/results/old.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('.')
+from src.utils.indicator_cache import disable_indicator_cache
+from src.utils.technical_indicators import TechnicalIndicators, add_all_indicators
+
+DEFAULT_SIZES = [1_000, 100_000, 10_000_000]
+DEFAULT_DTYPES = ['float64', 'float32']
+RESULTS_DIR = os.path.join('data', 'results')
+
+# Benchmark name -> function of the OHLCV DataFrame
+BENCHMARKS = {
+    'simple_moving_average': lambda df: TechnicalIndicators.simple_moving_average(df['Close'], 20),
+    'exponential_moving_average': lambda df: TechnicalIndicators.exponential_moving_average(df['Close'], 20),
+    'relative_strength_index': lambda df: TechnicalIndicators.relative_strength_index(df['Close'], 14),
+    'macd': lambda df: TechnicalIndicators.macd(df['Close']),
+    'bollinger_bands': lambda df: TechnicalIndicators.bollinger_bands(df['Close']),
+    'stochastic_oscillator': lambda df: TechnicalIndicators.stochastic_oscillator(df['High'], df['Low'], df['Close']),
+    'average_true_range': lambda df: TechnicalIndicators.average_true_range(df['High'], df['Low'], df['Close']),
+    'commodity_channel_index': lambda df: TechnicalIndicators.commodity_channel_index(df['High'], df['Low'], df['Close']),
+    'williams_percent_r': lambda df: TechnicalIndicators.williams_percent_r(df['High'], df['Low'], df['Close']),
+    'on_balance_volume': lambda df: TechnicalIndicators.on_balance_volume(df['Close'], df['Volume']),
+    'money_flow_index': lambda df: TechnicalIndicators.money_flow_index(df['High'], df['Low'], df['Close'], df['Volume']),
+    'add_all_indicators': add_all_indicators,
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark technical indicators on synthetic data.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Row counts to benchmark")
+    parser.add_argument("--dtypes", nargs="+", default=DEFAULT_DTYPES, choices=DEFAULT_DTYPES, help="Price dtypes")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per case (best is reported)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Stop repeating once a case has run this many seconds in total")
+    parser.add_argument("--output", type=str, help="JSON output path (default: data/results/indicator_benchmark_<time>.json)")
+    parser.add_argument("--compare", type=str, help="Earlier results file to compare against")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic data")
+    return parser.parse_args()
+
+
+def synthetic_ohlcv(rows, dtype='float64', seed=42):
+    """Random-walk OHLCV data with a RangeIndex (large sizes do not fit a calendar)."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    spread = close * rng.uniform(0, 0.01, rows)
+    open_ = close * (1 + rng.normal(0, 0.003, rows))
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    return pd.DataFrame({
+        'Open': open_.astype(dtype),
+        'High': high.astype(dtype),
+        'Low': low.astype(dtype),
+        'Close': close.astype(dtype),
+        'Volume': rng.integers(1_000, 1_000_000, rows),
+    })
+
+
+def run_case(fn, df, repeat, min_time):
+    """Time fn(df) and measure its peak traced memory."""
+    times = []
+    started = time.perf_counter()
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn(df)
+        times.append(time.perf_counter() - t0)
+        if time.perf_counter() - started >= min_time:
+            break
+
+    # Separate run: tracing allocations slows the code under test down
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    fn(df)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(times)
+    return {
+        'best_seconds': best,
+        'median_seconds': float(np.median(times)),
+        'runs': len(times),
+        'peak_memory_bytes': int(peak - base),
+        'rows_per_second': len(df) / best if best > 0 else float('inf'),
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+    }
+
+
+def compare(results, baseline_path):
+    """Print the speed ratio of each case against an earlier results file."""
+    with open(baseline_path, 'r') as f:
+        baseline = {(r['benchmark'], r['rows'], r['dtype']): r for r in json.load(f)['results']}
+
+    print(f"\nComparison with {baseline_path} (ratio > 1 means slower now):")
+    matched = 0
+    for result in results:
+        old = baseline.get((result['benchmark'], result['rows'], result['dtype']))
+        if old is None:
+            continue
+        matched += 1
+        ratio = result['best_seconds'] / old['best_seconds'] if old['best_seconds'] else float('nan')
+        flag = '  <-- slower' if ratio > 1.1 else ('  faster' if ratio < 0.9 else '')
+        print(f"  {result['benchmark']:<28} {result['rows']:>10} {result['dtype']:<8} {ratio:6.2f}x{flag}")
+    if not matched:
+        print("  No cases in common")
+
+
+def main():
+    args = parse_args()
+    logging.disable(logging.INFO)
+    disable_indicator_cache()  # Measure the computation, not cache lookups
+
+    names = args.only or list(BENCHMARKS)
+    results = []
+    print(f"{'benchmark':<28} {'rows':>10} {'dtype':<8} {'best ms':>10} {'peak MB':>9} {'rows/s':>12}")
+    for rows in args.sizes:
+        for dtype in args.dtypes:
+            df = synthetic_ohlcv(rows, dtype, args.seed)
+            for name in names:
+                result = {'benchmark': name, 'rows': rows, 'dtype': dtype,
+                          **run_case(BENCHMARKS[name], df, args.repeat, args.min_time)}
+                results.append(result)
+                print(f"{name:<28} {rows:>10} {dtype:<8} {1000 * result['best_seconds']:>10.2f} "
+                      f"{result['peak_memory_bytes'] / 2**20:>9.1f} {result['rows_per_second']:>12.3g}")
+            del df
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"indicator_benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'created': datetime.now().isoformat(), 'environment': environment(),
+                   'results': results}, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Complete Project Demo - Showcase all features
 """
 import sys
 sys.path.append('scripts')
+sys.path.append('.')
 
 import time
 import pandas as pd
@@ -11,7 +12,7 @@ from datetime import datetime
 import matplotlib.pyplot as plt
 from paper_trading import PaperTradingAccount
 from risk_management import RiskManager
-import yfinance as yf
+from src.data.data_source import get_data_source
 
 def print_header(title):
     """Print formatted header"""
@@ -35,8 +36,7 @@ def demo_data_collection():
     market_data = {}
     for symbol in symbols:
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period="5d")
+            data = get_data_source().history(symbol, period="5d")
             
             if not data.empty:
                 current_price = data['Close'].iloc[-1]
@@ -4,33 +4,46 @@ Real-time strategy monitoring and alerts
 """
 import sys
 sys.path.append('scripts')
+sys.path.append('.')
 
 import time
 import schedule
 from datetime import datetime
-import yfinance as yf
 import pandas as pd
+from src.data.data_source import get_data_source
+from src.data.bar_aggregator import BarAggregator
+from src.data.trading_calendar import get_trading_calendar
 
 class TradingMonitor:
     def __init__(self, symbols=['RELIANCE.NS'], check_interval=15):
         self.symbols = symbols
         self.check_interval = check_interval  # minutes
         self.last_prices = {}
+        self.data_source = get_data_source()
+        self.calendar = get_trading_calendar()
+        # One 1m feed per symbol, resampled locally into higher timeframes
+        self.aggregators = {symbol: BarAggregator() for symbol in symbols}
         
     def check_signals(self):
         """Check for trading signals in real-time"""
         print(f"🔍 Checking signals at {datetime.now().strftime('%H:%M:%S')}")
         
+        # Prices cannot move outside a session
+        if not self.calendar.is_open():
+            print(f"⏸️  Market closed, next open {self.calendar.next_open():%Y-%m-%d %H:%M}")
+            return
+        
         for symbol in self.symbols:
             try:
-                # Get latest data
-                ticker = yf.Ticker(symbol)
-                data = ticker.history(period="5d", interval="1m")
+                # Get today's 1m bars; the aggregator skips bars it has already seen
+                data = self.data_source.history(symbol, period="1d", interval="1m")
                 
-                if data.empty:
+                aggregator = self.aggregators.setdefault(symbol, BarAggregator())
+                aggregator.update_frame(data)
+                current_price = aggregator.last_price()
+                if current_price is None:
                     continue
                     
-                current_price = data['Close'].iloc[-1]
                 prev_price = self.last_prices.get(symbol, current_price)
                 
                 # Calculate price change
@@ -3,79 +3,92 @@
 Strategy optimization and parameter tuning
 """
 import sys
-sys.path.append('scripts')
+sys.path.append('.')
 
-import pandas as pd
-import numpy as np
-from simple_strategy import *
-import itertools
+import argparse
+import os
+import logging
 
-def optimize_parameters():
+from src.strategy.parameter_sweep import (
+    evaluate_rsi_threshold, parameter_grid, rsi_threshold_arrays, run_sweep
+)
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# Parameter ranges to test
+PARAMETER_GRID = {
+    'threshold': [0.01, 0.015, 0.02, 0.025, 0.03],  # 1% to 3%
+    'rsi_oversold': [20, 25, 30],
+    'rsi_overbought': [70, 75, 80],
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Grid-search strategy parameters with the backtester.")
+    parser.add_argument("--symbol", type=str, default="RELIANCE.NS", help="Stock ticker symbol")
+    parser.add_argument("--period", type=str, default="5y", help="History to backtest on (e.g. 2y, 5y)")
+    parser.add_argument("--synthetic", action="store_true", help="Use synthetic bars instead of downloading")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", type=str, default=None,
+                        help="JSON Lines results file (default: data/results/sweep_<symbol>_<period>.jsonl)")
+    parser.add_argument("--fresh", action="store_true", help="Ignore results from an earlier run")
+    return parser.parse_args()
+
+
+def load_data(symbol, period, synthetic=False):
+    if synthetic:
+        from src.data.data_source import generate_synthetic_bars
+        periods = {'1y': 252, '2y': 504, '5y': 1260, '10y': 2520}.get(period, 1260)
+        return generate_synthetic_bars(symbol, periods=periods)
+    from src.data.data_collector import MarketDataCollector
+    return MarketDataCollector().fetch_stock_data(symbol, period=period, interval='1d')
+
+
+def optimize_parameters(symbol="RELIANCE.NS", period="5y", synthetic=False,
+                        workers=None, output=None, fresh=False):
     """Test different parameter combinations to find optimal settings"""
     print("🔧 Optimizing Trading Strategy Parameters...")
     print("=" * 50)
-    
-    # Parameter ranges to test
-    thresholds = [0.01, 0.015, 0.02, 0.025, 0.03]  # 1% to 3%
-    rsi_oversold = [20, 25, 30]
-    rsi_overbought = [70, 75, 80]
-    
-    best_return = -float('inf')
-    best_params = {}
-    results = []
-    
-    print("Testing parameter combinations...")
-    
-    for threshold, rsi_low, rsi_high in itertools.product(thresholds, rsi_oversold, rsi_overbought):
-        try:
-            # Run strategy with these parameters
-            result = test_strategy_params(threshold, rsi_low, rsi_high)
-            results.append({
-                'threshold': threshold,
-                'rsi_oversold': rsi_low,
-                'rsi_overbought': rsi_high,
-                'total_return': result['total_return'],
-                'sharpe_ratio': result['sharpe_ratio'],
-                'max_drawdown': result['max_drawdown'],
-                'num_trades': result['num_trades']
-            })
-            
-            if result['total_return'] > best_return:
-                best_return = result['total_return']
-                best_params = {
-                    'threshold': threshold,
-                    'rsi_oversold': rsi_low,
-                    'rsi_overbought': rsi_high
-                }
-                
-        except Exception as e:
-            continue
-    
+
+    data = load_data(symbol, period, synthetic)
+    if data is None or data.empty:
+        print(f"❌ No data for {symbol}")
+        return None
+
+    combinations = parameter_grid(PARAMETER_GRID)
+    output = output or os.path.join('data', 'results', f"sweep_{symbol}_{period}.jsonl")
+    print(f"Testing {len(combinations)} parameter combinations on {len(data)} bars of {symbol}...")
+    print(f"Results stream to {output}")
+
+    results_df = run_sweep(rsi_threshold_arrays(data), combinations, evaluate_rsi_threshold,
+                           results_path=output, max_workers=workers, resume=not fresh)
+    if 'error' in results_df:
+        failed = results_df['error'].notna()
+        if failed.any():
+            print(f"⚠️ {failed.sum()} combinations failed, e.g. {results_df.loc[failed, 'error'].iloc[0]}")
+        results_df = results_df[~failed]
+    if results_df.empty:
+        print("❌ No successful combinations")
+        return None
+
     # Display results
-    results_df = pd.DataFrame(results)
+    columns = list(PARAMETER_GRID) + ['total_return', 'sharpe_ratio', 'max_drawdown', 'num_trades']
     print("\n📊 Top 5 Parameter Combinations:")
     print("=" * 50)
-    top_results = results_df.nlargest(5, 'total_return')
+    top_results = results_df.nlargest(5, 'total_return')[columns]
     print(top_results.to_string(index=False))
-    
+
+    best = top_results.to_dict('records')[0]
+    best_params = {name: best[name] for name in PARAMETER_GRID}
     print(f"\n🏆 Best Parameters:")
     print(f"Threshold: {best_params['threshold']:.1%}")
     print(f"RSI Oversold: {best_params['rsi_oversold']}")
     print(f"RSI Overbought: {best_params['rsi_overbought']}")
-    print(f"Best Return: {best_return:.2%}")
-    
+    print(f"Best Return: {best['total_return']:.2%}")
+
     return best_params
 
-def test_strategy_params(threshold, rsi_oversold, rsi_overbought):
-    """Test strategy with specific parameters"""
-    # This is a simplified version - you'd implement the full backtesting logic here
-    # For now, return mock results
-    return {
-        'total_return': np.random.uniform(-0.1, 0.3),  # -10% to +30%
-        'sharpe_ratio': np.random.uniform(0, 2),
-        'max_drawdown': np.random.uniform(0, 0.2),
-        'num_trades': np.random.randint(5, 50)
-    }
 
 if __name__ == "__main__":
-    optimize_parameters()
\ No newline at end of file
+    args = parse_args()
+    optimize_parameters(args.symbol, args.period, args.synthetic, args.workers, args.output, args.fresh)
@@ -4,11 +4,11 @@ Automated Trading Bot - Executes trades based on your strategy
 """
 import sys
 sys.path.append('scripts')
+sys.path.append('.')
 
 import time
 import schedule
 from datetime import datetime, timedelta
-import yfinance as yf
 import pandas as pd
 from paper_trading import PaperTradingAccount
 import extract_data
@@ -16,12 +16,21 @@ import prophet_model
 import arima_model
 import rf_model
 from strategy import generate_signals
-from preprocessing import preprocess_data
+from src.data.preprocessor import preprocess_data
+from src.data.data_source import get_data_source
+from src.data.data_collector import MarketDataCollector
+from src.data.prefetch import CacheWarmer
+from src.data.trading_calendar import get_trading_calendar
 
 class TradingBot:
     def __init__(self, symbols=['RELIANCE.NS'], initial_balance=100000):
         self.symbols = symbols
-        self.account = PaperTradingAccount(initial_balance)
+        self.data_source = get_data_source()
+        self.calendar = get_trading_calendar()
+        self.collector = MarketDataCollector(data_source=self.data_source)
+        # Prefetch the bot's history window before the open so the first cycle is a cache hit
+        self.warmer = CacheWarmer(self.collector, symbols=symbols, history=[("60d", "1d")])
+        self.account = PaperTradingAccount(initial_balance, data_source=self.data_source)
         self.account.load_account()  # Load existing account if available
         
         # Strategy parameters
@@ -36,9 +45,7 @@ class TradingBot:
     def get_market_data(self, symbol, period="30d"):
         """Get recent market data for analysis"""
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period=period)
-            return data if not data.empty else None
+            return self.collector.fetch_stock_data(symbol, period=period)
         except Exception as e:
             print(f"Error getting data for {symbol}: {e}")
             return None
@@ -53,8 +60,8 @@ class TradingBot:
             if data is None:
                 return None, "No data available"
             
-            # Preprocess data
-            processed_data = preprocess_data(data)
+            # Preprocess data (the models below only need prices, so skip the full indicator set)
+            processed_data = preprocess_data(data, features=['Log returns'])
             
             # Get predictions from models
             last_dates = processed_data.index[-3:]  # Last 3 days for prediction
@@ -189,6 +196,11 @@ class TradingBot:
         print(f"\n🚀 Trading Cycle Started - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 60)
         
+        # Nothing can fill outside a session, so skip the data fetches
+        if not self.calendar.is_open():
+            print(f"⏸️  Market closed, next open {self.calendar.next_open():%Y-%m-%d %H:%M}")
+            return
+        
         # Check each symbol
         for symbol in self.symbols:
             try:
@@ -251,6 +263,8 @@ class TradingBot:
         
         try:
             while True:
+                if self.warmer.maybe_warm():
+                    print(f"🔥 Market data cache warmed for {', '.join(self.warmer.status['symbols'])}")
                 schedule.run_pending()
                 time.sleep(60)  # Check every minute
         except KeyboardInterrupt:
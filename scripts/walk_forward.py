@@ -1,40 +1,57 @@
-import pandas as pd
-from sklearn.model_selection import TimeSeriesSplit
-from . import prophet_model, arima_model, lstm_model, rf_model
-
-def walk_forward_analysis(data, n_splits=5, train_size=252, test_size=63):
-    """
-    Perform walk-forward optimization
-    train_size: 1 year of trading days
-    test_size: 3 months of trading days
-    """
-    tscv = TimeSeriesSplit(n_splits=n_splits, test_size=test_size)
-    results = []
-    
-    for train_idx, test_idx in tscv.split(data):
-        train_data = data.iloc[train_idx]
-        test_data = data.iloc[test_idx]
-        
-        # Train models
-        prophet_pred = prophet_model.train_prophet_model(train_data, steps=len(test_idx))
-        arima_pred = arima_model.train_arima_model(train_data, steps=len(test_idx))
-        lstm_pred = lstm_model.train_lstm_model(train_data, steps=len(test_idx))
-        rf_pred = rf_model.train_rf_model(train_data, steps=len(test_idx))
-        
-        # Combine predictions
-        ensemble_pred = pd.DataFrame({
-            'prophet': prophet_pred,
-            'arima': arima_pred,
-            'lstm': lstm_pred,
-            'rf': rf_pred
-        }).mean(axis=1)
-        
-        # Calculate metrics
-        period_results = {
-            'period': f"{train_data.index[-1]} to {test_data.index[-1]}",
-            'mse': ((ensemble_pred - test_data['Close'])**2).mean(),
-            'sharpe': calculate_sharpe_ratio(ensemble_pred, test_data['Close'])
-        }
-        results.append(period_results)
-    
-    return pd.DataFrame(results)
\ No newline at end of file
+#!/usr/bin/env python3
+"""
+Walk-forward analysis of the forecasting ensemble
+"""
+import sys
+sys.path.append('.')
+
+import argparse
+import logging
+
+from src.strategy.walk_forward import FORECASTERS, walk_forward_analysis
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Walk-forward evaluation of the forecasting models.")
+    parser.add_argument("--symbol", type=str, default="RELIANCE.NS", help="Stock ticker symbol")
+    parser.add_argument("--period", type=str, default="5y", help="History to evaluate on (e.g. 2y, 5y)")
+    parser.add_argument("--synthetic", action="store_true", help="Use synthetic bars instead of downloading")
+    parser.add_argument("--splits", type=int, default=5, help="Number of folds")
+    parser.add_argument("--train-size", type=int, default=252, help="Training window in trading days")
+    parser.add_argument("--test-size", type=int, default=63, help="Test window in trading days")
+    parser.add_argument("--window", choices=["expanding", "rolling"], default="expanding",
+                        help="Expanding or rolling training windows")
+    parser.add_argument("--models", nargs="+", choices=list(FORECASTERS), default=list(FORECASTERS),
+                        help="Models in the ensemble")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Refit every model instead of reusing forecasts")
+    return parser.parse_args()
+
+
+def load_data(symbol, period, synthetic=False):
+    if synthetic:
+        from src.data.data_source import generate_synthetic_bars
+        periods = {'1y': 252, '2y': 504, '5y': 1260, '10y': 2520}.get(period, 1260)
+        return generate_synthetic_bars(symbol, periods=periods)
+    from src.data.data_collector import MarketDataCollector
+    return MarketDataCollector().fetch_stock_data(symbol, period=period, interval='1d')
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    data = load_data(args.symbol, args.period, args.synthetic)
+    if data is None or data.empty:
+        print(f"❌ No data for {args.symbol}")
+        sys.exit(1)
+
+    print(f"🔁 Walk-forward analysis of {args.symbol}: {args.splits} {args.window} folds, "
+          f"models {', '.join(args.models)}")
+    results = walk_forward_analysis(
+        data, n_splits=args.splits, train_size=args.train_size, test_size=args.test_size,
+        window=args.window, models=args.models, max_workers=args.workers,
+        cache_dir=None if args.no_cache else 'data/walk_forward_cache',
+    )
+    print(results[['period', 'mse', 'sharpe', 'failed_models']].to_string(index=False))
+    print(f"\n📊 Mean MSE: {results['mse'].mean():.4f}  Mean Sharpe: {results['sharpe'].mean():.2f}")
@@ -0,0 +1,216 @@
+"""
+Bar Aggregator Module
+
+Incrementally resamples ticks or 1-minute bars into higher timeframes.
+
+Each update touches only the currently forming bar of every timeframe, so
+keeping 5m/15m/1h/1d bars up to date costs O(1) per incoming bar. Live
+components can then consume one 1-minute feed instead of re-downloading
+every timeframe separately.
+"""
+
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAME_MINUTES = {
+    '1m': 1,
+    '5m': 5,
+    '15m': 15,
+    '30m': 30,
+    '1h': 60,
+    '1d': None,
+}
+
+BAR_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class BarAggregator:
+    """
+    Streaming OHLCV aggregator for a single symbol.
+
+    Intraday buckets are anchored at the session open (09:15 IST for NSE),
+    so 1h bars run 09:15-10:15, 10:15-11:15, ... as exchanges report them.
+    """
+
+    def __init__(self, timeframes: Optional[List[str]] = None,
+                 session_open: str = '09:15', timezone: str = 'Asia/Kolkata',
+                 max_bars: int = 1000,
+                 on_bar_close: Optional[Callable[[str, Dict], None]] = None):
+        """
+        Args:
+            timeframes: Timeframes to maintain (default 5m, 15m, 1h, 1d)
+            session_open: Session open in local time, used to anchor intraday buckets
+            timezone: Exchange timezone
+            max_bars: Completed bars kept per timeframe
+            on_bar_close: Callback(timeframe, bar) invoked when a bar completes
+        """
+        self.timeframes = timeframes or ['5m', '15m', '1h', '1d']
+        unknown = [tf for tf in self.timeframes if tf not in TIMEFRAME_MINUTES]
+        if unknown:
+            raise ValueError(f"Unsupported timeframes: {unknown}")
+
+        self.timezone = timezone
+        self.session_open = pd.Timedelta(f'{session_open}:00')
+        self.on_bar_close = on_bar_close
+
+        self.current: Dict[str, Optional[Dict]] = {tf: None for tf in self.timeframes}
+        self.completed: Dict[str, deque] = {tf: deque(maxlen=max_bars) for tf in self.timeframes}
+
+        self._last_input_time: Optional[pd.Timestamp] = None
+        self._last_input_volume = 0.0
+        self._day: Optional[pd.Timestamp] = None
+        self._day_open: Optional[pd.Timestamp] = None
+
+    def update_bar(self, timestamp, open_: float, high: float, low: float,
+                   close: float, volume: float = 0.0):
+        """
+        Feed one 1-minute bar (timestamp = bar start).
+
+        Re-sending the most recent bar with updated values (a bar that was
+        still forming when first fetched) revises it instead of double counting.
+        """
+        timestamp = self._local(timestamp)
+
+        if self._last_input_time is not None:
+            if timestamp < self._last_input_time:
+                logger.debug(f"Ignoring out-of-order bar at {timestamp}")
+                return
+            if timestamp == self._last_input_time:
+                # Forming bar revision: high/low only widen, volume is replaced
+                volume_delta = volume - self._last_input_volume
+                for tf in self.timeframes:
+                    bar = self.current[tf]
+                    bar['High'] = max(bar['High'], high)
+                    bar['Low'] = min(bar['Low'], low)
+                    bar['Close'] = close
+                    bar['Volume'] += volume_delta
+                self._last_input_volume = volume
+                return
+
+        self._last_input_time = timestamp
+        self._last_input_volume = volume
+
+        for tf in self.timeframes:
+            start = self._bucket_start(tf, timestamp)
+            bar = self.current[tf]
+
+            if bar is not None and bar['Date'] == start:
+                if high > bar['High']:
+                    bar['High'] = high
+                if low < bar['Low']:
+                    bar['Low'] = low
+                bar['Close'] = close
+                bar['Volume'] += volume
+                continue
+
+            if bar is not None:
+                self._complete(tf, bar)
+
+            self.current[tf] = {
+                'Date': start,
+                'Open': open_,
+                'High': high,
+                'Low': low,
+                'Close': close,
+                'Volume': volume,
+            }
+
+    def update_tick(self, timestamp, price: float, size: float = 0.0):
+        """Feed one trade tick."""
+        timestamp = self._local(timestamp)
+        if self._last_input_time is not None and timestamp < self._last_input_time:
+            logger.debug(f"Ignoring out-of-order tick at {timestamp}")
+            return
+        # Ticks never revise each other, so bypass the same-timestamp revision path
+        self._last_input_time = None
+        self.update_bar(timestamp, price, price, price, price, size)
+        self._last_input_volume = 0.0
+
+    def update_frame(self, data: pd.DataFrame) -> int:
+        """
+        Feed 1-minute bars from a DataFrame, skipping bars already seen.
+
+        Args:
+            data: DataFrame with OHLCV columns and a DatetimeIndex
+
+        Returns:
+            Number of bars fed
+        """
+        if data is None or data.empty:
+            return 0
+
+        if self._last_input_time is not None:
+            data = data[data.index >= self._last_input_time]
+
+        volumes = data['Volume'] if 'Volume' in data.columns else pd.Series(0.0, index=data.index)
+        for timestamp, open_, high, low, close, volume in zip(
+                data.index, data['Open'], data['High'], data['Low'], data['Close'], volumes):
+            self.update_bar(timestamp, open_, high, low, close, volume)
+        return len(data)
+
+    def flush(self):
+        """Complete every forming bar (e.g. at the session close)."""
+        for tf in self.timeframes:
+            if self.current[tf] is not None:
+                self._complete(tf, self.current[tf])
+                self.current[tf] = None
+
+    def current_bar(self, timeframe: str) -> Optional[Dict]:
+        """Get the bar still forming for a timeframe."""
+        bar = self.current[timeframe]
+        return dict(bar) if bar is not None else None
+
+    def last_price(self) -> Optional[float]:
+        """Get the most recent close seen."""
+        for tf in self.timeframes:
+            if self.current[tf] is not None:
+                return self.current[tf]['Close']
+        return None
+
+    def get_bars(self, timeframe: str, include_current: bool = True) -> pd.DataFrame:
+        """
+        Get the bars of a timeframe as a DataFrame.
+
+        Args:
+            timeframe: One of the maintained timeframes
+            include_current: Append the bar that is still forming
+
+        Returns:
+            DataFrame with OHLCV columns indexed by bar start
+        """
+        bars = list(self.completed[timeframe])
+        if include_current and self.current[timeframe] is not None:
+            bars.append(self.current[timeframe])
+        if not bars:
+            return pd.DataFrame(columns=BAR_FIELDS)
+        return pd.DataFrame(bars).set_index('Date')[BAR_FIELDS]
+
+    def _complete(self, timeframe: str, bar: Dict):
+        self.completed[timeframe].append(bar)
+        if self.on_bar_close is not None:
+            self.on_bar_close(timeframe, dict(bar))
+
+    def _bucket_start(self, timeframe: str, timestamp: pd.Timestamp) -> pd.Timestamp:
+        # Day boundaries are recomputed only when the date changes
+        day = timestamp.normalize()
+        if day != self._day:
+            self._day = day
+            self._day_open = day + self.session_open
+
+        minutes = TIMEFRAME_MINUTES[timeframe]
+        if minutes is None:
+            return day
+
+        size = pd.Timedelta(minutes=minutes)
+        return self._day_open + ((timestamp - self._day_open) // size) * size
+
+    def _local(self, timestamp) -> pd.Timestamp:
+        timestamp = pd.Timestamp(timestamp)
+        if timestamp.tz is None:
+            return timestamp.tz_localize(self.timezone)
+        return timestamp.tz_convert(self.timezone)
@@ -0,0 +1,297 @@
+"""
+Bar Store Module
+
+Persistent on-disk columnar storage for OHLCV bars.
+
+Each symbol/interval pair lives in its own directory with one raw binary file
+per column plus a small JSON metadata file. Columns are read back through
+memory maps, so loading only the tail of a long history touches only the
+bytes that are needed, and new bars are appended without rewriting the file.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = os.path.join('data', 'bars')
+
+INDEX_FILE = 'index.i8'
+META_FILE = 'meta.json'
+
+
+class BarStore:
+    """
+    Columnar bar store keyed by symbol and interval.
+
+    Layout on disk::
+
+        <root>/<interval>/<symbol>/meta.json
+        <root>/<interval>/<symbol>/index.i8       # UTC timestamps, int64 ns
+        <root>/<interval>/<symbol>/<column>.bin   # one raw array per column
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = root
+        self._locks: Dict[str, threading.RLock] = {}
+        self._locks_guard = threading.Lock()
+
+    def read(self, symbol: str, interval: str,
+             start: Optional[pd.Timestamp] = None) -> Optional[pd.DataFrame]:
+        """
+        Read stored bars for a symbol.
+
+        Args:
+            symbol: Stock symbol
+            interval: Bar interval (e.g. '1d', '1m')
+            start: Only return bars at or after this timestamp
+
+        Returns:
+            DataFrame with the stored bars or None if nothing is stored
+        """
+        with self._lock(symbol, interval):
+            meta = self._read_meta(symbol, interval)
+            if meta is None:
+                return None
+
+            rows = self._row_count(symbol, interval, meta)
+            if rows == 0:
+                return None
+
+            path = self._path(symbol, interval)
+            index = np.memmap(os.path.join(path, INDEX_FILE), dtype='int64', mode='r', shape=(rows,))
+
+            first = 0
+            if start is not None:
+                first = int(np.searchsorted(index, self._to_ns(start), side='left'))
+                if first >= rows:
+                    return None
+
+            columns = {}
+            for column in meta['columns']:
+                values = np.memmap(os.path.join(path, column['file']), dtype=column['dtype'],
+                                   mode='r', shape=(rows,))
+                columns[column['name']] = np.array(values[first:])
+
+            timestamps = pd.to_datetime(np.array(index[first:]), utc=True)
+            if meta.get('tz'):
+                timestamps = timestamps.tz_convert(meta['tz'])
+            else:
+                timestamps = timestamps.tz_localize(None)
+
+            data = pd.DataFrame(columns, index=pd.DatetimeIndex(timestamps, name=meta.get('index_name')))
+            return data
+
+    def write(self, symbol: str, interval: str, data: pd.DataFrame,
+              covered_from: Optional[pd.Timestamp] = None):
+        """
+        Replace all stored bars for a symbol.
+
+        Args:
+            symbol: Stock symbol
+            interval: Bar interval
+            data: Bars to store (DatetimeIndex, numeric columns)
+            covered_from: Earliest timestamp the stored history is known to cover
+        """
+        with self._lock(symbol, interval):
+            path = self._path(symbol, interval)
+            os.makedirs(path, exist_ok=True)
+
+            meta = {
+                'symbol': symbol,
+                'interval': interval,
+                'tz': str(data.index.tz) if data.index.tz is not None else None,
+                'index_name': data.index.name,
+                'columns': [
+                    {'name': name, 'dtype': str(data[name].dtype), 'file': self._column_file(name)}
+                    for name in data.columns
+                ],
+                'covered_from': self._to_ns(covered_from) if covered_from is not None else None,
+            }
+
+            for column in meta['columns']:
+                open(os.path.join(path, column['file']), 'wb').close()
+            open(os.path.join(path, INDEX_FILE), 'wb').close()
+
+            self._append_rows(path, meta, data)
+            self._write_meta(symbol, interval, meta)
+
+    def append(self, symbol: str, interval: str, data: pd.DataFrame) -> int:
+        """
+        Append bars, replacing any stored bars at or after the first new timestamp.
+
+        The most recent stored bar is usually still forming (today's daily bar,
+        the current minute), so a top-up fetch starting at the last stored
+        timestamp overwrites it with the final values.
+
+        Args:
+            symbol: Stock symbol
+            interval: Bar interval
+            data: New bars, sorted by timestamp
+
+        Returns:
+            Number of rows in the store after the append
+        """
+        if data.empty:
+            return self.row_count(symbol, interval)
+
+        with self._lock(symbol, interval):
+            meta = self._read_meta(symbol, interval)
+            if meta is None:
+                self.write(symbol, interval, data)
+                return len(data)
+
+            path = self._path(symbol, interval)
+            rows = self._row_count(symbol, interval, meta)
+
+            # Stored columns missing from the new bars are filled, extra ones dropped
+            stored_names = [column['name'] for column in meta['columns']]
+            missing = [name for name in stored_names if name not in data.columns]
+            if missing:
+                logger.warning(f"New bars for {symbol} lack stored columns {missing}")
+
+            keep = rows
+            if rows > 0:
+                index = np.memmap(os.path.join(path, INDEX_FILE), dtype='int64', mode='r', shape=(rows,))
+                keep = int(np.searchsorted(index, self._to_ns(data.index[0]), side='left'))
+                del index
+
+            if keep < rows:
+                self._truncate(path, meta, keep)
+
+            aligned = data.reindex(columns=stored_names)
+            self._append_rows(path, meta, aligned)
+            self._write_meta(symbol, interval, meta)
+            return keep + len(aligned)
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        """Get the timestamp of the most recent stored bar."""
+        with self._lock(symbol, interval):
+            meta = self._read_meta(symbol, interval)
+            if meta is None:
+                return None
+            rows = self._row_count(symbol, interval, meta)
+            if rows == 0:
+                return None
+
+            index = np.memmap(os.path.join(self._path(symbol, interval), INDEX_FILE),
+                              dtype='int64', mode='r', shape=(rows,))
+            timestamp = pd.Timestamp(int(index[-1]), tz='UTC')
+            return timestamp.tz_convert(meta['tz']) if meta.get('tz') else timestamp.tz_localize(None)
+
+    def last_updated(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        """Get the local time of the last write or append."""
+        with self._lock(symbol, interval):
+            meta = self._read_meta(symbol, interval)
+        if meta is None or not meta.get('updated'):
+            return None
+        return pd.Timestamp(meta['updated'])
+
+    def covered_from(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        """Get the earliest timestamp the stored history is known to cover."""
+        with self._lock(symbol, interval):
+            meta = self._read_meta(symbol, interval)
+        if meta is None or meta.get('covered_from') is None:
+            return None
+        return pd.Timestamp(meta['covered_from'], tz='UTC')
+
+    def row_count(self, symbol: str, interval: str) -> int:
+        """Get the number of stored bars for a symbol."""
+        with self._lock(symbol, interval):
+            meta = self._read_meta(symbol, interval)
+            return 0 if meta is None else self._row_count(symbol, interval, meta)
+
+    def symbols(self, interval: str) -> List[str]:
+        """List symbols stored for an interval."""
+        path = os.path.join(self.root, interval)
+        if not os.path.isdir(path):
+            return []
+        return sorted(
+            name for name in os.listdir(path)
+            if os.path.exists(os.path.join(path, name, META_FILE))
+        )
+
+    def _append_rows(self, path: str, meta: Dict, data: pd.DataFrame):
+        """Append rows to every column file, index last."""
+        for column in meta['columns']:
+            values = self._column_values(data[column['name']], np.dtype(column['dtype']))
+            with open(os.path.join(path, column['file']), 'ab') as f:
+                f.write(values.tobytes())
+
+        # The index is written last so a crash mid-append leaves it as the
+        # shortest file; _row_count trims readers back to consistent rows.
+        with open(os.path.join(path, INDEX_FILE), 'ab') as f:
+            f.write(np.ascontiguousarray(self._index_to_ns(data.index)).tobytes())
+
+        meta['updated'] = datetime.now().astimezone().isoformat()
+
+    def _truncate(self, path: str, meta: Dict, rows: int):
+        """Truncate every column file to the given number of rows."""
+        os.truncate(os.path.join(path, INDEX_FILE), rows * 8)
+        for column in meta['columns']:
+            os.truncate(os.path.join(path, column['file']), rows * np.dtype(column['dtype']).itemsize)
+
+    def _row_count(self, symbol: str, interval: str, meta: Dict) -> int:
+        """Number of complete rows, i.e. the shortest column."""
+        path = self._path(symbol, interval)
+        sizes = [os.path.getsize(os.path.join(path, INDEX_FILE)) // 8]
+        for column in meta['columns']:
+            file_path = os.path.join(path, column['file'])
+            sizes.append(os.path.getsize(file_path) // np.dtype(column['dtype']).itemsize
+                         if os.path.exists(file_path) else 0)
+        return min(sizes)
+
+    def _read_meta(self, symbol: str, interval: str) -> Optional[Dict]:
+        meta_path = os.path.join(self._path(symbol, interval), META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, 'r') as f:
+            return json.load(f)
+
+    def _write_meta(self, symbol: str, interval: str, meta: Dict):
+        meta_path = os.path.join(self._path(symbol, interval), META_FILE)
+        tmp_path = meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, meta_path)
+
+    def _path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, interval, symbol.replace(os.sep, '_'))
+
+    def _lock(self, symbol: str, interval: str) -> threading.RLock:
+        key = f"{symbol}_{interval}"
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = threading.RLock()
+            return self._locks[key]
+
+    @staticmethod
+    def _column_file(name: str) -> str:
+        return name.replace(' ', '_').replace(os.sep, '_') + '.bin'
+
+    @staticmethod
+    def _column_values(series: pd.Series, dtype: np.dtype) -> np.ndarray:
+        if dtype.kind != 'f':
+            series = series.fillna(0)
+        return np.ascontiguousarray(series.to_numpy().astype(dtype, copy=False))
+
+    @staticmethod
+    def _to_ns(timestamp) -> int:
+        timestamp = pd.Timestamp(timestamp)
+        if timestamp.tz is None:
+            timestamp = timestamp.tz_localize('UTC')
+        return int(timestamp.tz_convert('UTC').value)
+
+    @staticmethod
+    def _index_to_ns(index: pd.DatetimeIndex) -> np.ndarray:
+        index = pd.DatetimeIndex(index)
+        if index.tz is None:
+            index = index.tz_localize('UTC')
+        return index.tz_convert('UTC').tz_localize(None).values.astype('datetime64[ns]').view('int64')
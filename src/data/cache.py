@@ -0,0 +1,241 @@
+"""
+Data Cache Module
+
+Bounded in-memory read-through cache for market data DataFrames.
+Entries expire after a per-interval TTL and the least recently used entries
+are evicted once the total DataFrame memory exceeds a byte budget. With a
+trading calendar, daily and longer bars also expire at the next session
+open or close, and only briefly stay fresh while the market is open (the
+latest bar is still forming).
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+# How long bars of each interval stay fresh (intraday bars go stale quickly)
+DEFAULT_TTLS = {
+    '1m': timedelta(seconds=30),
+    '2m': timedelta(minutes=1),
+    '5m': timedelta(minutes=2),
+    '15m': timedelta(minutes=5),
+    '30m': timedelta(minutes=10),
+    '60m': timedelta(minutes=15),
+    '90m': timedelta(minutes=15),
+    '1h': timedelta(minutes=15),
+    '1d': timedelta(hours=4),
+    '5d': timedelta(hours=12),
+    '1wk': timedelta(hours=12),
+    '1mo': timedelta(days=1),
+    '3mo': timedelta(days=1),
+}
+
+# Intervals whose latest bar spans a whole session
+SESSION_BAR_INTERVALS = {'1d', '5d', '1wk', '1mo', '3mo'}
+
+# Freshness of session bars while the market is open (today's bar changes
+# with every trade)
+DEFAULT_OPEN_SESSION_TTL = timedelta(minutes=2)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class DataCache:
+    """
+    Thread-safe TTL + LRU cache with a memory budget in bytes.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttls: Optional[Dict[str, timedelta]] = None,
+                 calendar=None,
+                 open_session_ttl: timedelta = DEFAULT_OPEN_SESSION_TTL):
+        """
+        Args:
+            max_bytes: Memory budget for cached DataFrames
+            ttls: Per-interval TTL overrides
+            calendar: TradingCalendar; when given, daily and longer bars
+                expire at the next session open/close
+            open_session_ttl: Upper bound on the TTL of daily and longer
+                bars while the market is open (requires calendar)
+        """
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.calendar = calendar
+        self.open_session_ttl = open_session_ttl
+
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def ttl_for(self, interval: str) -> timedelta:
+        """Get the TTL for a bar interval."""
+        return self.ttls.get(interval, DEFAULT_TTLS['1d'])
+
+    def expiry_for(self, interval: str, now: Optional[datetime] = None) -> datetime:
+        """
+        Get the expiry time of an entry stored now.
+
+        Args:
+            interval: Bar interval
+            now: Storage time (local, naive; defaults to now)
+
+        Returns:
+            Local naive datetime at which the entry goes stale
+        """
+        now = now or datetime.now()
+        expires = now + self.ttl_for(interval)
+        if self.calendar is None or interval not in SESSION_BAR_INTERVALS:
+            return expires
+
+        at = pd.Timestamp(now).tz_localize(_local_timezone(now))
+        if self.calendar.is_open(at):
+            expires = min(expires, now + self.open_session_ttl)
+            boundary = self.calendar.next_close(at)
+        else:
+            boundary = self.calendar.next_open(at)
+        if boundary is not None:
+            expires = min(expires, _to_local(boundary, now))
+        return expires
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Look up a cached DataFrame.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            A copy of the cached DataFrame, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if datetime.now() >= entry['expires']:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            data = entry['data']
+
+        # Callers routinely add columns to what they get back
+        return data.copy()
+
+    def put(self, key: str, data: pd.DataFrame, interval: str = '1d',
+            expires: Optional[datetime] = None):
+        """
+        Store a DataFrame, evicting least recently used entries if needed.
+
+        Args:
+            key: Cache key
+            data: DataFrame to cache
+            interval: Bar interval, used to pick the TTL
+            expires: Explicit expiry overriding the interval TTL and session
+                boundaries (local naive datetime or timezone-aware timestamp),
+                e.g. for pre-open warm-ups that must survive the open
+        """
+        nbytes = int(data.memory_usage(deep=True).sum())
+        if nbytes > self.max_bytes:
+            logger.warning(f"Not caching {key}: {nbytes} bytes exceeds cache budget of {self.max_bytes}")
+            return
+
+        now = datetime.now()
+        if expires is None:
+            expires = self.expiry_for(interval, now)
+        elif getattr(expires, 'tzinfo', None) is not None:
+            expires = _to_local(pd.Timestamp(expires), now)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = {
+                'data': data,
+                'timestamp': now,
+                'expires': expires,
+                'nbytes': nbytes,
+            }
+            self.current_bytes += nbytes
+
+            while self.current_bytes > self.max_bytes and self._entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate(self, key: str) -> bool:
+        """Drop a single entry. Returns True if it was cached."""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self):
+        """Drop every entry (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries.keys())
+
+    def timestamps(self):
+        with self._lock:
+            return [entry['timestamp'] for entry in self._entries.values()]
+
+    def stats(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss/eviction counters and memory usage
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'items': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: str):
+        return key in self._entries
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self.current_bytes -= entry['nbytes']
+
+
+def _local_timezone(now: datetime):
+    # Timezone of the naive local times the cache works in
+    return now.astimezone().tzinfo
+
+
+def _to_local(timestamp: pd.Timestamp, now: datetime) -> datetime:
+    # Timezone-aware timestamp -> the naive local time entries expire at
+    return timestamp.tz_convert(_local_timezone(now)).tz_localize(None).to_pydatetime()
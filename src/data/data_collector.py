@@ -5,28 +5,82 @@ This module handles fetching and preprocessing of market data from various sourc
 Primarily uses Yahoo Finance API for real-time and historical stock data.
 """
 
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from src.data.bar_store import BarStore, DEFAULT_STORE_DIR
+from src.data.cache import DataCache, DEFAULT_MAX_BYTES
+from src.data.data_source import DataSource, get_data_source, period_start
+from src.data.metadata_store import MetadataStore, DEFAULT_DB_PATH
+from src.data.trading_calendar import get_trading_calendar
+from src.data.validation import FLAG_COLUMN, summarize_flags, validate_bars
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+# Nominal bar length for yfinance interval strings
+INTERVAL_DURATIONS = {
+    '1m': pd.Timedelta(minutes=1),
+    '2m': pd.Timedelta(minutes=2),
+    '5m': pd.Timedelta(minutes=5),
+    '15m': pd.Timedelta(minutes=15),
+    '30m': pd.Timedelta(minutes=30),
+    '60m': pd.Timedelta(hours=1),
+    '90m': pd.Timedelta(minutes=90),
+    '1h': pd.Timedelta(hours=1),
+    '1d': pd.Timedelta(days=1),
+    '5d': pd.Timedelta(days=5),
+    '1wk': pd.Timedelta(weeks=1),
+    '1mo': pd.Timedelta(days=30),
+    '3mo': pd.Timedelta(days=90),
+}
+
 
 class MarketDataCollector:
     """
     Handles collection of market data from various sources.
     
-    Currently supports Yahoo Finance API for Indian stock market data.
+    Market data comes from the configured DataSource (Yahoo Finance by default).
+    Fetched bars are persisted in a BarStore so later calls only download
+    the bars added since the last stored timestamp, and recent results are
+    served from a bounded in-memory cache.
     """
     
-    def __init__(self):
+    def __init__(self, store_dir: Optional[str] = DEFAULT_STORE_DIR,
+                 cache_max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_workers: int = 8,
+                 data_source: Optional[DataSource] = None,
+                 compact: bool = False,
+                 validate: bool = False,
+                 metadata_db: Optional[str] = DEFAULT_DB_PATH):
+        """
+        Args:
+            store_dir: Directory for the persistent bar store (None disables it)
+            cache_max_bytes: Memory budget for the in-memory DataFrame cache
+            max_workers: Maximum concurrent downloads in fetch_multiple_stocks
+            data_source: Market data provider (defaults to the process-wide source)
+            compact: Keep only OHLCV with float32 prices and integer volume
+            validate: Check raw bars and attach per-bar data-quality flags as a
+                Quality_Flags column (off by default so frames keep their
+                OHLCV columns)
+            metadata_db: SQLite file caching symbol metadata (None always fetches)
+        """
         self.supported_exchanges = ['NSE', 'BSE']
-        self.cache = {}
+        self.max_workers = max_workers
+        self.data_source = data_source or get_data_source()
+        self.compact = compact
+        self.validate = validate
+        self.calendar = get_trading_calendar()
+        self.cache = DataCache(max_bytes=cache_max_bytes, calendar=self.calendar)
+        self.store = BarStore(store_dir) if store_dir else None
+        self.metadata = MetadataStore(metadata_db, data_source=self.data_source) if metadata_db else None
         
     def fetch_stock_data(self, symbol: str, period: str = "1y", 
                         interval: str = "1d") -> Optional[pd.DataFrame]:
@@ -41,50 +95,158 @@ class MarketDataCollector:
         Returns:
             DataFrame with OHLCV data or None if failed
         """
+        cache_key = self.cache_key(symbol, period, interval)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Cache hit for {cache_key}")
+            return cached
+        
         try:
             logger.info(f"Fetching data for {symbol} with period {period}")
             
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period=period, interval=interval)
+            if self.store is not None:
+                data = self._fetch_with_store(symbol, period, interval)
+            else:
+                data = self._download(symbol, period=period, interval=interval)
             
-            if data.empty:
+            if data is None or data.empty:
                 logger.warning(f"No data found for symbol {symbol}")
                 return None
-                
-            # Clean and validate data
-            data = self._clean_data(data)
             
             # Cache the data
-            cache_key = f"{symbol}_{period}_{interval}"
-            self.cache[cache_key] = {
-                'data': data,
-                'timestamp': datetime.now()
-            }
+            self.cache.put(cache_key, data, interval)
             
             logger.info(f"Successfully fetched {len(data)} records for {symbol}")
-            return data
+            return data.copy()
             
         except Exception as e:
             logger.error(f"Error fetching data for {symbol}: {str(e)}")
             return None
     
-    def fetch_multiple_stocks(self, symbols: List[str], period: str = "1y") -> Dict[str, pd.DataFrame]:
+    @staticmethod
+    def cache_key(symbol: str, period: str, interval: str) -> str:
+        """Get the cache key fetch_stock_data uses for a request."""
+        return f"{symbol}_{period}_{interval}"
+    
+    def _download(self, symbol: str, interval: str, period: Optional[str] = None,
+                  start: Optional[pd.Timestamp] = None) -> Optional[pd.DataFrame]:
+        """
+        Download bars from the data source, validate and clean them.
+        
+        Args:
+            symbol: Stock symbol
+            interval: Data interval
+            period: Time period (ignored when start is given)
+            start: Download bars from this timestamp onwards
+            
+        Returns:
+            Cleaned DataFrame or None if nothing was returned
+        """
+        data = self.data_source.history(symbol, period=period, interval=interval, start=start)
+        
+        if data.empty:
+            return None
+        
+        if not self.validate:
+            return self._clean_data(data)
+        
+        # Validate the raw bars so problems are recorded before cleaning hides them
+        calendar = self.calendar if symbol.endswith(('.NS', '.BO')) else None
+        flags = pd.Series(validate_bars(data, interval, calendar), index=data.index)
+        summary = summarize_flags(flags.to_numpy())
+        if summary:
+            logger.info(f"Data quality flags for {symbol} ({interval}): {summary}")
+        
+        cleaned = self._clean_data(data)
+        cleaned[FLAG_COLUMN] = flags.reindex(cleaned.index).fillna(0).to_numpy(dtype=np.uint16)
+        return cleaned
+    
+    def _fetch_with_store(self, symbol: str, period: str, interval: str) -> Optional[pd.DataFrame]:
+        """
+        Serve a request from the bar store, downloading only what is missing.
+        
+        A full download happens when the symbol is not stored yet or the
+        requested period reaches further back than the stored history.
+        Otherwise only the bars since the last stored timestamp are fetched.
+        
+        Args:
+            symbol: Stock symbol
+            period: Time period
+            interval: Data interval
+            
+        Returns:
+            DataFrame with OHLCV data covering the requested period
+        """
+        now = pd.Timestamp.now(tz='UTC')
+        start = period_start(period, now)
+        covered_from = self.store.covered_from(symbol, interval)
+        last_timestamp = self.store.last_timestamp(symbol, interval)
+        
+        if last_timestamp is None or covered_from is None or start < covered_from:
+            data = self._download(symbol, period=period, interval=interval)
+            if data is None:
+                return None
+            self.store.write(symbol, interval, data, covered_from=start)
+            logger.info(f"Stored {len(data)} {interval} bars for {symbol}")
+            return data
+        
+        step = INTERVAL_DURATIONS.get(interval, pd.Timedelta(days=1))
+        if now - last_timestamp.tz_convert('UTC') >= step and self._may_have_new_bars(symbol, interval, now):
+            new_bars = self._download(symbol, interval=interval, start=last_timestamp)
+            if new_bars is not None:
+                rows = self.store.append(symbol, interval, new_bars)
+                logger.info(f"Topped up {symbol} with {len(new_bars)} {interval} bars ({rows} stored)")
+        
+        return self.store.read(symbol, interval, start=start)
+    
+    def _may_have_new_bars(self, symbol: str, interval: str, now: pd.Timestamp) -> bool:
+        """
+        Check whether the exchange traded since the store was last updated.
+        
+        Only NSE/BSE symbols are checked against the calendar; others are
+        always assumed to have new bars.
+        """
+        if not symbol.endswith(('.NS', '.BO')):
+            return True
+        
+        last_updated = self.store.last_updated(symbol, interval)
+        if last_updated is None or last_updated.tz is None:
+            return True
+        
+        return self.calendar.was_open_between(last_updated, now)
+    
+    def fetch_multiple_stocks(self, symbols: List[str], period: str = "1y",
+                              interval: str = "1d",
+                              max_workers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
         """
         Fetch data for multiple stocks simultaneously.
         
+        Symbols are fetched on a bounded thread pool. Each fetch handles its
+        own errors, so one failing symbol does not affect the others.
+        
         Args:
             symbols: List of stock symbols
             period: Time period for data
+            interval: Data interval
+            max_workers: Maximum fetches in flight (defaults to self.max_workers, 1 = serial)
             
         Returns:
             Dictionary mapping symbols to their data
         """
-        results = {}
+        workers = max(1, min(max_workers or self.max_workers, len(symbols) or 1))
         
-        for symbol in symbols:
-            data = self.fetch_stock_data(symbol, period)
-            if data is not None:
-                results[symbol] = data
+        if workers == 1:
+            fetched = [self.fetch_stock_data(symbol, period, interval) for symbol in symbols]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fetch') as executor:
+                fetched = list(executor.map(
+                    lambda symbol: self.fetch_stock_data(symbol, period, interval), symbols
+                ))
+        
+        results = {
+            symbol: data for symbol, data in zip(symbols, fetched)
+            if data is not None
+        }
                 
         logger.info(f"Successfully fetched data for {len(results)}/{len(symbols)} symbols")
         return results
@@ -100,8 +262,7 @@ class MarketDataCollector:
             Current price or None if failed
         """
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period="1d", interval="1m")
+            data = self.data_source.history(symbol, period="1d", interval="1m")
             
             if not data.empty:
                 return float(data['Close'].iloc[-1])
@@ -116,6 +277,9 @@ class MarketDataCollector:
         """
         Get detailed stock information.
         
+        Served from the metadata store, which only refetches `info` after
+        it is older than its refresh age.
+        
         Args:
             symbol: Stock symbol
             
@@ -123,8 +287,13 @@ class MarketDataCollector:
             Dictionary with stock information
         """
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            if self.metadata is not None:
+                record = self.metadata.get(symbol)
+                if record is None:
+                    return None
+                info = record['info']
+            else:
+                info = self.data_source.info(symbol)
             
             # Extract relevant information
             stock_info = {
@@ -146,25 +315,28 @@ class MarketDataCollector:
             logger.error(f"Error getting stock info for {symbol}: {str(e)}")
             return None
     
-    def _clean_data(self, data: pd.DataFrame) -> pd.DataFrame:
+    def _clean_data(self, data: pd.DataFrame, compact: Optional[bool] = None) -> pd.DataFrame:
         """
         Clean and validate the fetched data.
         
         Args:
             data: Raw data from API
+            compact: Use the memory-compact representation (defaults to self.compact)
             
         Returns:
             Cleaned data
         """
+        if self.compact if compact is None else compact:
+            return self._clean_data_compact(data)
+        
         # Remove any rows with all NaN values
         data = data.dropna(how='all')
         
         # Forward fill missing values
-        data = data.fillna(method='ffill')
+        data = data.ffill()
         
         # Ensure all price columns are positive
-        price_columns = ['Open', 'High', 'Low', 'Close']
-        for col in price_columns:
+        for col in PRICE_COLUMNS:
             if col in data.columns:
                 data[col] = data[col].abs()
         
@@ -178,24 +350,99 @@ class MarketDataCollector:
         
         return data
     
-    def is_market_open(self) -> bool:
+    def _clean_data_compact(self, data: pd.DataFrame) -> pd.DataFrame:
         """
-        Check if the Indian stock market is currently open.
+        Clean data into a compact OHLCV frame in one vectorized pass.
+        
+        Prices are copied once into a float32 block and cleaned in place;
+        Volume becomes int32 when it fits (int64 otherwise). Dividends,
+        Stock Splits and other extra columns are dropped.
         
+        Args:
+            data: Raw data from API
+            
         Returns:
-            True if market is open, False otherwise
+            Cleaned OHLCV data
+        """
+        columns = [col for col in PRICE_COLUMNS if col in data.columns]
+        prices = data[columns].to_numpy(dtype=np.float32, copy=True)
+        volume = data['Volume'].to_numpy(dtype=np.float64, copy=True) if 'Volume' in data.columns else None
+        
+        # Remove any rows with all NaN values
+        missing = np.isnan(prices)
+        empty_rows = missing.all(axis=1)
+        if volume is not None:
+            empty_rows &= np.isnan(volume)
+        if empty_rows.any():
+            keep = ~empty_rows
+            prices, missing, index = prices[keep], missing[keep], data.index[keep]
+            volume = volume[keep] if volume is not None else None
+        else:
+            index = data.index
+        
+        # Forward fill missing values from the last valid row of each column
+        if missing.any():
+            rows = np.where(missing, 0, np.arange(len(prices))[:, None])
+            np.maximum.accumulate(rows, axis=0, out=rows)
+            prices = prices[rows, np.arange(prices.shape[1])]
+        
+        # Ensure all price columns are positive
+        np.abs(prices, out=prices)
+        
+        # Ensure High >= Low
+        if 'High' in columns and 'Low' in columns:
+            high, low = columns.index('High'), columns.index('Low')
+            np.maximum(prices[:, high], prices[:, low], out=prices[:, high])
+        
+        result = pd.DataFrame(prices, index=index, columns=columns)
+        
+        # Ensure Volume is non-negative, forward filled and integer
+        if volume is not None:
+            volume_missing = np.isnan(volume)
+            if volume_missing.any():
+                rows = np.where(volume_missing, 0, np.arange(len(volume)))
+                np.maximum.accumulate(rows, out=rows)
+                volume = np.nan_to_num(volume[rows])
+            np.abs(volume, out=volume)
+            volume_dtype = np.int32 if volume.size == 0 or volume.max() <= np.iinfo(np.int32).max else np.int64
+            result['Volume'] = volume.astype(volume_dtype)
+        
+        return result
+    
+    def to_long_format(self, data_dict: Dict[str, pd.DataFrame]) -> pd.DataFrame:
         """
-        now = datetime.now()
+        Stack per-symbol frames into one long frame with a categorical Symbol column.
         
-        # Check if it's a weekend
-        if now.weekday() >= 5:  # Saturday = 5, Sunday = 6
-            return False
+        A categorical column stores each symbol name once plus a small
+        integer code per row instead of a Python string per row.
+        
+        Args:
+            data_dict: Dictionary mapping symbols to their data
+            
+        Returns:
+            Long-format DataFrame indexed by timestamp
+        """
+        if not data_dict:
+            return pd.DataFrame()
         
-        # Market hours: 9:15 AM to 3:30 PM IST
-        market_open = now.replace(hour=9, minute=15, second=0, microsecond=0)
-        market_close = now.replace(hour=15, minute=30, second=0, microsecond=0)
+        symbols = list(data_dict.keys())
+        frames = list(data_dict.values())
+        codes = np.repeat(np.arange(len(symbols), dtype=np.int32), [len(frame) for frame in frames])
         
-        return market_open <= now <= market_close
+        combined = pd.concat(frames)
+        combined['Symbol'] = pd.Categorical.from_codes(codes, categories=symbols)
+        return combined
+    
+    def is_market_open(self) -> bool:
+        """
+        Check if the Indian stock market is currently open.
+        
+        Uses the NSE trading calendar, so exchange holidays count as closed.
+        
+        Returns:
+            True if market is open, False otherwise
+        """
+        return self.calendar.is_open()
     
     def get_cache_info(self) -> Dict:
         """
@@ -206,16 +453,18 @@ class MarketDataCollector:
         """
         cache_info = {
             'total_cached_items': len(self.cache),
-            'cache_keys': list(self.cache.keys()),
+            'cache_keys': self.cache.keys(),
             'oldest_cache': None,
             'newest_cache': None
         }
         
-        if self.cache:
-            timestamps = [item['timestamp'] for item in self.cache.values()]
+        timestamps = self.cache.timestamps()
+        if timestamps:
             cache_info['oldest_cache'] = min(timestamps)
             cache_info['newest_cache'] = max(timestamps)
         
+        cache_info.update(self.cache.stats())
+        
         return cache_info
 
 
@@ -253,7 +502,8 @@ def main():
     
     # Cache information
     cache_info = collector.get_cache_info()
-    print(f"\nCache Info: {cache_info['total_cached_items']} items cached")
+    print(f"\nCache Info: {cache_info['total_cached_items']} items cached, "
+          f"{cache_info['hits']} hits / {cache_info['misses']} misses")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,423 @@
+"""
+Data Source Module
+
+Single entry point for market data. Every component that needs bars, quotes
+or company information asks a DataSource instead of calling yfinance
+directly, so the upstream feed can be swapped without touching callers.
+
+Two implementations are provided:
+    - YFinanceDataSource: live data from Yahoo Finance
+    - ReplayDataSource: recorded or synthetic bars served from memory, for
+      offline runs, benchmarks and load tests
+
+The process-wide source is chosen with the TRADING_DATA_SOURCE environment
+variable: 'yfinance' (default), 'replay:<bar store dir>' or 'synthetic'. It is
+wrapped in a CoalescingDataSource so concurrent identical requests from the
+bot and dashboard users share a single upstream call.
+"""
+
+import os
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import logging
+
+from src.data.bar_store import BarStore
+from src.data.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Look-back for yfinance period strings
+PERIOD_OFFSETS = {
+    '1d': pd.DateOffset(days=1),
+    '5d': pd.DateOffset(days=5),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+MARKET_TIMEZONE = 'Asia/Kolkata'
+
+
+def period_start(period: str, now: pd.Timestamp) -> pd.Timestamp:
+    """
+    Translate a yfinance period string into a start timestamp.
+
+    Args:
+        period: Period string ('5d', '1mo', '1y', 'ytd', 'max', ...)
+        now: Reference time
+
+    Returns:
+        Start timestamp in the timezone of `now` ('max' maps to the epoch)
+    """
+    if period == 'ytd':
+        return now.normalize().replace(month=1, day=1)
+    if period in PERIOD_OFFSETS:
+        return (now - PERIOD_OFFSETS[period]).normalize()
+    if period.endswith('d') and period[:-1].isdigit():
+        return (now - pd.Timedelta(days=int(period[:-1]))).normalize()
+    # 'max' and anything unrecognised cover the full history
+    return pd.Timestamp(0, tz='UTC').tz_convert(now.tz) if now.tz is not None else pd.Timestamp(0)
+
+
+class DataSource(ABC):
+    """
+    Abstract market data provider.
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def history(self, symbol: str, period: Optional[str] = None, interval: str = '1d',
+                start: Optional[pd.Timestamp] = None,
+                end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """
+        Get historical OHLCV bars.
+
+        Args:
+            symbol: Stock symbol (e.g., 'RELIANCE.NS')
+            period: Time period ('1d', '5d', '1mo', ..., 'max'); ignored when start is given
+            interval: Bar interval ('1m', '5m', '1h', '1d', ...)
+            start: First timestamp to include
+            end: Last timestamp to include
+
+        Returns:
+            DataFrame with OHLCV columns (empty if no data)
+        """
+
+    def latest_quote(self, symbol: str) -> Optional[Dict]:
+        """
+        Get the latest price and previous close for a symbol.
+
+        Args:
+            symbol: Stock symbol
+
+        Returns:
+            Dictionary with 'last_price' and 'previous_close', or None if unavailable
+        """
+        data = self.history(symbol, period='5d', interval='1d')
+        if data.empty:
+            return None
+        return {
+            'last_price': float(data['Close'].iloc[-1]),
+            'previous_close': float(data['Close'].iloc[-2]) if len(data) > 1 else None,
+        }
+
+    def info(self, symbol: str) -> Dict:
+        """
+        Get company information in yfinance `Ticker.info` format.
+
+        Args:
+            symbol: Stock symbol
+
+        Returns:
+            Dictionary of company fields (empty if unavailable)
+        """
+        return {}
+
+
+class YFinanceDataSource(DataSource):
+    """
+    Live market data from Yahoo Finance.
+    """
+
+    name = 'yfinance'
+
+    def __init__(self):
+        import yfinance as yf
+        from src.utils.http_client import get_http_client
+        self._yf = yf
+        self._http = get_http_client()
+
+    def history(self, symbol: str, period: Optional[str] = None, interval: str = '1d',
+                start: Optional[pd.Timestamp] = None,
+                end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        ticker = self._yf.Ticker(symbol)
+        if start is not None:
+            return self._http.call(self.name, ticker.history, start=start, end=end, interval=interval)
+        return self._http.call(self.name, ticker.history, period=period or '1mo', interval=interval)
+
+    def latest_quote(self, symbol: str) -> Optional[Dict]:
+        try:
+            fast_info = self._yf.Ticker(symbol).fast_info
+            last_price, previous_close = self._http.call(
+                self.name, lambda: (fast_info.last_price, fast_info.previous_close)
+            )
+            if last_price is not None and previous_close is not None:
+                return {'last_price': float(last_price), 'previous_close': float(previous_close)}
+        except Exception as e:
+            logger.debug(f"fast_info unavailable for {symbol}: {str(e)}")
+        return super().latest_quote(symbol)
+
+    def info(self, symbol: str) -> Dict:
+        ticker = self._yf.Ticker(symbol)
+        return self._http.call(self.name, lambda: ticker.info) or {}
+
+
+class ReplayDataSource(DataSource):
+    """
+    Serves pre-loaded bars from memory.
+
+    Bars can come from a dict of DataFrames, a BarStore directory of
+    recorded data, or the synthetic generator. An optional replay clock
+    (`as_of`) hides bars after a given time so a recorded session can be
+    stepped through as if it were live.
+    """
+
+    name = 'replay'
+
+    def __init__(self, frames: Optional[Dict[str, pd.DataFrame]] = None,
+                 interval: str = '1d', infos: Optional[Dict[str, Dict]] = None,
+                 as_of: Optional[pd.Timestamp] = None,
+                 synthetic_periods: Optional[int] = None):
+        """
+        Args:
+            frames: Mapping of symbol to OHLCV DataFrame
+            interval: Interval of the frames passed in
+            infos: Optional mapping of symbol to `Ticker.info`-style dictionaries
+            as_of: Replay clock; bars after this time are not served
+            synthetic_periods: If set, unknown symbols get this many synthetic bars on demand
+        """
+        self._frames: Dict[tuple, pd.DataFrame] = {}
+        self.infos = infos or {}
+        self.as_of = pd.Timestamp(as_of) if as_of is not None else None
+        self.synthetic_periods = synthetic_periods
+
+        for symbol, data in (frames or {}).items():
+            self.add(symbol, data, interval)
+
+    @classmethod
+    def from_bar_store(cls, store_dir: str, intervals: Optional[List[str]] = None) -> 'ReplayDataSource':
+        """
+        Load every symbol recorded in a BarStore directory.
+
+        Args:
+            store_dir: BarStore root directory
+            intervals: Intervals to load (defaults to all recorded intervals)
+
+        Returns:
+            ReplayDataSource holding the recorded bars
+        """
+        store = BarStore(store_dir)
+        source = cls()
+        if intervals is None:
+            intervals = sorted(os.listdir(store_dir)) if os.path.isdir(store_dir) else []
+
+        for interval in intervals:
+            for symbol in store.symbols(interval):
+                data = store.read(symbol, interval)
+                if data is not None:
+                    source.add(symbol, data, interval)
+
+        logger.info(f"Loaded {len(source._frames)} recorded series from {store_dir}")
+        return source
+
+    @classmethod
+    def synthetic(cls, symbols: List[str], periods: int = 500, interval: str = '1d',
+                  end: Optional[pd.Timestamp] = None, seed: int = 42) -> 'ReplayDataSource':
+        """
+        Build a source of synthetic random-walk bars.
+
+        Args:
+            symbols: Symbols to generate
+            periods: Number of bars per symbol
+            interval: '1d' for business days or '1m' for session minutes
+            end: Timestamp of the last bar (defaults to now)
+            seed: Base random seed
+
+        Returns:
+            ReplayDataSource holding the generated bars
+        """
+        frames = {
+            symbol: generate_synthetic_bars(symbol, periods, interval, end, seed)
+            for symbol in symbols
+        }
+        return cls(frames, interval=interval, synthetic_periods=periods)
+
+    def add(self, symbol: str, data: pd.DataFrame, interval: str = '1d'):
+        """Register bars for a symbol and interval."""
+        self._frames[(symbol, interval)] = data.sort_index()
+
+    def symbols(self, interval: str = '1d') -> List[str]:
+        """List symbols available for an interval."""
+        return sorted(symbol for symbol, frame_interval in self._frames if frame_interval == interval)
+
+    def history(self, symbol: str, period: Optional[str] = None, interval: str = '1d',
+                start: Optional[pd.Timestamp] = None,
+                end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        data = self._frames.get((symbol, interval))
+        if data is None and self.synthetic_periods:
+            data = generate_synthetic_bars(symbol, self.synthetic_periods, interval, self.as_of)
+            self.add(symbol, data, interval)
+        if data is None or data.empty:
+            return pd.DataFrame()
+
+        index = data.index
+        now = self.as_of if self.as_of is not None else index[-1]
+        now = self._align(now, index)
+
+        if end is not None:
+            now = min(now, self._align(end, index))
+
+        if start is not None:
+            first = self._align(start, index)
+        else:
+            first = period_start(period or '1mo', now)
+
+        lo = index.searchsorted(first, side='left')
+        hi = index.searchsorted(now, side='right')
+        return data.iloc[lo:hi].copy()
+
+    def info(self, symbol: str) -> Dict:
+        return self.infos.get(symbol, {'symbol': symbol, 'longName': symbol, 'shortName': symbol})
+
+    @staticmethod
+    def _align(timestamp, index: pd.DatetimeIndex) -> pd.Timestamp:
+        """Give a timestamp the same timezone awareness as the index."""
+        timestamp = pd.Timestamp(timestamp)
+        if index.tz is not None:
+            return timestamp.tz_localize(index.tz) if timestamp.tz is None else timestamp.tz_convert(index.tz)
+        return timestamp.tz_localize(None) if timestamp.tz is None else timestamp.tz_convert(None)
+
+
+class CoalescingDataSource(DataSource):
+    """
+    Wraps another source so concurrent identical requests share one call.
+
+    Every caller gets its own copy of a shared DataFrame, so callers that
+    add columns to their result cannot affect each other.
+    """
+
+    def __init__(self, source: DataSource):
+        self.source = source
+        self.name = source.name
+        self.flight = SingleFlight()
+
+    def history(self, symbol: str, period: Optional[str] = None, interval: str = '1d',
+                start: Optional[pd.Timestamp] = None,
+                end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        key = ('history', symbol, period, interval,
+               None if start is None else str(start), None if end is None else str(end))
+        data, _ = self.flight.do(
+            key, lambda: self.source.history(symbol, period=period, interval=interval, start=start, end=end)
+        )
+        # The leader copies too: waiters are still copying the shared frame
+        # after it returns, so nobody may mutate the original
+        return data.copy()
+
+    def latest_quote(self, symbol: str) -> Optional[Dict]:
+        quote, _ = self.flight.do(('quote', symbol), lambda: self.source.latest_quote(symbol))
+        return dict(quote) if quote is not None else None
+
+    def info(self, symbol: str) -> Dict:
+        info, _ = self.flight.do(('info', symbol), lambda: self.source.info(symbol))
+        return dict(info)
+
+    def __getattr__(self, name):
+        # Expose source-specific helpers (e.g. ReplayDataSource.add)
+        if name == 'source':
+            raise AttributeError(name)
+        return getattr(self.source, name)
+
+
+def generate_synthetic_bars(symbol: str, periods: int = 500, interval: str = '1d',
+                            end: Optional[pd.Timestamp] = None, seed: int = 42) -> pd.DataFrame:
+    """
+    Generate random-walk OHLCV bars for a symbol.
+
+    The series is deterministic for a given symbol and seed.
+
+    Args:
+        symbol: Stock symbol (mixed into the seed)
+        periods: Number of bars
+        interval: '1d' for business days or '1m' for NSE session minutes
+        end: Timestamp of the last bar (defaults to now)
+        seed: Base random seed
+
+    Returns:
+        DataFrame with Open, High, Low, Close, Volume columns
+    """
+    rng = np.random.default_rng(seed + zlib.crc32(symbol.encode()))
+    end = pd.Timestamp(end) if end is not None else pd.Timestamp.now(tz=MARKET_TIMEZONE)
+    if end.tz is None:
+        end = end.tz_localize(MARKET_TIMEZONE)
+
+    if interval == '1m':
+        days = pd.bdate_range(end=end.normalize().tz_localize(None), periods=periods // 375 + 2)
+        minutes = pd.timedelta_range('9h15min', periods=375, freq='min')
+        index = pd.DatetimeIndex([day + minute for day in days for minute in minutes]).tz_localize(MARKET_TIMEZONE)
+        index = index[index <= end][-periods:]
+        volatility = 0.001
+    else:
+        index = pd.bdate_range(end=end.normalize().tz_localize(None), periods=periods).tz_localize(MARKET_TIMEZONE)
+        volatility = 0.015
+
+    n = len(index)
+    start_price = 100 + 4900 * rng.random()
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0002, volatility, n)))
+    open_ = np.concatenate(([start_price], close[:-1])) * (1 + rng.normal(0, volatility / 4, n))
+    spread = np.abs(rng.normal(0, volatility, n)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.integers(10_000, 5_000_000, n)
+
+    return pd.DataFrame({
+        'Open': open_,
+        'High': high,
+        'Low': low,
+        'Close': close,
+        'Volume': volume,
+    }, index=pd.DatetimeIndex(index, name='Date'))
+
+
+_data_source: Optional[DataSource] = None
+_data_source_lock = threading.Lock()
+
+
+def create_data_source(spec: str) -> DataSource:
+    """
+    Build a data source from a spec string.
+
+    Args:
+        spec: 'yfinance', 'replay:<bar store dir>' or 'synthetic'
+
+    Returns:
+        DataSource instance
+    """
+    if spec.startswith('replay:'):
+        return ReplayDataSource.from_bar_store(spec.split(':', 1)[1])
+    if spec == 'synthetic':
+        return ReplayDataSource.synthetic(['RELIANCE.NS', 'TCS.NS', 'INFY.NS', 'HDFCBANK.NS', 'ICICIBANK.NS'])
+    if spec != 'yfinance':
+        logger.warning(f"Unknown data source '{spec}', falling back to yfinance")
+    return YFinanceDataSource()
+
+
+def get_data_source() -> DataSource:
+    """Get the process-wide data source, creating it on first use."""
+    global _data_source
+    source = _data_source
+    if source is None:
+        # Fetch pools call this concurrently; a second instance would get its
+        # own SingleFlight and stop coalescing the first burst of requests
+        with _data_source_lock:
+            if _data_source is None:
+                _data_source = CoalescingDataSource(create_data_source(os.getenv('TRADING_DATA_SOURCE', 'yfinance')))
+                logger.info(f"Using {_data_source.name} data source")
+            source = _data_source
+    return source
+
+
+def set_data_source(source: Optional[DataSource]):
+    """Replace the process-wide data source (None resets to the default)."""
+    global _data_source
+    with _data_source_lock:
+        _data_source = source
@@ -0,0 +1,310 @@
+"""
+Metadata Store Module
+
+Persistent symbol metadata (sector, industry, beta, market cap, ...) in SQLite.
+
+`Ticker.info` is one of the slowest Yahoo Finance endpoints, yet the values
+it returns change rarely. Metadata is fetched once, kept in a local table and
+only refreshed after it is older than a configurable number of days, so
+sector lookups for risk checks and the symbol manager are local queries.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import logging
+
+from src.data.data_source import DataSource, get_data_source
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join('data', 'metadata.db')
+DEFAULT_MAX_AGE_DAYS = 7
+
+# Table column -> Ticker.info key
+METADATA_FIELDS = {
+    'company_name': 'longName',
+    'short_name': 'shortName',
+    'sector': 'sector',
+    'industry': 'industry',
+    'market_cap': 'marketCap',
+    'pe_ratio': 'trailingPE',
+    'dividend_yield': 'dividendYield',
+    'beta': 'beta',
+    'fifty_two_week_high': 'fiftyTwoWeekHigh',
+    'fifty_two_week_low': 'fiftyTwoWeekLow',
+    'quote_type': 'quoteType',
+    'exchange': 'exchange',
+    'currency': 'currency',
+}
+
+_REAL_FIELDS = {'market_cap', 'pe_ratio', 'dividend_yield', 'beta',
+                'fifty_two_week_high', 'fifty_two_week_low'}
+
+
+class MetadataStore:
+    """
+    SQLite-backed cache of symbol metadata with a days-based refresh policy.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH,
+                 data_source: Optional[DataSource] = None,
+                 max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+                 max_workers: int = 4):
+        """
+        Args:
+            db_path: SQLite database file
+            data_source: Source of `info` dictionaries (defaults to the process-wide source)
+            max_age_days: Rows older than this are refreshed on access
+            max_workers: Concurrent fetches in refresh_many
+        """
+        self.db_path = db_path
+        self.max_age = timedelta(days=max_age_days)
+        self.max_workers = max_workers
+        self._data_source = data_source
+        self._write_lock = threading.Lock()
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._init_db()
+
+    @property
+    def data_source(self) -> DataSource:
+        # Resolved lazily so purely local lookups never build a network source
+        if self._data_source is None:
+            self._data_source = get_data_source()
+        return self._data_source
+
+    def get(self, symbol: str, refresh_if_stale: bool = True) -> Optional[Dict]:
+        """
+        Get metadata for a symbol.
+
+        Args:
+            symbol: Stock symbol
+            refresh_if_stale: Fetch from the data source if missing or older than max_age
+
+        Returns:
+            Metadata dictionary (METADATA_FIELDS plus 'info' and 'updated') or None
+        """
+        row = self._select([symbol]).get(symbol)
+        if refresh_if_stale and (row is None or self._is_stale(row)):
+            refreshed = self.refresh(symbol)
+            if refreshed is not None:
+                return refreshed
+        return row
+
+    def get_many(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Get stored metadata for several symbols (local only, no fetching).
+
+        Args:
+            symbols: Stock symbols
+
+        Returns:
+            Dictionary of symbol -> metadata for the symbols that are stored
+        """
+        return self._select(symbols)
+
+    def get_sector(self, symbol: str, fetch_missing: bool = True) -> Optional[str]:
+        """
+        Get the sector of a symbol.
+
+        Stale rows are still answered locally; only symbols never seen
+        before are fetched (when fetch_missing is set).
+
+        Args:
+            symbol: Stock symbol
+            fetch_missing: Fetch metadata for symbols not in the table
+
+        Returns:
+            Sector name or None if unknown
+        """
+        row = self._select([symbol]).get(symbol)
+        if row is None and fetch_missing:
+            row = self.refresh(symbol)
+        return row.get('sector') if row else None
+
+    def refresh(self, symbol: str) -> Optional[Dict]:
+        """
+        Fetch metadata for one symbol and store it.
+
+        Returns:
+            Stored metadata or None if the fetch failed
+        """
+        try:
+            info = self.data_source.info(symbol)
+        except Exception as e:
+            logger.error(f"Error fetching metadata for {symbol}: {str(e)}")
+            return None
+        if not info:
+            return None
+        self.upsert({symbol: info})
+        return self._select([symbol]).get(symbol)
+
+    def refresh_many(self, symbols: List[str], force: bool = False,
+                     max_workers: Optional[int] = None) -> Dict[str, bool]:
+        """
+        Refresh metadata for a universe of symbols.
+
+        Only missing or stale rows are fetched unless force is set. Fetches
+        run on a small thread pool and results are written in one transaction.
+
+        Args:
+            symbols: Stock symbols
+            force: Refresh every symbol regardless of age
+            max_workers: Concurrent fetches (defaults to self.max_workers)
+
+        Returns:
+            Dictionary of symbol -> True if its metadata is now stored and fresh
+        """
+        to_fetch = list(symbols) if force else self.stale_symbols(symbols)
+        pending = set(to_fetch)
+        results = {symbol: True for symbol in symbols if symbol not in pending}
+        if not to_fetch:
+            return results
+
+        def fetch(symbol):
+            try:
+                return self.data_source.info(symbol)
+            except Exception as e:
+                logger.error(f"Error fetching metadata for {symbol}: {str(e)}")
+                return None
+
+        workers = max(1, min(max_workers or self.max_workers, len(to_fetch)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            infos = dict(zip(to_fetch, executor.map(fetch, to_fetch)))
+
+        fetched = {symbol: info for symbol, info in infos.items() if info}
+        self.upsert(fetched)
+        results.update({symbol: symbol in fetched for symbol in to_fetch})
+        logger.info(f"Refreshed metadata for {len(fetched)}/{len(to_fetch)} symbols")
+        return results
+
+    def refresh_in_background(self, symbols: List[str]) -> Optional[threading.Thread]:
+        """
+        Refresh missing or stale metadata on a daemon thread.
+
+        For latency-sensitive callers (risk checks) that answer from the
+        local table and let unknown symbols be filled in out of band.
+        Symbols already being refreshed are skipped.
+
+        Args:
+            symbols: Stock symbols
+
+        Returns:
+            The refresh thread, or None if there was nothing to fetch
+        """
+        with self._pending_lock:
+            to_fetch = [symbol for symbol in self.stale_symbols(symbols) if symbol not in self._pending]
+            if not to_fetch:
+                return None
+            self._pending.update(to_fetch)
+
+        def run():
+            try:
+                self.refresh_many(to_fetch)
+            except Exception as e:
+                logger.error(f"Background metadata refresh failed: {str(e)}")
+            finally:
+                with self._pending_lock:
+                    self._pending.difference_update(to_fetch)
+
+        thread = threading.Thread(target=run, name='metadata-refresh', daemon=True)
+        thread.start()
+        return thread
+
+    def stale_symbols(self, symbols: List[str]) -> List[str]:
+        """Get the symbols whose metadata is missing or older than max_age."""
+        rows = self._select(symbols)
+        return [symbol for symbol in symbols if symbol not in rows or self._is_stale(rows[symbol])]
+
+    def upsert(self, infos: Dict[str, Dict]):
+        """
+        Store `info` dictionaries for several symbols.
+
+        Args:
+            infos: Mapping of symbol -> Ticker.info-style dictionary
+        """
+        if not infos:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        columns = ['symbol', *METADATA_FIELDS, 'info', 'updated']
+        rows = [
+            (symbol, *[info.get(key) for key in METADATA_FIELDS.values()],
+             json.dumps(info, default=str), now)
+            for symbol, info in infos.items()
+        ]
+        with self._write_lock, self._connect() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO metadata ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                rows
+            )
+
+    def _select(self, symbols: List[str]) -> Dict[str, Dict]:
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        result = {}
+        with self._connect() as conn:
+            # Stay below SQLite's host-parameter limit for large universes
+            for i in range(0, len(symbols), 500):
+                chunk = symbols[i:i + 500]
+                cursor = conn.execute(
+                    f"SELECT * FROM metadata WHERE symbol IN ({', '.join('?' * len(chunk))})", chunk
+                )
+                for row in cursor.fetchall():
+                    record = dict(row)
+                    record['info'] = json.loads(record['info']) if record['info'] else {}
+                    result[record['symbol']] = record
+        return result
+
+    def _is_stale(self, row: Dict) -> bool:
+        try:
+            updated = datetime.fromisoformat(row['updated'])
+        except (TypeError, ValueError):
+            return True
+        return datetime.now(timezone.utc) - updated > self.max_age
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        columns = ',\n'.join(f"    {name} {'REAL' if name in _REAL_FIELDS else 'TEXT'}"
+                             for name in METADATA_FIELDS)
+        with self._connect() as conn:
+            conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS metadata (
+                symbol TEXT PRIMARY KEY,
+{columns},
+                info TEXT,
+                updated TEXT NOT NULL
+            )
+            ''')
+
+
+_store: Optional[MetadataStore] = None
+_store_lock = threading.Lock()
+
+
+def get_metadata_store() -> MetadataStore:
+    """Get the shared metadata store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MetadataStore()
+        return _store
@@ -0,0 +1,275 @@
+"""
+Prefetch Module
+
+Warms market data caches before the market opens.
+
+The heaviest fetching otherwise happens at 09:15 IST, exactly when every
+other client hits the same APIs. The CacheWarmer pulls history for the whole
+watchlist shortly before the open (in parallel, through MarketDataCollector so
+the bar store is topped up as well), precomputes technical indicators and
+records the cache as warm. Warmed entries are kept until a while after the
+open (regular entries expire at the session boundary), so the first trading
+cycles of the session are served from memory.
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import logging
+
+from src.data.data_collector import MarketDataCollector
+from src.data.trading_calendar import get_trading_calendar
+from src.utils.technical_indicators import add_all_indicators
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TRADING_CONFIG = os.path.join(ROOT_DIR, 'config', 'trading_config.json')
+WARM_STATUS_FILE = os.path.join('data', 'cache_warm_status.json')
+
+DEFAULT_HISTORY: Tuple[Tuple[str, str], ...] = (('1y', '1d'),)
+
+
+def load_watchlist(config_path: str = TRADING_CONFIG, default_suffix: str = '.NS') -> List[str]:
+    """
+    Load the trading symbols from the trading config.
+
+    Args:
+        config_path: Path to trading_config.json
+        default_suffix: Exchange suffix added to bare symbols ('RELIANCE' -> 'RELIANCE.NS')
+
+    Returns:
+        List of Yahoo Finance symbols
+    """
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+    return [symbol if '.' in symbol else f"{symbol}{default_suffix}"
+            for symbol in config.get('symbols', [])]
+
+
+class CacheWarmer:
+    """
+    Pre-open warm-up of the collector cache, bar store and indicators.
+    """
+
+    def __init__(self, collector: Optional[MarketDataCollector] = None,
+                 symbols: Optional[List[str]] = None,
+                 config_path: str = TRADING_CONFIG,
+                 history: Sequence[Tuple[str, str]] = DEFAULT_HISTORY,
+                 lead_minutes: int = 30,
+                 hold_minutes: int = 30,
+                 status_path: Optional[str] = WARM_STATUS_FILE):
+        """
+        Args:
+            collector: Collector whose cache/store is warmed (a new one by default)
+            symbols: Symbols to warm (defaults to the trading config watchlist)
+            config_path: Trading config used when symbols is None
+            history: (period, interval) pairs to prefetch per symbol
+            lead_minutes: How long before the open the warm-up runs
+            hold_minutes: How long into the session warmed entries stay cached
+            status_path: JSON file recording the last warm-up (None disables it)
+        """
+        self.collector = collector or MarketDataCollector()
+        self.symbols = symbols or load_watchlist(config_path)
+        self.history = list(history)
+        self.lead = pd.Timedelta(minutes=lead_minutes)
+        self.hold = pd.Timedelta(minutes=hold_minutes)
+        self.status_path = status_path
+        self.calendar = get_trading_calendar()
+        self.status: Dict = self._load_status()
+
+    def warm(self, now: Optional[pd.Timestamp] = None) -> Dict:
+        """
+        Fetch history for every symbol and precompute indicators.
+
+        Args:
+            now: Reference time (defaults to now)
+
+        Returns:
+            Status dictionary (also written to status_path)
+        """
+        started = time.perf_counter()
+        now = self._exchange_time(now)
+        expires = self.warm_expiry(now)
+        loaded, failed = set(), set()
+
+        for period, interval in self.history:
+            frames = self.collector.fetch_multiple_stocks(self.symbols, period=period, interval=interval)
+            for symbol in self.symbols:
+                data = frames.get(symbol)
+                if data is None:
+                    failed.add(symbol)
+                    continue
+                loaded.add(symbol)
+                # Re-store with the warm-up expiry: the collector's own entry
+                # would expire at the open, when it is needed most
+                self.collector.cache.put(self.collector.cache_key(symbol, period, interval),
+                                         data, interval, expires=expires)
+                try:
+                    self.collector.cache.put(self._indicator_key(symbol, period, interval),
+                                             add_all_indicators(data), interval, expires=expires)
+                except Exception as e:
+                    logger.error(f"Error precomputing indicators for {symbol}: {str(e)}")
+
+        # Sector/beta lookups during the session should not hit the network either
+        if self.collector.metadata is not None:
+            self.collector.metadata.refresh_many(self.symbols)
+
+        self.status = {
+            'warmed_at': now.isoformat(),
+            'expires': expires.isoformat(),
+            'symbols': sorted(loaded - failed),
+            'failed': sorted(failed),
+            'history': [list(item) for item in self.history],
+            'duration_seconds': round(time.perf_counter() - started, 2),
+        }
+        self._save_status()
+        logger.info(f"Cache warm-up finished: {len(self.status['symbols'])} symbols in "
+                    f"{self.status['duration_seconds']}s ({len(failed)} failed)")
+        return self.status
+
+    def get_indicators(self, symbol: str, period: str = '1y', interval: str = '1d') -> Optional[pd.DataFrame]:
+        """
+        Get indicator frame for a symbol, from the warm cache when possible.
+
+        Args:
+            symbol: Stock symbol
+            period: Time period
+            interval: Data interval
+
+        Returns:
+            DataFrame with OHLCV data and indicators, or None if no data
+        """
+        key = self._indicator_key(symbol, period, interval)
+        cached = self.collector.cache.get(key)
+        if cached is not None:
+            return cached
+
+        data = self.collector.fetch_stock_data(symbol, period, interval)
+        if data is None:
+            return None
+        result = add_all_indicators(data)
+        self.collector.cache.put(key, result, interval)
+        return result
+
+    def warm_expiry(self, now: Optional[pd.Timestamp] = None) -> pd.Timestamp:
+        """
+        Get the expiry of entries warmed now: hold_minutes after the next
+        open, or after now when warming during a session.
+        """
+        now = self._exchange_time(now)
+        start = now if self.calendar.is_open(now) else self.calendar.next_open(now)
+        return (start if start is not None else now) + self.hold
+
+    def is_warm(self, now: Optional[pd.Timestamp] = None) -> bool:
+        """
+        Check whether a warm-up ran since the last session closed.
+
+        Args:
+            now: Reference time (defaults to now)
+
+        Returns:
+            True if the caches hold everything up to the last close
+        """
+        warmed_at = self.status.get('warmed_at')
+        if not warmed_at:
+            return False
+        last_close = self.calendar.previous_close(now)
+        return last_close is None or pd.Timestamp(warmed_at) >= last_close
+
+    def next_warmup(self, now: Optional[pd.Timestamp] = None) -> Optional[pd.Timestamp]:
+        """Get the time of the next scheduled warm-up (lead time before the next open)."""
+        next_open = self.calendar.next_open(now)
+        return next_open - self.lead if next_open is not None else None
+
+    def due(self, now: Optional[pd.Timestamp] = None) -> bool:
+        """
+        Check whether a warm-up should run now.
+
+        It is due inside the lead window before an open (or during a session)
+        unless it already ran since the last close.
+        """
+        if self.is_warm(now):
+            return False
+        if self.calendar.is_open(now):
+            return True
+        next_warmup = self.next_warmup(now)
+        return next_warmup is not None and self._exchange_time(now) >= next_warmup
+
+    def maybe_warm(self, now: Optional[pd.Timestamp] = None) -> bool:
+        """Run the warm-up if it is due. Returns True if it ran."""
+        if not self.due(now):
+            return False
+        self.warm(now)
+        return True
+
+    def run_forever(self):
+        """Sleep until each pre-open window and warm the caches."""
+        while True:
+            if not self.maybe_warm():
+                next_warmup = self.next_warmup()
+                if next_warmup is None:
+                    logger.warning("No upcoming sessions in the trading calendar")
+                    return
+                wait = (next_warmup - pd.Timestamp.now(tz=self.calendar.timezone)).total_seconds()
+                logger.info(f"Next cache warm-up at {next_warmup:%Y-%m-%d %H:%M} "
+                            f"({wait / 3600:.1f}h)")
+                # Wake up at least hourly so clock changes and restarts are picked up
+                time.sleep(max(1.0, min(wait, 3600.0)))
+
+    def _exchange_time(self, now: Optional[pd.Timestamp] = None) -> pd.Timestamp:
+        if now is None:
+            return pd.Timestamp.now(tz=self.calendar.timezone)
+        now = pd.Timestamp(now)
+        return now.tz_localize(self.calendar.timezone) if now.tz is None else now.tz_convert(self.calendar.timezone)
+
+    @staticmethod
+    def _indicator_key(symbol: str, period: str, interval: str) -> str:
+        return f"{symbol}_{period}_{interval}_indicators"
+
+    def _load_status(self) -> Dict:
+        if self.status_path and os.path.exists(self.status_path):
+            try:
+                with open(self.status_path, 'r') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read warm-up status {self.status_path}: {str(e)}")
+        return {}
+
+    def _save_status(self):
+        if not self.status_path:
+            return
+        os.makedirs(os.path.dirname(self.status_path) or '.', exist_ok=True)
+        with open(self.status_path, 'w') as f:
+            json.dump(self.status, f, indent=2)
+
+
+def main():
+    """
+    Warm the caches now, or keep running and warm before every open.
+    """
+    parser = argparse.ArgumentParser(description="Prefetch market data before the open.")
+    parser.add_argument("--now", action="store_true", help="Warm immediately and exit")
+    parser.add_argument("--lead-minutes", type=int, default=30, help="Minutes before the open to warm")
+    args = parser.parse_args()
+
+    warmer = CacheWarmer(lead_minutes=args.lead_minutes)
+    print(f"Watchlist: {', '.join(warmer.symbols)}")
+
+    if args.now:
+        status = warmer.warm()
+        print(f"Warmed {len(status['symbols'])} symbols in {status['duration_seconds']}s "
+              f"at {datetime.now():%H:%M:%S}")
+        if status['failed']:
+            print(f"Failed: {', '.join(status['failed'])}")
+    else:
+        warmer.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,156 @@
+"""
+Feature preprocessing with a lazy feature registry.
+
+Each feature is a function of an IndicatorGraph bound to the input data.
+Features are computed on demand and every building block (rolling means,
+EMAs, gains/losses, ...) is memoized in the graph, so asking for a subset only
+computes that subset plus the intermediates it shares, e.g. MACD reuses
+EMA_12/EMA_26 and BB_Middle is SMA_20. Passing the same graph to
+add_all_indicators or the signal generator shares those passes with them.
+"""
+import re
+
 import pandas as pd
 import numpy as np
 
-def preprocess_data(data):
-    data['Log returns'] = np.log(data['Close'] / data['Close'].shift(1)) # calulating the log returns
-    data['Volatility'] = data['Log returns'].rolling(window=30).std()  # 30-day rolling volatility
-    data['SMA_50'] = data['Close'].rolling(window=50).mean()  # 50-day simple moving average
-    # EMA
-    data['EMA_20'] = data['Close'].ewm(span=20, adjust=False).mean()
-    # Bollinger Bands
-    data['BB_Middle'] = data['Close'].rolling(window=20).mean()
-    data['BB_Std'] = data['Close'].rolling(window=20).std()
-    data['BB_Upper'] = data['BB_Middle'] + 2 * data['BB_Std']
-    data['BB_Lower'] = data['BB_Middle'] - 2 * data['BB_Std']
-    # RSI
-    delta = data['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    data['RSI_14'] = 100 - (100 / (1 + rs))
-    # MACD
-    ema12 = data['Close'].ewm(span=12, adjust=False).mean()
-    ema26 = data['Close'].ewm(span=26, adjust=False).mean()
-    data['MACD'] = ema12 - ema26
-    data['MACD_Signal'] = data['MACD'].ewm(span=9, adjust=False).mean()
-    return data.dropna()
+from src.utils.indicator_graph import IndicatorGraph
+
+# Features computed when preprocess_data is called without a feature list
+DEFAULT_FEATURES = [
+    'Log returns', 'Volatility', 'SMA_50', 'EMA_20',
+    'BB_Middle', 'BB_Std', 'BB_Upper', 'BB_Lower',
+    'RSI_14', 'MACD', 'MACD_Signal',
+]
+
+FEATURES = {}
+
+# Parametric features such as SMA_10 or RSI_7: (pattern, factory(window))
+FEATURE_PATTERNS = []
+
+
+def feature(name):
+    """Register a named feature computed as fn(graph)."""
+    def register(fn):
+        FEATURES[name] = fn
+        return fn
+    return register
+
+
+def feature_pattern(pattern):
+    """Register a family of features whose trailing number is the window."""
+    def register(factory):
+        FEATURE_PATTERNS.append((re.compile(pattern), factory))
+        return factory
+    return register
+
+
+@feature_pattern(r'^SMA_(\d+)$')
+def _sma(window):
+    return lambda graph: graph.sma(window)
+
+
+@feature_pattern(r'^EMA_(\d+)$')
+def _ema(span):
+    return lambda graph: graph.ema(span, adjust=False)
+
+
+@feature_pattern(r'^RSI_(\d+)$')
+def _rsi(window):
+    return lambda graph: graph.rsi(window)
+
+
+@feature('Log returns')
+def _log_returns(graph):
+    return graph.series('Log_Returns')  # calulating the log returns
+
+
+@feature('Volatility')
+def _volatility(graph):
+    return graph.rolling('std', 30, 'Log_Returns')  # 30-day rolling volatility
+
+
+@feature('BB_Middle')
+def _bb_middle(graph):
+    return graph.bollinger_bands(20, 2)[1]
+
+
+@feature('BB_Std')
+def _bb_std(graph):
+    return graph.rolling('std', 20)
+
+
+@feature('BB_Upper')
+def _bb_upper(graph):
+    return graph.bollinger_bands(20, 2)[0]
+
+
+@feature('BB_Lower')
+def _bb_lower(graph):
+    return graph.bollinger_bands(20, 2)[2]
+
+
+@feature('MACD')
+def _macd(graph):
+    return graph.macd(12, 26, 9, adjust=False)[0]
+
+
+@feature('MACD_Signal')
+def _macd_signal(graph):
+    return graph.macd(12, 26, 9, adjust=False)[1]
+
+
+def _resolve(name):
+    if name in FEATURES:
+        return FEATURES[name]
+    for pattern, factory in FEATURE_PATTERNS:
+        match = pattern.match(name)
+        if match:
+            return factory(int(match.group(1)))
+    raise KeyError(f"Unknown feature: {name}")
+
+
+def compute_features(data, features, graph=None):
+    """
+    Compute named features without modifying data.
+
+    Args:
+        data: DataFrame with at least a Close column
+        features: Feature names to compute
+        graph: IndicatorGraph over data to share intermediates with other
+            consumers (a new one is created by default)
+
+    Returns:
+        Dictionary of feature name -> Series (requested features only)
+    """
+    graph = graph if graph is not None else IndicatorGraph(data)
+    computed = {}
+    for name in features:
+        try:
+            compute = _resolve(name)
+        except KeyError:
+            # Plain columns of data (e.g. Close) pass through unchanged
+            if name not in data.columns:
+                raise
+            computed[name] = data[name]
+        else:
+            computed[name] = compute(graph)
+    return computed
+
+
+def preprocess_data(data, features=None, graph=None):
+    """
+    Add features to a copy of data and drop rows with missing values.
+
+    Args:
+        data: DataFrame with OHLCV columns
+        features: Feature names to add (defaults to DEFAULT_FEATURES)
+        graph: IndicatorGraph over data (see compute_features)
+
+    Returns:
+        New DataFrame with the original columns plus the requested features
+    """
+    features = DEFAULT_FEATURES if features is None else list(features)
+    values = compute_features(data, features, graph)
+    base = data.drop(columns=[name for name in features if name in data.columns])
+    result = pd.concat([base, pd.DataFrame(values, index=data.index)], axis=1)
+    return result.dropna()
@@ -0,0 +1,91 @@
+"""
+Single-Flight Module
+
+Coalesces concurrent identical calls so only one of them does the work.
+While a call for a key is in flight, later callers with the same key wait
+for it and receive its result (or its exception) instead of starting their
+own upstream request.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """A call in flight and the callers waiting on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Duplicate call suppression keyed by an arbitrary hashable key.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        Args:
+            key: Identity of the call
+            fn: Zero-argument callable doing the actual work
+
+        Returns:
+            Tuple of (result, shared) where shared is True for callers that
+            waited on another caller's execution
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            # Forget the key before waking waiters so the next call refetches
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        if call.waiters:
+            logger.debug(f"Coalesced {call.waiters} duplicate calls for {key}")
+        return call.result, False
+
+    def stats(self) -> Dict:
+        """Get execution and coalescing counters."""
+        with self._lock:
+            return {
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls),
+            }
@@ -0,0 +1,284 @@
+"""
+Trading Calendar Module
+
+Precomputed NSE trading sessions with exchange holidays.
+
+Session open/close times for a range of years are computed once into sorted
+int64 arrays (UTC nanoseconds). A day-offset lookup table maps any calendar
+date to its session in O(1), which makes "is the market open" checks cheap
+enough to run on every tick and lets whole timestamp indexes be checked in
+a single vectorized pass.
+
+Sessions are precomputed for more years than the holiday table covers.
+Outside the covered years the calendar only knows weekends, so it logs a
+warning (once per year) whenever it answers for such a date.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+HOLIDAYS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'config', 'nse_holidays.json'
+)
+
+NS_PER_DAY = 86_400 * 1_000_000_000
+
+
+class TradingCalendar:
+    """
+    Exchange trading calendar with precomputed session arrays.
+    """
+
+    def __init__(self, holidays: Optional[List[str]] = None,
+                 open_time: str = '09:15', close_time: str = '15:30',
+                 timezone: str = 'Asia/Kolkata',
+                 start_year: int = 2000, end_year: Optional[int] = None,
+                 holiday_years: Optional[Iterable[int]] = None):
+        """
+        Args:
+            holidays: Exchange holiday dates ('YYYY-MM-DD')
+            open_time: Session open in exchange local time ('HH:MM')
+            close_time: Session close in exchange local time ('HH:MM')
+            timezone: Exchange timezone
+            start_year: First year to precompute
+            end_year: Last year to precompute (defaults to two years ahead)
+            holiday_years: Years the holiday list is complete for (defaults
+                to the years of the given holidays; with no holidays at all
+                the calendar is weekdays-only and nothing is warned about)
+        """
+        self.timezone = timezone
+        self.open_offset = pd.Timedelta(f'{open_time}:00')
+        self.close_offset = pd.Timedelta(f'{close_time}:00')
+        self.holidays = pd.DatetimeIndex(sorted(set(holidays or []))).normalize()
+        if holiday_years is None and len(self.holidays):
+            holiday_years = self.holidays.year.unique()
+        self.holiday_years = frozenset(int(year) for year in holiday_years) if holiday_years is not None else None
+        self._warned_years = set()
+
+        end_year = end_year or datetime.now().year + 2
+        days = pd.bdate_range(f'{start_year}-01-01', f'{end_year}-12-31')
+        days = days[~days.isin(self.holidays)]
+
+        # Session dates as day numbers (days since epoch) plus open/close instants
+        self.session_days = days.values.astype('datetime64[D]').astype(np.int64)
+        local_midnight = days.tz_localize(timezone)
+        self.opens = self._to_utc_ns(local_midnight + self.open_offset)
+        self.closes = self._to_utc_ns(local_midnight + self.close_offset)
+
+        # Direct lookup: day number -> session index, -1 for non-trading days
+        self.first_day = int(pd.Timestamp(f'{start_year}-01-01').value // NS_PER_DAY)
+        last_day = int(pd.Timestamp(f'{end_year}-12-31').value // NS_PER_DAY)
+        self._day_to_session = np.full(last_day - self.first_day + 1, -1, dtype=np.int32)
+        self._day_to_session[self.session_days - self.first_day] = np.arange(len(self.session_days), dtype=np.int32)
+
+    @classmethod
+    def from_config(cls, path: str = HOLIDAYS_FILE, **kwargs) -> 'TradingCalendar':
+        """
+        Build a calendar from a holiday config file.
+
+        Args:
+            path: JSON file with 'timezone', 'session' and per-year 'holidays'
+
+        Returns:
+            TradingCalendar instance
+        """
+        with open(path, 'r') as f:
+            config = json.load(f)
+
+        holidays = [day for year_days in config.get('holidays', {}).values() for day in year_days]
+        kwargs.setdefault('holiday_years', [int(year) for year in config.get('holidays', {})])
+        session = config.get('session', {})
+        kwargs.setdefault('open_time', session.get('open', '09:15'))
+        kwargs.setdefault('close_time', session.get('close', '15:30'))
+        kwargs.setdefault('timezone', config.get('timezone', 'Asia/Kolkata'))
+        return cls(holidays=holidays, **kwargs)
+
+    def is_session_day(self, date=None) -> bool:
+        """
+        Check whether a date is a trading day.
+
+        Args:
+            date: Date or timestamp (defaults to today in exchange time)
+
+        Returns:
+            True if the exchange has a session on that date
+        """
+        return self._session_index(self._local(date)) >= 0
+
+    def is_open(self, timestamp=None) -> bool:
+        """
+        Check whether the market is open at a given time.
+
+        Args:
+            timestamp: Time to check (defaults to now)
+
+        Returns:
+            True if the timestamp falls inside a session
+        """
+        local = self._local(timestamp)
+        session = self._session_index(local)
+        if session < 0:
+            return False
+        ns = self._to_ns(local)
+        return bool(self.opens[session] <= ns <= self.closes[session])
+
+    def sessions_mask(self, index: pd.DatetimeIndex, intraday: bool = True) -> np.ndarray:
+        """
+        Vectorized session check for a whole timestamp index.
+
+        Args:
+            index: Timestamps to check (naive timestamps are taken as exchange local time)
+            intraday: If False only the date is checked (for daily bars)
+
+        Returns:
+            Boolean array, True where the timestamp is in a session
+        """
+        index = pd.DatetimeIndex(index)
+        local = index.tz_convert(self.timezone) if index.tz is not None else index.tz_localize(self.timezone)
+        if self.holiday_years is not None and len(local):
+            self._check_years(local.year.unique())
+
+        days = local.tz_localize(None).values.astype('datetime64[D]').astype(np.int64)
+        offsets = days - self.first_day
+        in_range = (offsets >= 0) & (offsets < len(self._day_to_session))
+        sessions = np.full(len(days), -1, dtype=np.int32)
+        sessions[in_range] = self._day_to_session[offsets[in_range]]
+        mask = sessions >= 0
+
+        if intraday:
+            ns = self._to_utc_ns(local)
+            valid = np.flatnonzero(mask)
+            mask[valid] = (self.opens[sessions[valid]] <= ns[valid]) & (ns[valid] <= self.closes[sessions[valid]])
+
+        return mask
+
+    def next_open(self, timestamp=None) -> Optional[pd.Timestamp]:
+        """Get the next session open strictly after a timestamp."""
+        ns = self._to_ns(self._local(timestamp))
+        position = int(np.searchsorted(self.opens, ns, side='right'))
+        return self._from_ns(self.opens[position]) if position < len(self.opens) else None
+
+    def next_close(self, timestamp=None) -> Optional[pd.Timestamp]:
+        """Get the next session close at or after a timestamp."""
+        ns = self._to_ns(self._local(timestamp))
+        position = int(np.searchsorted(self.closes, ns, side='left'))
+        return self._from_ns(self.closes[position]) if position < len(self.closes) else None
+
+    def previous_close(self, timestamp=None) -> Optional[pd.Timestamp]:
+        """Get the most recent session close strictly before a timestamp."""
+        ns = self._to_ns(self._local(timestamp))
+        position = int(np.searchsorted(self.closes, ns, side='left')) - 1
+        return self._from_ns(self.closes[position]) if position >= 0 else None
+
+    def was_open_between(self, start, end=None) -> bool:
+        """
+        Check whether any session overlapped the interval [start, end].
+
+        Used to skip fetches when nothing can have traded since the last one.
+
+        Args:
+            start: Interval start
+            end: Interval end (defaults to now)
+
+        Returns:
+            True if the market was open at some point in the interval
+        """
+        start_ns = self._to_ns(self._local(start))
+        end_ns = self._to_ns(self._local(end))
+        position = int(np.searchsorted(self.closes, start_ns, side='left'))
+        return position < len(self.opens) and bool(self.opens[position] <= end_ns)
+
+    def sessions_between(self, start, end) -> pd.DatetimeIndex:
+        """
+        Get session dates between two dates (inclusive).
+
+        Args:
+            start: First date
+            end: Last date
+
+        Returns:
+            DatetimeIndex of session dates (naive, midnight)
+        """
+        first = self._day_number(self._local(start))
+        last = self._day_number(self._local(end))
+        lo = int(np.searchsorted(self.session_days, first, side='left'))
+        hi = int(np.searchsorted(self.session_days, last, side='right'))
+        return pd.DatetimeIndex(self.session_days[lo:hi].astype('datetime64[D]'))
+
+    def seconds_until_open(self, timestamp=None) -> float:
+        """Seconds until the market opens (0 if it is open now)."""
+        if self.is_open(timestamp):
+            return 0.0
+        next_open = self.next_open(timestamp)
+        if next_open is None:
+            return float('inf')
+        return (next_open - self._local(timestamp)).total_seconds()
+
+    def _session_index(self, local: pd.Timestamp) -> int:
+        offset = self._day_number(local) - self.first_day
+        if offset < 0 or offset >= len(self._day_to_session):
+            return -1
+        return int(self._day_to_session[offset])
+
+    def _check_years(self, years: Iterable[int]):
+        if self.holiday_years is None:
+            return
+        for year in years:
+            year = int(year)
+            if year not in self.holiday_years and year not in self._warned_years:
+                self._warned_years.add(year)
+                covered = ', '.join(str(known) for known in sorted(self.holiday_years)) or 'no years'
+                logger.warning(f"No exchange holidays known for {year}; treating every weekday "
+                               f"as a session (holiday table covers {covered})")
+
+    def _local(self, timestamp=None) -> pd.Timestamp:
+        if timestamp is None:
+            local = pd.Timestamp.now(tz=self.timezone)
+        else:
+            local = pd.Timestamp(timestamp)
+            local = local.tz_localize(self.timezone) if local.tz is None else local.tz_convert(self.timezone)
+        if self.holiday_years is not None and local.year not in self.holiday_years:
+            self._check_years([local.year])
+        return local
+
+    @staticmethod
+    def _day_number(local: pd.Timestamp) -> int:
+        return int(local.tz_localize(None).normalize().value // NS_PER_DAY)
+
+    @staticmethod
+    def _to_ns(timestamp: pd.Timestamp) -> int:
+        return int(timestamp.tz_convert('UTC').value)
+
+    @staticmethod
+    def _to_utc_ns(index: pd.DatetimeIndex) -> np.ndarray:
+        return index.tz_convert('UTC').tz_localize(None).values.astype('datetime64[ns]').astype(np.int64)
+
+    def _from_ns(self, ns: int) -> pd.Timestamp:
+        timestamp = pd.Timestamp(int(ns), tz='UTC').tz_convert(self.timezone)
+        if self.holiday_years is not None and timestamp.year not in self.holiday_years:
+            self._check_years([timestamp.year])
+        return timestamp
+
+
+_calendar: Optional[TradingCalendar] = None
+
+
+def get_trading_calendar() -> TradingCalendar:
+    """Get the shared NSE calendar, loading the holiday table on first use."""
+    global _calendar
+    if _calendar is None:
+        if os.path.exists(HOLIDAYS_FILE):
+            _calendar = TradingCalendar.from_config(HOLIDAYS_FILE)
+        else:
+            logger.warning(f"Holiday file {HOLIDAYS_FILE} not found; using weekdays only")
+            _calendar = TradingCalendar()
+    return _calendar
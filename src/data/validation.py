@@ -0,0 +1,165 @@
+"""
+Data Validation Module
+
+Vectorized data-quality checks for OHLCV bars.
+
+A whole frame is checked in one pass of array operations and the outcome is
+recorded as a uint16 bitmask per bar, so problems stay visible after
+cleaning instead of being silently forward-filled away.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import logging
+
+from src.data.trading_calendar import TradingCalendar
+
+logger = logging.getLogger(__name__)
+
+FLAG_COLUMN = 'Quality_Flags'
+
+MISSING_PRICE = 1 << 0      # NaN in any of Open/High/Low/Close
+NONPOSITIVE_PRICE = 1 << 1  # Price <= 0
+HIGH_BELOW_LOW = 1 << 2     # High < Low
+OUTSIDE_RANGE = 1 << 3      # Open or Close outside [Low, High]
+ZERO_VOLUME = 1 << 4        # Volume is 0 or missing
+OUTLIER_RETURN = 1 << 5     # Close-to-close return far outside the usual range
+STALE_REPEAT = 1 << 6       # Bar identical to the previous bar
+CALENDAR_GAP = 1 << 7       # Expected sessions/bars missing before this bar
+OUT_OF_SESSION = 1 << 8     # Timestamp outside any exchange session
+
+FLAG_NAMES = {
+    MISSING_PRICE: 'missing_price',
+    NONPOSITIVE_PRICE: 'nonpositive_price',
+    HIGH_BELOW_LOW: 'high_below_low',
+    OUTSIDE_RANGE: 'outside_range',
+    ZERO_VOLUME: 'zero_volume',
+    OUTLIER_RETURN: 'outlier_return',
+    STALE_REPEAT: 'stale_repeat',
+    CALENDAR_GAP: 'calendar_gap',
+    OUT_OF_SESSION: 'out_of_session',
+}
+
+DAILY_INTERVALS = {'1d', '5d', '1wk', '1mo', '3mo'}
+
+
+def validate_bars(data: pd.DataFrame, interval: str = '1d',
+                  calendar: Optional[TradingCalendar] = None,
+                  outlier_mads: float = 10.0) -> np.ndarray:
+    """
+    Check a frame of OHLCV bars and return per-bar quality flags.
+
+    Args:
+        data: Raw OHLCV data (before cleaning)
+        interval: Bar interval, selects daily vs intraday calendar checks
+        calendar: Trading calendar for gap/session checks (skipped when None)
+        outlier_mads: Returns further than this many median absolute
+            deviations from the median return are flagged as outliers
+
+    Returns:
+        uint16 array of flag bitmasks aligned with data's rows
+    """
+    n = len(data)
+    flags = np.zeros(n, dtype=np.uint16)
+    if n == 0:
+        return flags
+
+    columns = [col for col in ['Open', 'High', 'Low', 'Close'] if col in data.columns]
+    prices = data[columns].to_numpy(dtype=np.float64)
+    col = {name: i for i, name in enumerate(columns)}
+
+    missing = np.isnan(prices)
+    flags[missing.any(axis=1)] |= MISSING_PRICE
+    with np.errstate(invalid='ignore'):
+        flags[(prices <= 0).any(axis=1)] |= NONPOSITIVE_PRICE
+
+        if 'High' in col and 'Low' in col:
+            high, low = prices[:, col['High']], prices[:, col['Low']]
+            flags[high < low] |= HIGH_BELOW_LOW
+            for name in ('Open', 'Close'):
+                if name in col:
+                    value = prices[:, col[name]]
+                    flags[(value > high) | (value < low)] |= OUTSIDE_RANGE
+
+    if 'Volume' in data.columns:
+        volume = data['Volume'].to_numpy(dtype=np.float64)
+        flags[~(volume > 0)] |= ZERO_VOLUME
+    else:
+        volume = None
+
+    if 'Close' in col and n > 1:
+        close = prices[:, col['Close']]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.diff(np.log(close))
+        finite = np.isfinite(returns)
+        if finite.sum() > 2:
+            median = np.median(returns[finite])
+            mad = np.median(np.abs(returns[finite] - median))
+            if mad > 0:
+                with np.errstate(invalid='ignore'):
+                    outliers = np.abs(returns - median) > outlier_mads * mad
+                flags[1:][outliers] |= OUTLIER_RETURN
+
+    if n > 1:
+        same = (prices[1:] == prices[:-1]).all(axis=1)
+        if volume is not None:
+            same &= volume[1:] == volume[:-1]
+        flags[1:][same] |= STALE_REPEAT
+
+    if calendar is not None and isinstance(data.index, pd.DatetimeIndex):
+        flags |= _calendar_flags(data.index, interval, calendar)
+
+    return flags
+
+
+def _calendar_flags(index: pd.DatetimeIndex, interval: str,
+                    calendar: TradingCalendar) -> np.ndarray:
+    """Flag bars outside sessions and bars that follow missing sessions/bars."""
+    flags = np.zeros(len(index), dtype=np.uint16)
+    daily = interval in DAILY_INTERVALS
+
+    flags[~calendar.sessions_mask(index, intraday=not daily)] |= OUT_OF_SESSION
+
+    # Weekly/monthly bars span several sessions, so gaps are not checked
+    if daily and interval != '1d':
+        return flags
+
+    local = index.tz_convert(calendar.timezone) if index.tz is not None else index.tz_localize(calendar.timezone)
+    days = local.tz_localize(None).values.astype('datetime64[D]').astype(np.int64)
+    sessions = np.searchsorted(calendar.session_days, days)
+    session_step = np.diff(sessions)
+
+    if daily:
+        flags[1:][session_step > 1] |= CALENDAR_GAP
+        return flags
+
+    # Intraday: a gap is a jump of more than one bar inside a session, or a
+    # skipped session between consecutive bars
+    step_ns = pd.Timedelta(interval.replace('m', 'min') if interval.endswith('m') else interval).value
+    ns = local.tz_convert('UTC').tz_localize(None).values.astype('datetime64[ns]').astype(np.int64)
+    same_session = session_step == 0
+    gap = (same_session & (np.diff(ns) > step_ns)) | (session_step > 1)
+    flags[1:][gap] |= CALENDAR_GAP
+    return flags
+
+
+def summarize_flags(flags: np.ndarray) -> Dict[str, int]:
+    """
+    Count bars per flag.
+
+    Args:
+        flags: Bitmask array from validate_bars
+
+    Returns:
+        Dictionary of flag name -> number of flagged bars (non-zero only)
+    """
+    flags = np.asarray(flags)
+    counts = {name: int(np.count_nonzero(flags & bit)) for bit, name in FLAG_NAMES.items()}
+    return {name: count for name, count in counts.items() if count}
+
+
+def describe_flags(value: int) -> List[str]:
+    """Get the names of the flags set in one bitmask value."""
+    return [name for bit, name in FLAG_NAMES.items() if int(value) & bit]
@@ -1,7 +1,7 @@
 import pandas as pd
 from prophet import Prophet
 
-def train_prophet_model(data, steps=30):
+def train_prophet_model(data, steps=30, freq='D'):
     df_prophet = data.reset_index() # converts the index to a column
     # Ensure the date column is named 'ds' and is a Series
     if 'Date' in df_prophet.columns:
@@ -18,7 +18,8 @@ def train_prophet_model(data, steps=30):
     df_prophet['y'] = pd.to_numeric(df_prophet['y'], errors='coerce')
     model = Prophet(daily_seasonality=True, yearly_seasonality=True, weekly_seasonality=True)
     model.fit(df_prophet)
-    future = model.make_future_dataframe(periods=steps)
+    # freq='B' forecasts trading days instead of calendar days
+    future = model.make_future_dataframe(periods=steps, freq=freq)
     forecast = model.predict(future)
     forecast = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
     return forecast, model
\ No newline at end of file
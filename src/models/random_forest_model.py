@@ -1,16 +1,14 @@
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor
+from src.data.preprocessor import preprocess_data
 
 def train_rf_model(data, steps=7, target_dates=None):
     # Prepare features
-    df = data.copy()
-    df['SMA_10'] = df['Close'].rolling(window=10).mean()
-    df['SMA_30'] = df['Close'].rolling(window=30).mean()
-    df = df.dropna()
+    feature_names = ['SMA_10', 'SMA_30']
+    df = preprocess_data(data, features=feature_names)
     
     # Train model
-    feature_names = ['SMA_10', 'SMA_30']
     X = df[feature_names]
     y = df['Close']
     model = RandomForestRegressor(n_estimators=100, random_state=42)
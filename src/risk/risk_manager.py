@@ -4,6 +4,7 @@ Advanced Risk Management System
 """
 import sys
 sys.path.append('scripts')
+sys.path.append('.')
 
 import pandas as pd
 import numpy as np
@@ -12,6 +13,9 @@ import json
 import os
 from typing import Dict, List, Tuple
 
+from src.data.trading_calendar import get_trading_calendar
+from src.data.metadata_store import get_metadata_store
+
 class RiskManager:
     """Advanced risk management for trading strategies"""
     
@@ -36,6 +40,12 @@ class RiskManager:
         self.daily_pnl = []
         self.risk_metrics = {}
         
+        # Exchange sessions and holidays
+        self.calendar = get_trading_calendar()
+        
+        # Local sector lookups for concentration checks
+        self.metadata = get_metadata_store()
+        
         # Load historical data
         self.load_risk_data()
     
@@ -80,20 +90,27 @@ class RiskManager:
         # Return the smaller of the two limits
         return min(max_shares, max_shares_by_concentration)
     
+    def lookup_sector(self, symbol: str) -> str:
+        """Local sector lookup; unknown symbols are fetched in the background, never inline"""
+        sector = self.metadata.get_sector(symbol, fetch_missing=False)
+        if sector is None:
+            self.metadata.refresh_in_background([symbol])
+        return sector
+    
     def validate_trade(self, symbol: str, action: str, quantity: int, 
                       price: float, sector: str = None) -> Tuple[bool, str]:
         """Validate if trade meets risk criteria"""
         
-        # Check if market is open (basic check)
-        now = datetime.now()
-        if now.weekday() >= 5:  # Weekend
-            return False, "Market is closed (weekend)"
+        # Check if market is open
+        if not self.calendar.is_session_day():
+            return False, "Market is closed (weekend or exchange holiday)"
         
         # Check trading hours (9:15 AM to 3:30 PM IST)
-        if not (9 <= now.hour < 15 or (now.hour == 15 and now.minute <= 30)):
+        if not self.calendar.is_open():
             return False, "Market is closed (outside trading hours)"
         
         trade_value = quantity * price
+        sector = sector or self.lookup_sector(symbol)
         
         if action.upper() == 'BUY':
             # Check available capital
@@ -126,6 +143,7 @@ class RiskManager:
     def update_position(self, symbol: str, action: str, quantity: int, 
                        price: float, sector: str = None):
         """Update position tracking"""
+        sector = sector or self.positions.get(symbol, {}).get('sector') or self.lookup_sector(symbol)
         
         if symbol not in self.positions:
             self.positions[symbol] = {
@@ -17,25 +17,83 @@ def calculate_slippage(price, shares, slippage_pct=0.001):
     return price * slippage_pct * (1 + np.log10(shares))
 
 
+def align_panel(stock_data_dict, signal_column='Signal'):
+    """Align tickers to one calendar as (time x symbols) arrays.
+
+    The calendar is the sorted union of every ticker's dates. Missing bars
+    have a NaN price and no signal.
+
+    Returns:
+        (dates, tickers, prices, buys, sells)
+    """
+    tickers = list(stock_data_dict)
+    frames = {}
+    for ticker in tickers:
+        data = stock_data_dict[ticker]
+        frames[ticker] = data[~data.index.duplicated(keep='last')]
+    indexes = [frame.index for frame in frames.values()]
+    dates = indexes[0].append(indexes[1:]).unique().sort_values()
+
+    shape = (len(dates), len(tickers))
+    prices = np.full(shape, np.nan)
+    buys = np.zeros(shape, dtype=bool)
+    sells = np.zeros(shape, dtype=bool)
+    for j, ticker in enumerate(tickers):
+        data = frames[ticker]
+        rows = dates.get_indexer(data.index)
+        signals = data[signal_column].to_numpy(dtype=object)
+        prices[rows, j] = data['Close'].to_numpy(dtype=np.float64)
+        buys[rows, j] = signals == 'Buy'
+        sells[rows, j] = signals == 'Sell'
+    return dates, tickers, prices, buys, sells
+
+
 def multi_asset_backtest(stock_data_dict, signal_column='Signal', initial_capital=100000):
-    portfolio = {'cash': initial_capital, 'positions': {k: 0 for k in stock_data_dict}}
-    history = []
-    dates = stock_data_dict[list(stock_data_dict.keys())[0]].index
-    for date in dates:
-        daily_value = portfolio['cash']
-        for ticker, data in stock_data_dict.items():
-            price = data.loc[date, 'Close']
-            signal = data.loc[date, signal_column]
-            if signal == 'Buy' and portfolio['cash'] >= price:
-                shares = int(portfolio['cash'] // price)
-                portfolio['positions'][ticker] += shares
-                portfolio['cash'] -= shares * price
-            elif signal == 'Sell' and portfolio['positions'][ticker] > 0:
-                portfolio['cash'] += portfolio['positions'][ticker] * price
-                portfolio['positions'][ticker] = 0
-            daily_value += portfolio['positions'][ticker] * price
-        history.append({'Date': date, 'Portfolio Value': daily_value})
-    return pd.DataFrame(history)
+    """Backtest Buy/Sell signals across tickers sharing one cash balance.
+
+    Tickers are aligned to the union of their dates once and the engine
+    steps through time over (time x symbols) arrays. On each date tickers
+    trade in dictionary order (a Buy uses all remaining cash). A ticker
+    without a bar on a date does not trade and is valued at its last price.
+    """
+    if not stock_data_dict:
+        return pd.DataFrame([])
+    dates, tickers, prices, buys, sells = align_panel(stock_data_dict, signal_column)
+    tradable = ~np.isnan(prices)
+    buys &= tradable
+    sells &= tradable
+    active = np.flatnonzero((buys | sells).any(axis=1))
+    # Last known price of every ticker, for valuing positions on missing bars
+    marks = pd.DataFrame(prices).ffill().fillna(0.0).to_numpy()
+
+    cash = initial_capital
+    positions = np.zeros(len(tickers), dtype=np.int64)
+    cash_history = np.empty(len(dates))
+    position_history = np.zeros((len(active), len(tickers)), dtype=np.int64)
+    last = 0
+    for k, t in enumerate(active):
+        cash_history[last:t] = cash
+        for j in np.flatnonzero(buys[t] | sells[t]):
+            price = prices[t, j]
+            if buys[t, j] and cash >= price:
+                shares = int(cash // price)
+                positions[j] += shares
+                cash -= shares * price
+            elif sells[t, j] and positions[j] > 0:
+                cash += positions[j] * price
+                positions[j] = 0
+        position_history[k] = positions
+        last = t
+    cash_history[last:] = cash
+
+    # Positions only change on active dates; carry them forward in between
+    held = np.zeros((len(dates), len(tickers)), dtype=np.int64)
+    if len(active):
+        segment = np.searchsorted(active, np.arange(len(dates)), side='right') - 1
+        has_position = segment >= 0
+        held[has_position] = position_history[segment[has_position]]
+    values = cash_history + (held * marks).sum(axis=1)
+    return pd.DataFrame({'Date': dates, 'Portfolio Value': values})
 
 
 def position_size(capital, risk_per_trade, stop_loss_pct, price):
@@ -45,36 +103,46 @@ def position_size(capital, risk_per_trade, stop_loss_pct, price):
     return shares
 
 
+def _signal_masks(data, signal_column):
+    signals = data[signal_column]
+    return signals.eq('Buy').tolist(), signals.eq('Sell').tolist()
+
+
 def simple_backtest_with_risk(data, signal_column='Signal', initial_capital=100000, risk_per_trade=0.01, stop_loss_pct=0.05, take_profit_pct=0.10):
+    """Backtest with risk-based sizing, stop-loss and take-profit.
+
+    Runs the per-bar state machine over plain arrays instead of iterrows;
+    the equity curve is identical to walking the DataFrame row by row.
+    """
+    if len(data) == 0:
+        return pd.DataFrame([])
+    prices = data['Close'].tolist()
+    buys, sells = _signal_masks(data, signal_column)
+    stop_factor = 1 - stop_loss_pct
+    take_factor = 1 + take_profit_pct
+
     capital = initial_capital
     position = 0
     entry_price = 0
-    history = []
-    for idx, row in data.iterrows():
-        price = row['Close']
-        signal = row[signal_column]
-        if signal == 'Buy' and position == 0:
+    values = [0.0] * len(prices)
+    for i, price in enumerate(prices):
+        if buys[i] and position == 0:
             shares = position_size(capital, risk_per_trade, stop_loss_pct, price)
             position = shares
             entry_price = price
             capital -= shares * price
-        elif signal == 'Sell' and position > 0:
-            capital += position * price
-            position = 0
-            entry_price = 0
-        # Stop-loss
-        if position > 0 and price <= entry_price * (1 - stop_loss_pct):
+        elif sells[i] and position > 0:
             capital += position * price
             position = 0
             entry_price = 0
-        # Take-profit
-        if position > 0 and price >= entry_price * (1 + take_profit_pct):
-            capital += position * price
-            position = 0
-            entry_price = 0
-        portfolio_value = capital + position * price
-        history.append({'Date': idx, 'Portfolio Value': portfolio_value})
-    return pd.DataFrame(history)
+        if position > 0:
+            # Stop-loss, then take-profit
+            if price <= entry_price * stop_factor or price >= entry_price * take_factor:
+                capital += position * price
+                position = 0
+                entry_price = 0
+        values[i] = capital + position * price
+    return pd.DataFrame({'Date': data.index, 'Portfolio Value': values})
 
 
 def risk_metrics(portfolio_df):
@@ -97,48 +165,76 @@ def risk_metrics(portfolio_df):
     }
 
 
-def simple_backtest_with_costs(data, signal_column='Signal', initial_capital=100000,
-                             commission_pct=0.001, slippage_pct=0.001):
-    """Backtest with transaction costs and slippage"""
-    portfolio = {'cash': initial_capital, 'position': 0}
-    transactions = []
-    history = []
-    
-    for idx, row in data.iterrows():
+def costs_engine(prices, buys, sells, initial_capital=100000,
+                 commission_pct=0.001, slippage_pct=0.001):
+    """Array core of simple_backtest_with_costs.
+
+    Args are per-bar sequences of prices and Buy/Sell flags.
+
+    Returns:
+        (portfolio values, cash, positions, trades) where values/cash/positions
+        are recorded before each bar's trade and trades are
+        (bar, type, price, shares, costs) tuples
+    """
+    prices = prices.tolist() if isinstance(prices, np.ndarray) else list(prices)
+    buys = buys.tolist() if isinstance(buys, np.ndarray) else list(buys)
+    sells = sells.tolist() if isinstance(sells, np.ndarray) else list(sells)
+
+    cash = initial_capital
+    position = 0
+    trades = []
+    n = len(prices)
+    values, cash_history, positions = [0.0] * n, [0.0] * n, [0] * n
+
+    for i, price in enumerate(prices):
         # Record daily portfolio value
-        current_value = portfolio['cash'] + portfolio['position'] * row['Close']
-        history.append({
-            'Date': idx,
-            'Portfolio Value': current_value,
-            'Cash': portfolio['cash'],
-            'Position': portfolio['position']
-        })
-        
+        values[i] = cash + position * price
+        cash_history[i] = cash
+        positions[i] = position
+
         # Process signals
-        if row[signal_column] == 'Buy' and portfolio['cash'] > 0:
-            shares = int(portfolio['cash'] * 0.95 / row['Close'])  # Use 95% of cash
+        if buys[i] and cash > 0:
+            shares = int(cash * 0.95 / price)  # Use 95% of cash
             if shares > 0:
-                slippage = calculate_slippage(row['Close'], shares, slippage_pct)
-                commission = shares * row['Close'] * commission_pct
-                total_cost = shares * (row['Close'] + slippage) + commission
-                
-                if total_cost <= portfolio['cash']:
-                    portfolio['cash'] -= total_cost
-                    portfolio['position'] += shares
-                    transactions.append(Transaction(
-                        idx, 'Buy', row['Close'], shares, commission + slippage * shares
-                    ))
-        
-        elif row[signal_column] == 'Sell' and portfolio['position'] > 0:
-            shares = portfolio['position']
-            slippage = calculate_slippage(row['Close'], shares, slippage_pct)
-            commission = shares * row['Close'] * commission_pct
-            total_proceeds = shares * (row['Close'] - slippage) - commission
-            
-            portfolio['cash'] += total_proceeds
-            portfolio['position'] = 0
-            transactions.append(Transaction(
-                idx, 'Sell', row['Close'], shares, commission + slippage * shares
-            ))
-    
-    return pd.DataFrame(history), transactions
+                slippage = calculate_slippage(price, shares, slippage_pct)
+                commission = shares * price * commission_pct
+                total_cost = shares * (price + slippage) + commission
+
+                if total_cost <= cash:
+                    cash -= total_cost
+                    position += shares
+                    trades.append((i, 'Buy', price, shares, commission + slippage * shares))
+
+        elif sells[i] and position > 0:
+            shares = position
+            slippage = calculate_slippage(price, shares, slippage_pct)
+            commission = shares * price * commission_pct
+            total_proceeds = shares * (price - slippage) - commission
+
+            cash += total_proceeds
+            position = 0
+            trades.append((i, 'Sell', price, shares, commission + slippage * shares))
+
+    return values, cash_history, positions, trades
+
+
+def simple_backtest_with_costs(data, signal_column='Signal', initial_capital=100000,
+                             commission_pct=0.001, slippage_pct=0.001):
+    """Backtest with transaction costs and slippage
+
+    Runs over plain arrays instead of iterrows; the history and transactions
+    are identical to walking the DataFrame row by row.
+    """
+    if len(data) == 0:
+        return pd.DataFrame([]), []
+    buys, sells = _signal_masks(data, signal_column)
+    values, cash_history, positions, trades = costs_engine(
+        data['Close'].tolist(), buys, sells, initial_capital, commission_pct, slippage_pct
+    )
+
+    # Box the trade dates in one go rather than indexing the index per trade
+    trade_dates = data.index[[trade[0] for trade in trades]]
+    transactions = [Transaction(date, *trade[1:]) for date, trade in zip(trade_dates, trades)]
+    history = pd.DataFrame({'Date': data.index, 'Portfolio Value': values,
+                            'Cash': cash_history, 'Position': positions})
+    return history, transactions
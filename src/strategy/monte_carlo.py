@@ -0,0 +1,248 @@
+"""
+Monte Carlo Module
+
+Bootstrap confidence intervals for backtest metrics.
+
+A single equity curve gives one Sharpe ratio, one max drawdown and one total
+return. This module resamples a backtest's returns into thousands of
+alternative paths, held as one (samples x periods) array, and computes the
+risk_metrics figures for every path at once: the drawdown is a running
+maximum along the time axis and the Sharpe ratio a row-wise mean over
+standard deviation. Large sample counts are processed in chunks, optionally
+on several worker processes with independent random streams.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import logging
+
+from src.strategy.backtester import risk_metrics
+
+logger = logging.getLogger(__name__)
+
+METRICS = ('Sharpe Ratio', 'Max Drawdown', 'Total Return')
+RESAMPLE_METHODS = ('block', 'shuffle')
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def portfolio_returns(portfolio_df: pd.DataFrame) -> np.ndarray:
+    """
+    Per-period returns of a backtest's equity curve.
+
+    Args:
+        portfolio_df: Backtest output with a 'Portfolio Value' column
+
+    Returns:
+        Array of returns (as used by risk_metrics)
+    """
+    return portfolio_df['Portfolio Value'].pct_change().dropna().to_numpy(dtype=np.float64)
+
+
+def block_bootstrap(returns: np.ndarray, n_samples: int, block_size: int = 20,
+                    rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Circular block bootstrap of a return series.
+
+    Each path is built from randomly placed blocks of consecutive returns
+    (wrapping around the end), which keeps short-range autocorrelation and
+    volatility clustering that resampling single returns would destroy.
+
+    Args:
+        returns: 1D array of returns
+        n_samples: Number of paths
+        block_size: Length of the resampled blocks
+        rng: NumPy random generator
+
+    Returns:
+        Array of shape (n_samples, len(returns))
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    rng = rng or np.random.default_rng()
+    n = len(returns)
+    block_size = max(1, min(block_size, n))
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n, size=(n_samples, n_blocks))
+    index = (starts[:, :, None] + np.arange(block_size)).reshape(n_samples, -1)[:, :n]
+    return returns[index % n]
+
+
+def trade_shuffle(returns: np.ndarray, n_samples: int,
+                  rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Random reorderings of a return series.
+
+    Every path holds the same returns, so the total return is unchanged and
+    the spread of drawdowns shows how much of the observed one is down to
+    the order the returns happened in. Pass per-trade returns to shuffle
+    trades rather than bars.
+
+    Args:
+        returns: 1D array of returns
+        n_samples: Number of paths
+        rng: NumPy random generator
+
+    Returns:
+        Array of shape (n_samples, len(returns))
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    rng = rng or np.random.default_rng()
+    return rng.permuted(np.broadcast_to(returns, (n_samples, len(returns))), axis=1)
+
+
+def path_metrics(paths: np.ndarray, periods_per_year: int = 252) -> Dict[str, np.ndarray]:
+    """
+    risk_metrics for every row of a (samples x periods) return array.
+
+    Args:
+        paths: Array of returns, one path per row
+        periods_per_year: Annualization factor of the Sharpe ratio
+
+    Returns:
+        Dictionary of metric name -> array with one value per path
+    """
+    paths = np.atleast_2d(np.asarray(paths, dtype=np.float64))
+    n_samples, n_periods = paths.shape
+
+    # Equity curves starting at 1, like a portfolio starting at its capital
+    equity = np.ones((n_samples, n_periods + 1))
+    np.cumprod(1 + paths, axis=1, out=equity[:, 1:])
+    running_max = np.maximum.accumulate(equity, axis=1)
+    max_drawdown = ((equity - running_max) / running_max).min(axis=1)
+
+    if n_periods > 1:
+        mean = paths.mean(axis=1)
+        std = paths.std(axis=1, ddof=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sharpe = np.where(std > 0, mean / std * np.sqrt(periods_per_year), 0.0)
+    else:
+        sharpe = np.zeros(n_samples)
+
+    return {
+        'Sharpe Ratio': sharpe,
+        'Max Drawdown': max_drawdown,
+        'Total Return': equity[:, -1] - 1,
+    }
+
+
+def _resample_metrics(returns: np.ndarray, n_samples: int, method: str, block_size: int,
+                      periods_per_year: int, seed) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    if method == 'block':
+        paths = block_bootstrap(returns, n_samples, block_size, rng)
+    else:
+        paths = trade_shuffle(returns, n_samples, rng)
+    return path_metrics(paths, periods_per_year)
+
+
+def monte_carlo(returns: Sequence[float], n_samples: int = 10000, method: str = 'block',
+                block_size: int = 20, periods_per_year: int = 252, seed: Optional[int] = None,
+                n_jobs: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> pd.DataFrame:
+    """
+    Metric distributions over resampled return paths.
+
+    Paths are generated and reduced in chunks of chunk_size rows so memory
+    stays bounded. Each chunk draws from its own child of one SeedSequence,
+    so results for a given seed do not depend on n_jobs.
+
+    Args:
+        returns: Backtest returns (see portfolio_returns) or per-trade returns;
+            NaN and infinite values are dropped
+        n_samples: Number of resampled paths
+        method: 'block' (block_bootstrap) or 'shuffle' (trade_shuffle)
+        block_size: Block length for the block bootstrap
+        periods_per_year: Annualization factor of the Sharpe ratio
+        seed: Seed for reproducible results
+        n_jobs: Worker processes (-1 for the CPU count; 1 runs in-process)
+        chunk_size: Paths per chunk
+
+    Returns:
+        DataFrame with one row per path and a column per metric
+
+    Raises:
+        ValueError: For an unknown method, n_samples or chunk_size below 1,
+            or fewer than 2 finite returns
+    """
+    if method not in RESAMPLE_METHODS:
+        raise ValueError(f"Unknown resampling method: {method}")
+    if n_samples < 1:
+        raise ValueError(f"n_samples must be at least 1, got {n_samples}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    returns = np.asarray(returns, dtype=np.float64)
+    # A portfolio passing through zero value gives inf/NaN returns, which
+    # would poison every path they are drawn into
+    finite = np.isfinite(returns)
+    if not finite.all():
+        logger.warning(f"Dropping {int((~finite).sum())} non-finite returns before resampling")
+        returns = returns[finite]
+    if len(returns) < 2:
+        raise ValueError("Need at least 2 finite returns to resample")
+
+    sizes = [chunk_size] * (n_samples // chunk_size)
+    if n_samples % chunk_size:
+        sizes.append(n_samples % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    workers = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+    workers = min(workers, len(sizes))
+    if workers <= 1:
+        chunks = [_resample_metrics(returns, size, method, block_size, periods_per_year, chunk_seed)
+                  for size, chunk_seed in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_resample_metrics, returns, size, method, block_size,
+                                       periods_per_year, chunk_seed)
+                       for size, chunk_seed in zip(sizes, seeds)]
+            chunks = [future.result() for future in futures]
+
+    return pd.DataFrame({metric: np.concatenate([chunk[metric] for chunk in chunks])
+                         for metric in METRICS})
+
+
+def confidence_intervals(distribution: pd.DataFrame, confidence: float = 0.95,
+                         observed: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """
+    Summarize metric distributions as percentile confidence intervals.
+
+    Args:
+        distribution: Output of monte_carlo
+        confidence: Two-sided confidence level
+        observed: Metrics of the actual backtest (risk_metrics output), shown
+            alongside with the share of paths that did worse
+
+    Returns:
+        DataFrame indexed by metric with mean, median, lower and upper bounds
+    """
+    tail = (1 - confidence) / 2
+    summary = pd.DataFrame({
+        'mean': distribution.mean(),
+        'median': distribution.median(),
+        'lower': distribution.quantile(tail),
+        'upper': distribution.quantile(1 - tail),
+    })
+    if observed is not None:
+        summary['observed'] = pd.Series(observed)
+        summary['percentile'] = pd.Series({metric: float((distribution[metric] < value).mean())
+                                           for metric, value in observed.items()
+                                           if metric in distribution})
+    return summary
+
+
+def backtest_confidence(portfolio_df: pd.DataFrame, confidence: float = 0.95, **kwargs) -> pd.DataFrame:
+    """
+    Confidence intervals for the risk_metrics of a backtest.
+
+    Args:
+        portfolio_df: Backtest output with a 'Portfolio Value' column
+        confidence: Two-sided confidence level
+        **kwargs: Passed to monte_carlo (n_samples, method, seed, n_jobs, ...)
+
+    Returns:
+        Output of confidence_intervals, including the observed metrics
+    """
+    distribution = monte_carlo(portfolio_returns(portfolio_df), **kwargs)
+    return confidence_intervals(distribution, confidence, observed=risk_metrics(portfolio_df))
@@ -0,0 +1,286 @@
+"""
+Parameter Sweep Module
+
+Parallel grid search over strategy parameters.
+
+Parameter combinations are evaluated with the backtester on a process pool.
+Price and indicator arrays are placed in shared memory once; workers attach
+to them by name instead of each receiving a pickled copy of the data. Every
+finished combination is appended to a JSON Lines file immediately, so an
+interrupted run keeps its results and a rerun skips what is already done.
+"""
+
+import itertools
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import logging
+
+from src.strategy.backtester import costs_engine, risk_metrics
+from src.utils.technical_indicators import TechnicalIndicators, moving_average_sweep
+
+logger = logging.getLogger(__name__)
+
+# name -> (shared memory block name, shape, dtype)
+ArraySpec = Dict[str, Tuple[str, Tuple[int, ...], str]]
+Evaluator = Callable[[Dict[str, np.ndarray], Dict], Dict]
+
+
+class SharedArrays:
+    """
+    Named NumPy arrays copied into shared memory blocks.
+
+    Use as a context manager in the parent process; the blocks are unlinked
+    on exit. Pass `spec` to worker processes and call attach_arrays there.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.spec: ArraySpec = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+        try:
+            for name, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+                self._blocks.append(block)
+                view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+                view[...] = array
+                self.arrays[name] = view
+                self.spec[name] = (block.name, array.shape, array.dtype.str)
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        """Release and unlink the shared memory blocks."""
+        self.arrays = {}
+        for block in self._blocks:
+            block.close()
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Worker-side state: blocks stay open for the life of the worker process
+_worker_blocks: List[shared_memory.SharedMemory] = []
+_worker_arrays: Dict[str, np.ndarray] = {}
+
+
+def attach_arrays(spec: ArraySpec) -> Dict[str, np.ndarray]:
+    """
+    Attach to arrays created by SharedArrays (read-only views).
+
+    Args:
+        spec: SharedArrays.spec
+
+    Returns:
+        Dictionary of name -> array backed by shared memory
+    """
+    arrays = {}
+    for name, (block_name, shape, dtype) in spec.items():
+        # Workers share the parent's resource tracker (see run_sweep), which
+        # already tracks the block; the parent unlinks it when the sweep ends
+        block = shared_memory.SharedMemory(name=block_name)
+        _worker_blocks.append(block)
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        arrays[name] = array
+    return arrays
+
+
+def _init_worker(spec: ArraySpec):
+    _worker_arrays.update(attach_arrays(spec))
+
+
+def _evaluate_in_worker(evaluate: Evaluator, params: Dict) -> Dict:
+    return _evaluate(evaluate, _worker_arrays, params)
+
+
+def _evaluate(evaluate: Evaluator, arrays: Dict[str, np.ndarray], params: Dict) -> Dict:
+    try:
+        return {**params, **evaluate(arrays, params)}
+    except Exception as e:
+        return {**params, 'error': f"{type(e).__name__}: {e}"}
+
+
+def parameter_grid(grid: Dict[str, Iterable]) -> List[Dict]:
+    """
+    Expand {name: values} into the list of all combinations.
+
+    Args:
+        grid: Parameter name -> candidate values
+
+    Returns:
+        List of parameter dictionaries (itertools.product order)
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def _to_builtin(value):
+    # NumPy scalars in parameters/metrics -> plain JSON numbers
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def _params_key(params: Dict) -> str:
+    return json.dumps(params, sort_keys=True, default=_to_builtin)
+
+
+def load_results(path: str) -> List[Dict]:
+    """Read a JSON Lines results file, skipping a partially written last line."""
+    results = []
+    if not os.path.exists(path):
+        return results
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                results.append(json.loads(line))
+            except ValueError:
+                logger.warning(f"Skipping unreadable line in {path}")
+    return results
+
+
+def run_sweep(arrays: Dict[str, np.ndarray], combinations: List[Dict], evaluate: Evaluator,
+              results_path: Optional[str] = None, max_workers: Optional[int] = None,
+              resume: bool = True) -> pd.DataFrame:
+    """
+    Evaluate every parameter combination, in parallel.
+
+    Args:
+        arrays: Named price/indicator arrays shared with every evaluation
+        combinations: Parameter dictionaries (see parameter_grid)
+        evaluate: Module-level function evaluate(arrays, params) -> metrics dict
+        results_path: JSON Lines file results are appended to as they finish
+        max_workers: Worker processes (defaults to the CPU count; 1 runs in-process)
+        resume: Skip combinations already present in results_path
+
+    Returns:
+        DataFrame with one row per combination (parameters plus metrics)
+    """
+    # Failed combinations are retried on resume
+    done = [row for row in load_results(results_path) if 'error' not in row] \
+        if (results_path and resume) else []
+    names = list(combinations[0]) if combinations else []
+    wanted = {_params_key(params) for params in combinations}
+    done = [row for row in done if _params_key({name: row.get(name) for name in names}) in wanted]
+    done_keys = {_params_key({name: row.get(name) for name in names}) for row in done}
+    pending = [params for params in combinations if _params_key(params) not in done_keys]
+    if done:
+        logger.info(f"Resuming sweep: {len(combinations) - len(pending)} of {len(combinations)} "
+                    f"combinations already in {results_path}")
+
+    results = list(done)
+    out = None
+    if results_path:
+        os.makedirs(os.path.dirname(results_path) or '.', exist_ok=True)
+        out = open(results_path, 'a' if resume else 'w')
+        if resume and out.tell() > 0:
+            # Terminate a line cut short by a crash before appending
+            with open(results_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    out.write('\n')
+
+    def record(result):
+        results.append(result)
+        if out is not None:
+            out.write(json.dumps(result, default=_to_builtin) + '\n')
+            out.flush()
+
+    try:
+        workers = max_workers or os.cpu_count() or 1
+        if workers <= 1 or len(pending) <= 1:
+            for params in pending:
+                record(_evaluate(evaluate, arrays, params))
+        else:
+            # spawn workers inherit the parent's resource tracker rather than
+            # starting their own, so attaching does not hand ownership of the
+            # blocks to a tracker that would unlink them when a worker exits
+            with SharedArrays(arrays) as shared, ProcessPoolExecutor(
+                    max_workers=min(workers, len(pending)),
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker, initargs=(shared.spec,)) as executor:
+                futures = [executor.submit(_evaluate_in_worker, evaluate, params) for params in pending]
+                for i, future in enumerate(as_completed(futures), 1):
+                    record(future.result())
+                    if i % 100 == 0:
+                        logger.info(f"Sweep progress: {i}/{len(pending)}")
+    finally:
+        if out is not None:
+            out.close()
+
+    return pd.DataFrame(results)
+
+
+def rsi_threshold_arrays(data: pd.DataFrame, rsi_window: int = 14, sma_window: int = 20) -> Dict[str, np.ndarray]:
+    """
+    Arrays used by evaluate_rsi_threshold: Close, RSI and SMA.
+
+    Args:
+        data: DataFrame with a Close column
+        rsi_window: RSI period
+        sma_window: Moving average the price deviation is measured against
+
+    Returns:
+        Dictionary of float64 arrays
+    """
+    close = data['Close'].astype(np.float64)
+    return {
+        'Close': close.to_numpy(),
+        'RSI': TechnicalIndicators.relative_strength_index(close, rsi_window).to_numpy(),
+        'SMA': moving_average_sweep(close, [sma_window])[0],
+    }
+
+
+def evaluate_rsi_threshold(arrays: Dict[str, np.ndarray], params: Dict) -> Dict:
+    """
+    Backtest the RSI / moving-average deviation strategy for one combination.
+
+    Buy when RSI is below rsi_oversold and the close is more than threshold
+    below its moving average; sell when RSI is above rsi_overbought or the
+    close is more than threshold above it. Trades go through the cost-aware
+    backtester (commission and slippage).
+
+    Args:
+        arrays: Output of rsi_threshold_arrays
+        params: threshold, rsi_oversold, rsi_overbought (optional
+            commission_pct, slippage_pct, initial_capital)
+
+    Returns:
+        Dictionary with total_return, sharpe_ratio, max_drawdown and num_trades
+    """
+    close, rsi, sma = arrays['Close'], arrays['RSI'], arrays['SMA']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        deviation = close / sma - 1
+    buys = (rsi < params['rsi_oversold']) & (deviation < -params['threshold'])
+    sells = (rsi > params['rsi_overbought']) | (deviation > params['threshold'])
+
+    values, _, _, trades = costs_engine(
+        close, buys, sells,
+        initial_capital=params.get('initial_capital', 100000),
+        commission_pct=params.get('commission_pct', 0.001),
+        slippage_pct=params.get('slippage_pct', 0.001),
+    )
+    metrics = risk_metrics(pd.DataFrame({'Portfolio Value': values}))
+    return {
+        'total_return': metrics['Total Return'],
+        'sharpe_ratio': metrics['Sharpe Ratio'],
+        'max_drawdown': metrics['Max Drawdown'],
+        'num_trades': len(trades),
+    }
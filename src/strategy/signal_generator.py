@@ -10,6 +10,8 @@ from typing import Dict, List, Optional, Tuple
 import logging
 from datetime import datetime
 
+from src.utils.indicator_graph import IndicatorGraph
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,7 +26,8 @@ class SignalGenerator:
         
     def generate_ma_crossover_signals(self, data: pd.DataFrame, 
                                     short_window: int = 10, 
-                                    long_window: int = 30) -> pd.DataFrame:
+                                    long_window: int = 30,
+                                    graph: Optional[IndicatorGraph] = None) -> pd.DataFrame:
         """
         Generate signals based on moving average crossover strategy.
         
@@ -32,15 +35,17 @@ class SignalGenerator:
             data: DataFrame with price data
             short_window: Short-term moving average period
             long_window: Long-term moving average period
+            graph: IndicatorGraph over data to reuse already computed averages
             
         Returns:
             DataFrame with signals
         """
         signals_df = data.copy()
+        graph = graph if graph is not None else IndicatorGraph(data)
         
         # Calculate moving averages
-        signals_df['MA_short'] = signals_df['Close'].rolling(window=short_window).mean()
-        signals_df['MA_long'] = signals_df['Close'].rolling(window=long_window).mean()
+        signals_df['MA_short'] = graph.sma(short_window)
+        signals_df['MA_long'] = graph.sma(long_window)
         
         # Generate signals
         signals_df['Signal'] = 0
@@ -56,7 +61,8 @@ class SignalGenerator:
     def generate_rsi_signals(self, data: pd.DataFrame, 
                            rsi_period: int = 14,
                            oversold: int = 30,
-                           overbought: int = 70) -> pd.DataFrame:
+                           overbought: int = 70,
+                           graph: Optional[IndicatorGraph] = None) -> pd.DataFrame:
         """
         Generate signals based on RSI strategy.
         
@@ -65,6 +71,7 @@ class SignalGenerator:
             rsi_period: RSI calculation period
             oversold: Oversold threshold
             overbought: Overbought threshold
+            graph: IndicatorGraph over data to reuse an already computed RSI
             
         Returns:
             DataFrame with RSI signals
@@ -72,7 +79,8 @@ class SignalGenerator:
         signals_df = data.copy()
         
         # Calculate RSI
-        signals_df['RSI'] = self._calculate_rsi(signals_df['Close'], rsi_period)
+        graph = graph if graph is not None else IndicatorGraph(data)
+        signals_df['RSI'] = graph.rsi(rsi_period)
         
         # Generate signals
         signals_df['Signal'] = 0
@@ -83,11 +91,4 @@ class SignalGenerator:
     
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
         """Calculate Relative Strength Index."""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
\ No newline at end of file
+        return IndicatorGraph({'Close': prices}).rsi(period)
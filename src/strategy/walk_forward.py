@@ -0,0 +1,274 @@
+"""
+Walk-Forward Module
+
+Walk-forward evaluation of the forecasting models.
+
+The history is cut into consecutive test windows, each preceded by an
+expanding (all earlier data) or rolling (fixed length) training window.
+Every (fold, model) pair is an independent task run on a process pool, so
+an analysis takes roughly as long as its slowest model fit. Forecasts are
+cached on disk keyed by the model, the source of its forecaster and model
+code, the content of its training window and the horizon, so reruns and
+overlapping analyses only fit what is new, and editing a model invalidates
+its forecasts.
+"""
+
+import hashlib
+import importlib.util
+import inspect
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import logging
+
+from src.utils.indicator_cache import IndicatorCache, content_hash
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = 'data/walk_forward_cache'
+
+# Bump to orphan cached forecasts when something outside the forecaster and
+# model sources (e.g. a library upgrade) changes their output
+FORECAST_CACHE_VERSION = 1
+
+
+def _prophet_forecast(train: pd.DataFrame, steps: int) -> np.ndarray:
+    from src.models.prophet_model import train_prophet_model
+    # Business days, like the other forecasters and the test window
+    forecast, _ = train_prophet_model(train, steps=steps, freq='B')
+    return forecast['yhat'].to_numpy()[-steps:]
+
+
+def _arima_forecast(train: pd.DataFrame, steps: int) -> np.ndarray:
+    from src.models.arima_model import train_arima_model
+    _, forecast = train_arima_model(train, steps=steps)
+    return np.asarray(forecast, dtype=np.float64)
+
+
+def _lstm_forecast(train: pd.DataFrame, steps: int) -> np.ndarray:
+    from src.models.lstm_model import train_lstm_model
+    return train_lstm_model(train, steps=steps).to_numpy(dtype=np.float64)
+
+
+def _rf_forecast(train: pd.DataFrame, steps: int) -> np.ndarray:
+    from src.models.random_forest_model import train_rf_model
+    return train_rf_model(train, steps=steps).to_numpy(dtype=np.float64)
+
+
+# Model name -> forecaster(train_data, steps) -> array of `steps` predicted closes,
+# one per business day after the training window.
+# Model libraries are imported inside the forecasters, in the worker processes.
+FORECASTERS: Dict[str, Callable[[pd.DataFrame, int], np.ndarray]] = {
+    'prophet': _prophet_forecast,
+    'arima': _arima_forecast,
+    'lstm': _lstm_forecast,
+    'rf': _rf_forecast,
+}
+
+# Modules holding the models behind the built-in forecasters. Their source is
+# part of the cache key, without importing the model libraries.
+MODEL_MODULES: Dict[str, str] = {
+    'prophet': 'src.models.prophet_model',
+    'arima': 'src.models.arima_model',
+    'lstm': 'src.models.lstm_model',
+    'rf': 'src.models.random_forest_model',
+}
+
+
+def forecaster_fingerprint(model: str, forecaster: Callable[[pd.DataFrame, int], np.ndarray]) -> str:
+    """
+    Identify the code producing a model's forecasts.
+
+    Args:
+        model: Name in FORECASTERS
+        forecaster: The forecaster callable
+
+    Returns:
+        Hex digest of the forecaster source and its model module source
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{FORECAST_CACHE_VERSION}:{getattr(forecaster, '__module__', '')}."
+                  f"{getattr(forecaster, '__qualname__', repr(forecaster))}".encode())
+    try:
+        hasher.update(inspect.getsource(forecaster).encode())
+    except (OSError, TypeError):
+        pass
+    module = MODEL_MODULES.get(model)
+    spec = importlib.util.find_spec(module) if module else None
+    if spec is not None and spec.origin and spec.origin.endswith('.py'):
+        with open(spec.origin, 'rb') as f:
+            hasher.update(f.read())
+    return hasher.hexdigest()
+
+
+def walk_forward_splits(n_rows: int, n_splits: int = 5, train_size: int = 252,
+                        test_size: int = 63, window: str = 'expanding') -> List[Tuple[int, int, int, int]]:
+    """
+    Positions of the training and test windows of each fold.
+
+    The test windows are the last n_splits * test_size rows, in order.
+
+    Args:
+        n_rows: Length of the data
+        n_splits: Number of folds
+        train_size: Training rows (rolling) or minimum training rows (expanding)
+        test_size: Rows per test window
+        window: 'expanding' (train on everything before the test window) or
+            'rolling' (train on the train_size rows before it)
+
+    Returns:
+        List of (train_start, train_end, test_start, test_end), end exclusive
+    """
+    if window not in ('expanding', 'rolling'):
+        raise ValueError(f"Unknown window type: {window}")
+    first_test = n_rows - n_splits * test_size
+    if first_test < train_size:
+        raise ValueError(f"{n_rows} rows are too few for {n_splits} folds of {test_size} "
+                         f"test rows after {train_size} training rows")
+
+    splits = []
+    for fold in range(n_splits):
+        test_start = first_test + fold * test_size
+        train_start = 0 if window == 'expanding' else test_start - train_size
+        splits.append((train_start, test_start, test_start, test_start + test_size))
+    return splits
+
+
+def calculate_sharpe_ratio(predicted, actual, periods_per_year: int = 252) -> float:
+    """
+    Annualized Sharpe ratio of trading on the forecasts.
+
+    Each day the strategy is long for the next bar when the forecast for it
+    is above the current close, and flat otherwise.
+
+    Args:
+        predicted: Forecast closes aligned with actual
+        actual: Actual closes
+
+    Returns:
+        Sharpe ratio (0 when returns have no variance)
+    """
+    predicted = np.asarray(predicted, dtype=np.float64)
+    actual = np.asarray(actual, dtype=np.float64)
+    if len(actual) < 3:
+        return 0.0
+    long = predicted[1:] > actual[:-1]
+    returns = np.where(long, actual[1:] / actual[:-1] - 1, 0.0)
+    std = returns.std(ddof=1)
+    if not np.isfinite(std) or std == 0:
+        return 0.0
+    return float(returns.mean() / std * np.sqrt(periods_per_year))
+
+
+def _fit_forecast(forecaster: Callable[[pd.DataFrame, int], np.ndarray], train: pd.DataFrame,
+                  steps: int) -> Tuple[Optional[np.ndarray], float, Optional[str]]:
+    started = time.perf_counter()
+    try:
+        forecast = np.asarray(forecaster(train, steps), dtype=np.float64)
+        if len(forecast) != steps:
+            raise ValueError(f"returned {len(forecast)} values for {steps} steps")
+        return forecast, time.perf_counter() - started, None
+    except Exception as e:
+        return None, time.perf_counter() - started, f"{type(e).__name__}: {e}"
+
+
+def walk_forward_analysis(data: pd.DataFrame, n_splits: int = 5, train_size: int = 252,
+                          test_size: int = 63, window: str = 'expanding',
+                          models: Sequence[str] = ('prophet', 'arima', 'lstm', 'rf'),
+                          max_workers: Optional[int] = None,
+                          cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> pd.DataFrame:
+    """
+    Walk-forward evaluation of the ensemble of forecasting models.
+
+    Args:
+        data: DataFrame with a Close column and a date index
+        n_splits: Number of folds
+        train_size: 1 year of trading days (rolling size / expanding minimum)
+        test_size: 3 months of trading days
+        window: 'expanding' or 'rolling'
+        models: Names from FORECASTERS
+        max_workers: Worker processes (defaults to one per task up to the CPU count;
+            1 fits everything in-process)
+        cache_dir: Directory of the forecast cache (None disables it)
+
+    Returns:
+        DataFrame with one row per fold: window dates, ensemble MSE and
+        Sharpe ratio, per-model MSE, and the models that failed
+    """
+    unknown = [model for model in models if model not in FORECASTERS]
+    if unknown:
+        raise ValueError(f"Unknown models: {unknown}")
+
+    splits = walk_forward_splits(len(data), n_splits, train_size, test_size, window)
+    cache = IndicatorCache(max_bytes=16 * 1024 * 1024, disk_dir=cache_dir) if cache_dir else None
+
+    fingerprints = {model: forecaster_fingerprint(model, FORECASTERS[model]) for model in models}
+    forecasts: Dict[Tuple[int, str], np.ndarray] = {}
+    errors: Dict[Tuple[int, str], str] = {}
+    tasks = {}
+    for fold, (train_start, train_end, _, _) in enumerate(splits):
+        train = data.iloc[train_start:train_end]
+        for model in models:
+            key = content_hash('walk_forward', model, fingerprints[model], train, test_size)
+            cached = cache.get(key) if cache is not None else None
+            if cached is not None:
+                forecasts[fold, model] = cached
+            else:
+                tasks[fold, model] = (key, train)
+    if forecasts:
+        logger.info(f"Walk-forward: {len(forecasts)} forecasts from cache, {len(tasks)} to fit")
+
+    def collect(task, outcome):
+        forecast, seconds, error = outcome
+        fold, model = task
+        if error is not None:
+            logger.error(f"Walk-forward fold {fold} {model} failed after {seconds:.1f}s: {error}")
+            errors[task] = error
+            return
+        logger.info(f"Walk-forward fold {fold} {model} fitted in {seconds:.1f}s")
+        forecasts[task] = forecast
+        if cache is not None:
+            cache.put(tasks[task][0], forecast)
+
+    workers = min(max_workers or multiprocessing.cpu_count(), len(tasks))
+    if workers <= 1:
+        for task, (_, train) in tasks.items():
+            collect(task, _fit_forecast(FORECASTERS[task[1]], train, test_size))
+    elif tasks:
+        # spawn: model libraries (TensorFlow, Prophet) are not fork-safe
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = {executor.submit(_fit_forecast, FORECASTERS[task[1]], train, test_size): task
+                       for task, (_, train) in tasks.items()}
+            for future in as_completed(futures):
+                collect(futures[future], future.result())
+
+    results = []
+    for fold, (train_start, train_end, test_start, test_end) in enumerate(splits):
+        actual = data['Close'].iloc[test_start:test_end].to_numpy(dtype=np.float64)
+        fold_forecasts = {model: forecasts[fold, model] for model in models if (fold, model) in forecasts}
+        row = {
+            'fold': fold,
+            'train_start': data.index[train_start],
+            'train_end': data.index[train_end - 1],
+            'test_start': data.index[test_start],
+            'test_end': data.index[test_end - 1],
+            'period': f"{data.index[train_end - 1]} to {data.index[test_end - 1]}",
+        }
+        if fold_forecasts:
+            ensemble = np.mean(list(fold_forecasts.values()), axis=0)
+            row['mse'] = float(np.mean((ensemble - actual) ** 2))
+            row['sharpe'] = calculate_sharpe_ratio(ensemble, actual)
+        else:
+            row['mse'] = row['sharpe'] = np.nan
+        for model in models:
+            forecast = fold_forecasts.get(model)
+            row[f'mse_{model}'] = float(np.mean((forecast - actual) ** 2)) if forecast is not None else np.nan
+        row['failed_models'] = ', '.join(model for model in models if (fold, model) in errors)
+        results.append(row)
+
+    return pd.DataFrame(results)
@@ -4,8 +4,8 @@ Real Broker Integration - Connect to Indian brokers
 """
 import sys
 sys.path.append('scripts')
+sys.path.append('.')
 
-import requests
 import json
 import hashlib
 import hmac
@@ -14,6 +14,8 @@ import pandas as pd
 import os
 from typing import Dict, List, Optional
 
+from src.utils.http_client import get_http_client
+
 class ZerodhaKiteAPI:
     """Zerodha Kite API Integration"""
     
@@ -22,7 +24,7 @@ class ZerodhaKiteAPI:
         self.api_secret = api_secret
         self.access_token = access_token
         self.base_url = "https://api.kite.trade"
-        self.session = requests.Session()
+        self.session = get_http_client().sub_session()
         
         if access_token:
             self.session.headers.update({
@@ -44,7 +46,7 @@ class ZerodhaKiteAPI:
             'checksum': checksum
         }
         
-        response = requests.post(url, data=data)
+        response = get_http_client().post(url, data=data)
         return response.json()
     
     def get_profile(self) -> Dict:
@@ -110,7 +112,7 @@ class UpstoxAPI:
         self.api_secret = api_secret
         self.access_token = access_token
         self.base_url = "https://api.upstox.com/v2"
-        self.session = requests.Session()
+        self.session = get_http_client().sub_session()
         
         if access_token:
             self.session.headers.update({
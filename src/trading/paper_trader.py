@@ -7,20 +7,23 @@ Provides realistic simulation of buy/sell orders with portfolio tracking and per
 """
 import sys
 sys.path.append('scripts')
+sys.path.append('.')
 
 import pandas as pd
-import yfinance as yf
 from datetime import datetime, timedelta
 import json
 import os
 import logging
 
+from src.data.data_source import get_data_source
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class PaperTradingAccount:
-    def __init__(self, initial_balance=100000):
+    def __init__(self, initial_balance=100000, data_source=None):
+        self.data_source = data_source or get_data_source()
         self.initial_balance = initial_balance
         self.balance = initial_balance
         self.positions = {}  # {symbol: {'shares': int, 'avg_price': float}}
@@ -30,8 +33,7 @@ class PaperTradingAccount:
     def get_current_price(self, symbol):
         """Get current market price"""
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period="1d", interval="1m")
+            data = self.data_source.history(symbol, period="1d", interval="1m")
             return data['Close'].iloc[-1] if not data.empty else None
         except:
             return None
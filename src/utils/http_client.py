@@ -0,0 +1,417 @@
+"""
+HTTP Client Module
+
+Shared, rate-limited HTTP layer for upstream market data and broker APIs.
+
+All calls go through one pooled requests Session (keep-alive connections are
+reused across calls), a token-bucket rate limiter per host and a retry loop
+with jittered exponential backoff that honours Retry-After on 429/503.
+Per-host latency and throttling counters are recorded for monitoring.
+Rate limits can be overridden per host with the TRADING_RATE_LIMITS
+environment variable.
+"""
+
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Requests per second and burst size per host.
+# Yahoo publishes no limit; it answers sustained bursts well above ~10/s
+# with 429s, which HttpClient already handles by draining the bucket for
+# every caller. The static limit only has to stop runaway bursts, so it is
+# sized to keep the default fetch pool (MarketDataCollector, 8 threads at
+# roughly 0.5-1s per history call) and the pre-open warm-up unthrottled.
+# The broker limits are the documented per-second API limits.
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    'query1.finance.yahoo.com': (10.0, 20),
+    'query2.finance.yahoo.com': (10.0, 20),
+    'yfinance': (10.0, 20),
+    'api.kite.trade': (10.0, 10),
+    'api.upstox.com': (20.0, 20),
+}
+DEFAULT_RATE = (5.0, 10)
+
+# Overrides, e.g. TRADING_RATE_LIMITS="yfinance=4:8,api.kite.trade=3:3"
+RATE_LIMITS_ENV = 'TRADING_RATE_LIMITS'
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+# Exception types third-party clients raise when throttled, matched by name
+# so the libraries need not be importable here
+THROTTLE_ERROR_TYPES = {'YFRateLimitError', 'RateLimitError', 'TooManyRequests'}
+
+
+def parse_rate_limits(spec: str) -> Dict[str, Tuple[float, int]]:
+    """
+    Parse host rate limits written as "host=rate:burst,host=rate:burst".
+
+    Args:
+        spec: Comma-separated host=rate:burst entries (burst defaults to
+            the rate rounded up)
+
+    Returns:
+        Mapping of host -> (requests per second, burst)
+
+    Raises:
+        ValueError: If an entry is malformed or not positive
+    """
+    limits = {}
+    for entry in filter(None, (part.strip() for part in spec.split(','))):
+        try:
+            host, limit = entry.split('=', 1)
+            rate_text, _, burst_text = limit.partition(':')
+            rate = float(rate_text)
+            burst = int(burst_text) if burst_text else max(1, int(-(-rate // 1)))
+        except ValueError:
+            raise ValueError(f"Invalid rate limit {entry!r}; expected host=rate:burst")
+        if rate <= 0 or burst <= 0:
+            raise ValueError(f"Rate limit for {host.strip()} must be positive")
+        limits[host.strip()] = (rate, burst)
+    return limits
+
+
+def configured_rate_limits() -> Dict[str, Tuple[float, int]]:
+    """Get DEFAULT_RATE_LIMITS with the TRADING_RATE_LIMITS overrides applied."""
+    limits = dict(DEFAULT_RATE_LIMITS)
+    limits.update(parse_rate_limits(os.getenv(RATE_LIMITS_ENV, '')))
+    return limits
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, at most `burst` stored.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, sleeping until they are available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def penalize(self, seconds: float):
+        """Drain the bucket so callers back off for roughly `seconds`."""
+        with self._lock:
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+class HostMetrics:
+    """Latency and outcome counters for one host."""
+
+    def __init__(self, window: int = 500):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.recent = deque(maxlen=window)
+
+    def record(self, seconds: float, ok: bool):
+        self.requests += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.recent.append(seconds)
+        if not ok:
+            self.errors += 1
+
+    def snapshot(self) -> Dict:
+        recent = np.fromiter(self.recent, dtype=float) if self.recent else np.zeros(1)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'throttled': self.throttled,
+            'rate_limit_wait_s': round(self.wait_seconds, 3),
+            'avg_ms': round(1000 * self.total_seconds / self.requests, 1) if self.requests else 0.0,
+            'p50_ms': round(1000 * float(np.percentile(recent, 50)), 1),
+            'p95_ms': round(1000 * float(np.percentile(recent, 95)), 1),
+            'max_ms': round(1000 * self.max_seconds, 1),
+        }
+
+
+def create_session(pool_connections: int = 10, pool_maxsize: int = 20) -> requests.Session:
+    """
+    Create a requests Session with a keep-alive connection pool.
+
+    Retries are handled by HttpClient, so the adapter does not retry itself.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class HttpClient:
+    """
+    Pooled HTTP client with per-host rate limiting, retries and metrics.
+    """
+
+    def __init__(self, rate_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+                 default_rate: Tuple[float, int] = DEFAULT_RATE,
+                 max_retries: int = 3, backoff_base: float = 0.5,
+                 backoff_max: float = 30.0, timeout: float = 10.0,
+                 pool_maxsize: int = 20):
+        """
+        Args:
+            rate_limits: Mapping of host -> (requests per second, burst)
+                (defaults to configured_rate_limits())
+            default_rate: Rate limit for hosts not listed
+            max_retries: Retries after the first attempt
+            backoff_base: Base delay for exponential backoff (seconds)
+            backoff_max: Upper bound for a single backoff delay (seconds)
+            timeout: Default request timeout (seconds)
+            pool_maxsize: Keep-alive connections kept per host
+        """
+        self.rate_limits = configured_rate_limits() if rate_limits is None else dict(rate_limits)
+        self.default_rate = default_rate
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.session = create_session(pool_maxsize=pool_maxsize)
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._metrics: Dict[str, HostMetrics] = {}
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, retry_unsafe: bool = False,
+                **kwargs) -> requests.Response:
+        """
+        Send a request through the rate limiter with retries.
+
+        Non-idempotent methods (POST/PATCH) are only retried on 429, where the
+        server has rejected the request, unless retry_unsafe is set.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            retry_unsafe: Also retry POST/PATCH on 5xx and connection errors
+            **kwargs: Passed on to requests.Session.request
+
+        Returns:
+            The final response (which may still be an error status)
+        """
+        method = method.upper()
+        host = urlparse(url).netloc
+        kwargs.setdefault('timeout', self.timeout)
+        safe = retry_unsafe or method in IDEMPOTENT_METHODS
+
+        attempt = 0
+        while True:
+            self._acquire(host)
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._record(host, time.perf_counter() - started, ok=False)
+                if not safe or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"{method} {host} failed ({e}); retrying in {delay:.2f}s")
+            else:
+                self._record(host, time.perf_counter() - started, ok=response.status_code < 400)
+                status = response.status_code
+                retryable = status == 429 or (safe and status in RETRY_STATUSES)
+                if not retryable or attempt >= self.max_retries:
+                    return response
+                delay = self._retry_after(response) or self._backoff(attempt)
+                if status == 429:
+                    self._throttled(host, delay)
+                logger.warning(f"{method} {host} returned {status}; retrying in {delay:.2f}s")
+
+            self._metrics_for(host).retries += 1
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request."""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request."""
+        return self.request('POST', url, **kwargs)
+
+    def call(self, host: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a call made by a third-party library (e.g. yfinance) under the
+        rate limit, metrics and backoff of a logical host.
+
+        Only throttling and connection errors are retried; other exceptions
+        propagate immediately.
+
+        Args:
+            host: Logical host name used for rate limiting and metrics
+            fn: Callable doing the network work
+            *args, **kwargs: Passed to fn
+
+        Returns:
+            Whatever fn returns
+        """
+        attempt = 0
+        while True:
+            self._acquire(host)
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self._record(host, time.perf_counter() - started, ok=False)
+                throttled = _is_throttle_error(e)
+                if not (throttled or isinstance(e, (requests.ConnectionError, requests.Timeout))) \
+                        or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                if throttled:
+                    self._throttled(host, delay)
+                logger.warning(f"{host} call failed ({e}); retrying in {delay:.2f}s")
+                self._metrics_for(host).retries += 1
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self._record(host, time.perf_counter() - started, ok=True)
+            return result
+
+    def sub_session(self, headers: Optional[Dict[str, str]] = None) -> 'ClientSession':
+        """
+        Get a session-like view with its own default headers.
+
+        Useful for API clients that keep auth headers on `self.session`.
+        """
+        return ClientSession(self, headers)
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Get latency and outcome counters per host."""
+        with self._lock:
+            return {host: metrics.snapshot() for host, metrics in self._metrics.items()}
+
+    def _acquire(self, host: str):
+        waited = self._bucket_for(host).acquire()
+        if waited:
+            self._metrics_for(host).wait_seconds += waited
+
+    def _bucket_for(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.rate_limits.get(host, self.default_rate)
+                bucket = self._buckets[host] = TokenBucket(rate, burst)
+            return bucket
+
+    def _metrics_for(self, host: str) -> HostMetrics:
+        with self._lock:
+            if host not in self._metrics:
+                self._metrics[host] = HostMetrics()
+            return self._metrics[host]
+
+    def _record(self, host: str, seconds: float, ok: bool):
+        metrics = self._metrics_for(host)
+        with self._lock:
+            metrics.record(seconds, ok)
+
+    def _throttled(self, host: str, delay: float):
+        # Slow every caller of this host down, not just the one that got the 429
+        self._metrics_for(host).throttled += 1
+        self._bucket_for(host).penalize(delay)
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps concurrent retries from synchronizing
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+        try:
+            return min(self.backoff_max, max(0.0, float(value)))
+        except ValueError:
+            return None
+
+
+class ClientSession:
+    """
+    Minimal requests.Session-like facade over a shared HttpClient.
+
+    Keeps per-API default headers while reusing the shared connection pool
+    and rate limiters.
+    """
+
+    def __init__(self, client: HttpClient, headers: Optional[Dict[str, str]] = None):
+        self.client = client
+        self.headers: Dict[str, str] = dict(headers or {})
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        headers = dict(self.headers)
+        headers.update(kwargs.pop('headers', None) or {})
+        return self.client.request(method, url, headers=headers, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+
+def _is_throttle_error(error: Exception) -> bool:
+    # Decided by the HTTP status an error carries (requests/curl_cffi
+    # HTTPError.response) or by the library's throttling exception type
+    # (yfinance's YFRateLimitError), never by the message text, which can
+    # hold symbols, prices or URLs. Wrapped errors are followed via __cause__.
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+        if status is None:
+            status = getattr(error, 'status_code', None)
+        if isinstance(status, int):
+            return status == 429
+        if any(cls.__name__ in THROTTLE_ERROR_TYPES for cls in type(error).__mro__):
+            return True
+        error = error.__cause__
+    return False
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Get the process-wide HTTP client."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,384 @@
+"""
+Indicator Cache Module
+
+Content-addressed cache for indicator results.
+
+Repeated backtests, dashboard reloads and optimizer runs recompute the same
+indicators on the same price data. Results are keyed on a fast hash of the
+input data (values, index and names), the indicator name and its parameters,
+so any change to the input - including a newly appended bar - is a new key
+and entries never need invalidating. Results live in an in-memory LRU tier
+bounded in bytes and, optionally, in an on-disk tier shared across processes
+and runs.
+
+Caching is off until enable_indicator_cache() is called; the decorated
+functions (TechnicalIndicators methods, add_all_indicators) then use it
+transparently and return copies, so callers may modify what they get back.
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import logging
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 1024 * 1024 * 1024
+
+# Bump when indicator implementations change results, to orphan old disk entries
+CACHE_VERSION = 2
+
+
+def _new_hasher():
+    return xxhash.xxh3_128() if XXHASH_AVAILABLE else hashlib.blake2b(digest_size=16)
+
+
+def _update(hasher, obj: Any):
+    if isinstance(obj, pd.DataFrame):
+        hasher.update(b'DataFrame')
+        _update(hasher, obj.index)
+        for name in obj.columns:
+            _update(hasher, obj[name])
+    elif isinstance(obj, pd.Series):
+        hasher.update(f"Series:{obj.name!r}".encode())
+        _update(hasher, obj.index)
+        _update(hasher, obj.to_numpy())
+    elif isinstance(obj, pd.Index):
+        hasher.update(f"Index:{obj.name!r}:{obj.dtype}:{len(obj)}".encode())
+        if not isinstance(obj, pd.RangeIndex):
+            hasher.update(pd.util.hash_pandas_object(obj).to_numpy().tobytes())
+        else:
+            hasher.update(f"{obj.start}:{obj.stop}:{obj.step}".encode())
+    elif isinstance(obj, np.ndarray):
+        hasher.update(f"ndarray:{obj.dtype}:{obj.shape}".encode())
+        if obj.dtype == object:
+            hasher.update(pd.util.hash_array(obj.ravel()).tobytes())
+        else:
+            hasher.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(f"{type(obj).__name__}:{len(obj)}".encode())
+        for item in obj:
+            _update(hasher, item)
+    elif isinstance(obj, dict):
+        hasher.update(f"dict:{len(obj)}".encode())
+        for key in sorted(obj, key=repr):
+            _update(hasher, key)
+            _update(hasher, obj[key])
+    elif obj is None or isinstance(obj, (bool, int, float, str, bytes, np.generic)):
+        hasher.update(f"{type(obj).__name__}:{obj!r}".encode())
+    else:
+        raise TypeError(f"Cannot hash {type(obj).__name__} by content")
+
+
+def content_hash(*parts: Any) -> str:
+    """
+    Hash data and parameters into a cache key.
+
+    Args:
+        *parts: DataFrames, Series, arrays, scalars, strings or tuples of them
+
+    Returns:
+        Hex digest (xxh3-128 when xxhash is installed, else blake2b-128)
+
+    Raises:
+        TypeError: If a part is not data or a plain value
+    """
+    hasher = _new_hasher()
+    _update(hasher, CACHE_VERSION)
+    for part in parts:
+        _update(hasher, part)
+    return hasher.hexdigest()
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_copy(item) for item in value)
+    return value
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, tuple):
+        return sum(_nbytes(item) for item in value)
+    return 64
+
+
+class IndicatorCache:
+    """
+    Thread-safe LRU cache of indicator results with an optional disk tier.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES,
+                 disk_dir: Optional[str] = None,
+                 max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES):
+        """
+        Args:
+            max_bytes: Memory budget for the in-memory tier
+            disk_dir: Directory for the on-disk tier (None keeps results in memory only)
+            max_disk_bytes: Size budget for the on-disk tier
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.disk_bytes = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self.disk_bytes = sum(entry.stat().st_size for entry in os.scandir(disk_dir)
+                                  if entry.name.endswith('.pkl'))
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a result.
+
+        Args:
+            key: Cache key (see content_hash)
+
+        Returns:
+            A copy of the cached result, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy(entry['value'])
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._put_memory(key, value)
+        return _copy(value)
+
+    def put(self, key: str, value: Any):
+        """
+        Store a result in memory and, if configured, on disk.
+
+        Args:
+            key: Cache key
+            value: Result (DataFrame, Series, array or tuple of them)
+        """
+        value = _copy(value)
+        self._put_memory(key, value)
+        self._write_disk(key, value)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Get a result, computing and storing it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self, disk: bool = False):
+        """Drop every in-memory entry, and the disk tier if disk is set."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+        if disk and self.disk_dir:
+            for entry in os.scandir(self.disk_dir):
+                if entry.name.endswith('.pkl'):
+                    os.remove(entry.path)
+            self.disk_bytes = 0
+
+    def stats(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss/eviction counters and memory/disk usage
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'items': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'disk_bytes': self.disk_bytes,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: str):
+        return key in self._entries
+
+    def _put_memory(self, key: str, value: Any):
+        nbytes = _nbytes(value)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)['nbytes']
+            self._entries[key] = {'value': value, 'nbytes': nbytes}
+            self.current_bytes += nbytes
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, oldest = self._entries.popitem(last=False)
+                self.current_bytes -= oldest['nbytes']
+                self.evictions += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def _read_disk(self, key: str) -> Optional[Any]:
+        if not self.disk_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Dropping unreadable indicator cache entry {path}: {str(e)}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        # Touch it so disk pruning is least-recently-used as well
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def _write_disk(self, key: str, value: Any):
+        if not self.disk_dir:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Atomic, so concurrent processes never read a partial file
+            os.replace(tmp_path, path)
+            self.disk_bytes += os.path.getsize(path)
+        except OSError as e:
+            logger.warning(f"Could not write indicator cache entry {path}: {str(e)}")
+            return
+        if self.disk_bytes > self.max_disk_bytes:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        entries = sorted((entry for entry in os.scandir(self.disk_dir) if entry.name.endswith('.pkl')),
+                         key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        # Prune down to 80% so pruning does not run on every write
+        target = int(self.max_disk_bytes * 0.8)
+        for entry in entries:
+            if total <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+            except OSError:
+                continue
+        self.disk_bytes = total
+
+
+_cache: Optional[IndicatorCache] = None
+
+
+def enable_indicator_cache(max_bytes: int = DEFAULT_MAX_BYTES,
+                           disk_dir: Optional[str] = None,
+                           max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES) -> IndicatorCache:
+    """
+    Turn on result caching for the decorated indicator functions.
+
+    Args:
+        max_bytes: Memory budget for the in-memory tier
+        disk_dir: Directory for the on-disk tier (e.g. 'data/indicator_cache')
+        max_disk_bytes: Size budget for the on-disk tier
+
+    Returns:
+        The active IndicatorCache
+    """
+    global _cache
+    _cache = IndicatorCache(max_bytes=max_bytes, disk_dir=disk_dir, max_disk_bytes=max_disk_bytes)
+    return _cache
+
+
+def disable_indicator_cache():
+    """Turn off result caching (decorated functions compute directly again)."""
+    global _cache
+    _cache = None
+
+
+def get_indicator_cache() -> Optional[IndicatorCache]:
+    """Get the active indicator cache, or None when caching is off."""
+    return _cache
+
+
+def cached_indicator(name: str) -> Callable:
+    """
+    Cache a function's results by the content of its arguments.
+
+    All arguments take part in the key (data by content, parameters by
+    value). They are bound to the function's signature with defaults
+    applied first, so f(df, 20), f(df, window=20) and f(df) with a default
+    window of 20 share one entry. Calls with arguments that cannot be
+    hashed by content (e.g. an IndicatorGraph) and calls while caching is
+    off compute directly. Only returned results are cached; a call that
+    raises is retried on the next call.
+
+    Args:
+        name: Indicator name used in the key (e.g. 'TechnicalIndicators.macd')
+    """
+    def decorate(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            cache = _cache
+            if cache is None:
+                return fn(*args, **kwargs)
+            try:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                key = content_hash(name, dict(bound.arguments))
+            except TypeError:
+                # Bad call or unhashable argument: let fn raise / compute directly
+                return fn(*args, **kwargs)
+            return cache.get_or_compute(key, lambda: fn(*args, **kwargs))
+        return wrapper
+    return decorate
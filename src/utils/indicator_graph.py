@@ -0,0 +1,219 @@
+"""
+Indicator Graph Module
+
+Memoized graph of indicator building blocks for one input.
+
+Many indicators share intermediates: Bollinger Bands and SMA_20 use the same
+rolling mean, MACD re-derives EMA_12/EMA_26, Stochastic and Williams %R use
+the same rolling high/low, RSI needs the same gains and losses wherever it is
+computed. An IndicatorGraph is bound to one set of price data and computes
+each node (SMA(20), EMA(12), true range, typical price, ...) at most once, so
+every consumer that pulls from the same graph shares the rolling passes.
+
+Nodes produce exactly what the corresponding TechnicalIndicators methods do.
+The input can be a DataFrame of OHLCV columns or a mapping of column name to
+Series/DataFrame (e.g. time x symbol frames for panel computations).
+"""
+
+from typing import Any, Callable, Dict, Hashable, Mapping, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import logging
+
+from src.utils.technical_indicators import TechnicalIndicators, rolling_mean_deviation
+
+logger = logging.getLogger(__name__)
+
+Frame = Union[pd.Series, pd.DataFrame]
+
+ROLLING_OPS = ('mean', 'std', 'sum', 'min', 'max')
+
+
+class IndicatorGraph:
+    """
+    Lazily computed, memoized indicator nodes over one input.
+    """
+
+    # Derived series usable as `source` of the rolling/EMA nodes
+    DERIVED = {
+        'Delta': lambda g: g.series('Close').diff(),
+        # False before the first Close, so gains and flows of panel columns
+        # with leading missing bars start out NaN as a series of their own would
+        'Listed': lambda g: g.series('Close').ffill().notna(),
+        'Gain': lambda g: g.series('Delta').where(g.series('Delta') > 0, 0).where(g.series('Listed')),
+        'Loss': lambda g: -g.series('Delta').where(g.series('Delta') < 0, 0).where(g.series('Listed')),
+        'Log_Returns': lambda g: np.log(g.series('Close') / g.series('Close').shift(1)),
+        'Typical_Price': lambda g: (g.series('High') + g.series('Low') + g.series('Close')) / 3,
+        'True_Range': lambda g: np.maximum(
+            g.series('High') - g.series('Low'),
+            np.maximum(np.abs(g.series('High') - g.series('Close').shift()),
+                       np.abs(g.series('Low') - g.series('Close').shift()))
+        ),
+        'Money_Flow': lambda g: g.series('Typical_Price') * g.series('Volume'),
+        'Positive_Flow': lambda g: g.series('Money_Flow').where(
+            g.series('Typical_Price').diff() > 0, 0).where(g.series('Listed')),
+        'Negative_Flow': lambda g: g.series('Money_Flow').where(
+            g.series('Typical_Price').diff() < 0, 0).where(g.series('Listed')),
+    }
+
+    def __init__(self, data: Union[pd.DataFrame, Mapping[str, Frame]]):
+        """
+        Args:
+            data: DataFrame with OHLCV columns, or mapping of column name -> Series/DataFrame
+        """
+        self.data = data
+        self._nodes: Dict[Hashable, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def node(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Get a node, computing it on first use.
+
+        Args:
+            key: Hashable node identity, e.g. ('rolling', 'mean', 20, 'Close')
+            compute: Zero-argument function producing the node value
+
+        Returns:
+            The memoized node value
+        """
+        if key in self._nodes:
+            self.hits += 1
+            return self._nodes[key]
+        self.misses += 1
+        value = self._nodes[key] = compute()
+        return value
+
+    def series(self, name: str) -> Frame:
+        """
+        Get an input column or a derived series ('Typical_Price', 'True_Range', ...).
+
+        Args:
+            name: Column or derived series name
+
+        Returns:
+            Series (or DataFrame for panel input)
+        """
+        if name in self.DERIVED:
+            return self.node(name, lambda: self.DERIVED[name](self))
+        if name not in self.data:
+            raise KeyError(f"Input has no column {name!r}")
+        return self.data[name]
+
+    def rolling(self, op: str, window: int, source: str = 'Close') -> Frame:
+        """
+        Rolling statistic of a source series.
+
+        Args:
+            op: One of ROLLING_OPS
+            window: Window length
+            source: Column or derived series name
+
+        Returns:
+            Series with the rolling statistic
+        """
+        if op not in ROLLING_OPS:
+            raise ValueError(f"Unknown rolling op: {op}")
+        return self.node(('rolling', op, window, source),
+                         lambda: getattr(self.series(source).rolling(window=window), op)())
+
+    def sma(self, window: int, source: str = 'Close') -> Frame:
+        """Simple moving average (TechnicalIndicators.simple_moving_average)."""
+        return self.rolling('mean', window, source)
+
+    def ema(self, span: int, adjust: bool = True, source: str = 'Close') -> Frame:
+        """Exponential moving average; adjust=True matches TechnicalIndicators."""
+        return self.node(('ema', span, adjust, source),
+                         lambda: self.series(source).ewm(span=span, adjust=adjust).mean())
+
+    def rsi(self, window: int = 14, smoothing: str = 'sma') -> Frame:
+        """Relative Strength Index of Close (TechnicalIndicators.relative_strength_index)."""
+        def compute():
+            if smoothing == 'wilder':
+                gain, loss = (self.node(('wilder', window, name), lambda name=name: self.series(name).ewm(
+                    alpha=1 / window, adjust=False, min_periods=window).mean()) for name in ('Gain', 'Loss'))
+            else:
+                gain, loss = self.rolling('mean', window, 'Gain'), self.rolling('mean', window, 'Loss')
+            rs = gain / loss
+            return 100 - (100 / (1 + rs))
+        return self.node(('rsi', window, smoothing), compute)
+
+    def macd(self, fast: int = 12, slow: int = 26, signal: int = 9,
+             adjust: bool = True) -> Tuple[Frame, Frame, Frame]:
+        """MACD line, signal line and histogram (TechnicalIndicators.macd)."""
+        def compute():
+            macd_line = self.ema(fast, adjust) - self.ema(slow, adjust)
+            signal_line = macd_line.ewm(span=signal, adjust=adjust).mean()
+            return macd_line, signal_line, macd_line - signal_line
+        return self.node(('macd', fast, slow, signal, adjust), compute)
+
+    def bollinger_bands(self, window: int = 20, num_std: float = 2) -> Tuple[Frame, Frame, Frame]:
+        """Upper, middle and lower band (TechnicalIndicators.bollinger_bands)."""
+        def compute():
+            sma = self.sma(window)
+            std = self.rolling('std', window)
+            return sma + (std * num_std), sma, sma - (std * num_std)
+        return self.node(('bollinger', window, num_std), compute)
+
+    def stochastic(self, k_window: int = 14, d_window: int = 3) -> Tuple[Frame, Frame]:
+        """%K and %D (TechnicalIndicators.stochastic_oscillator)."""
+        def compute():
+            lowest_low = self.rolling('min', k_window, 'Low')
+            highest_high = self.rolling('max', k_window, 'High')
+            k_percent = 100 * ((self.series('Close') - lowest_low) / (highest_high - lowest_low))
+            return k_percent, k_percent.rolling(window=d_window).mean()
+        return self.node(('stochastic', k_window, d_window), compute)
+
+    def williams_r(self, window: int = 14) -> Frame:
+        """Williams %R (TechnicalIndicators.williams_percent_r)."""
+        def compute():
+            highest_high = self.rolling('max', window, 'High')
+            lowest_low = self.rolling('min', window, 'Low')
+            return -100 * ((highest_high - self.series('Close')) / (highest_high - lowest_low))
+        return self.node(('williams_r', window), compute)
+
+    def atr(self, window: int = 14) -> Frame:
+        """Average True Range (TechnicalIndicators.average_true_range)."""
+        return self.rolling('mean', window, 'True_Range')
+
+    def cci(self, window: int = 20, method: str = 'vectorized') -> Frame:
+        """
+        Commodity Channel Index (TechnicalIndicators.commodity_channel_index).
+
+        The method only changes how the mean deviation is computed, not the
+        result, so it is not part of the node identity.
+        """
+        def mean_deviation():
+            typical_price = self.series('Typical_Price')
+            if method == 'vectorized':
+                result = typical_price.astype(np.float64)
+                result[:] = rolling_mean_deviation(typical_price.to_numpy(dtype=np.float64), window)
+                return result
+            if method == 'apply':
+                return typical_price.rolling(window=window).apply(lambda x: np.mean(np.abs(x - np.mean(x))))
+            raise ValueError(f"Unknown CCI method: {method}")
+
+        def compute():
+            typical_price = self.series('Typical_Price')
+            deviation = self.node(('mean_deviation', window, 'Typical_Price'), mean_deviation)
+            return (typical_price - self.sma(window, 'Typical_Price')) / (0.015 * deviation)
+        return self.node(('cci', window), compute)
+
+    def obv(self) -> Frame:
+        """On-Balance Volume (TechnicalIndicators.on_balance_volume)."""
+        return self.node(('obv',), lambda: TechnicalIndicators.on_balance_volume(
+            self.series('Close'), self.series('Volume')))
+
+    def mfi(self, window: int = 14) -> Frame:
+        """Money Flow Index (TechnicalIndicators.money_flow_index)."""
+        def compute():
+            positive_flow = self.rolling('sum', window, 'Positive_Flow')
+            negative_flow = self.rolling('sum', window, 'Negative_Flow')
+            money_ratio = positive_flow / negative_flow.abs()
+            return 100 - (100 / (1 + money_ratio))
+        return self.node(('mfi', window), compute)
+
+    def stats(self) -> Dict[str, int]:
+        """Get node counts: computed nodes and cache hits."""
+        return {'nodes': len(self._nodes), 'hits': self.hits, 'misses': self.misses}
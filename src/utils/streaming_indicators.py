@@ -0,0 +1,610 @@
+"""
+Streaming Technical Indicators Module
+
+Stateful, incremental counterparts of TechnicalIndicators.
+
+Every indicator consumes one bar at a time and returns its latest value in
+O(1) (amortized O(1) for rolling min/max; rolling variance re-sums its
+window on the rare updates pandas flags as cancellation-prone). The update rules replicate the
+pandas window kernels operation for operation -- compensated (Kahan) sums for
+rolling mean/sum, compensated Welford updates for rolling variance, the
+weighted recursion of `ewm().mean()` and monotonic deques for rolling
+min/max -- so the streamed values are bit-identical to the batch versions
+computed over the same history.
+"""
+
+import math
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+NAN = float('nan')
+
+
+def _div(numerator: float, denominator: float) -> float:
+    """IEEE division (x/0 -> +-inf or nan) as numpy/pandas does it."""
+    if denominator == 0:
+        if numerator != numerator or numerator == 0:
+            return NAN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
+
+
+def _is_nan(value: float) -> bool:
+    return value != value
+
+
+class RollingWindow:
+    """
+    Fixed-size window of the last `window` values (including NaNs).
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+
+    def push(self, value: float) -> Tuple[bool, Optional[float]]:
+        """
+        Add a value.
+
+        Returns:
+            Tuple of (reset, removed): reset is True when the window restarts
+            from scratch (window of 1), removed is the value leaving the window
+        """
+        self.values.append(value)
+        if self.window <= 1 and len(self.values) > 1:
+            self.values.popleft()
+            return True, None
+        if len(self.values) > self.window:
+            return False, self.values.popleft()
+        return False, None
+
+
+class RollingMean:
+    """
+    Rolling mean matching `Series.rolling(window).mean()`.
+    """
+
+    def __init__(self, window: int, min_periods: Optional[int] = None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self._values = RollingWindow(window)
+        self._reset()
+
+    def _reset(self):
+        self.nobs = 0
+        self.sum = 0.0
+        self.neg_ct = 0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.same_count = 0
+        self.prev_value = None
+
+    def update(self, value: float) -> float:
+        """Add one value and return the current mean."""
+        value = float(value)
+        reset, removed = self._values.push(value)
+        if reset:
+            self._reset()
+        if self.prev_value is None:
+            self.prev_value = value
+        if removed is not None:
+            self._remove(removed)
+        self._add(value)
+        return self.value()
+
+    def _add(self, value: float):
+        if _is_nan(value):
+            return
+        self.nobs += 1
+        y = value - self.compensation_add
+        t = self.sum + y
+        self.compensation_add = t - self.sum - y
+        self.sum = t
+        if math.copysign(1.0, value) < 0:
+            self.neg_ct += 1
+        if value == self.prev_value:
+            self.same_count += 1
+        else:
+            self.same_count = 1
+        self.prev_value = value
+
+    def _remove(self, value: float):
+        if _is_nan(value):
+            return
+        self.nobs -= 1
+        y = -value - self.compensation_remove
+        t = self.sum + y
+        self.compensation_remove = t - self.sum - y
+        self.sum = t
+        if math.copysign(1.0, value) < 0:
+            self.neg_ct -= 1
+
+    def value(self) -> float:
+        """Current mean (NaN until min_periods observations are in the window)."""
+        if self.nobs >= self.min_periods and self.nobs > 0:
+            result = self.sum / self.nobs
+            if self.same_count >= self.nobs:
+                result = self.prev_value
+            elif self.neg_ct == 0 and result < 0:
+                result = 0.0
+            elif self.neg_ct == self.nobs and result > 0:
+                result = 0.0
+            return result
+        return NAN
+
+
+class RollingSum:
+    """
+    Rolling sum matching `Series.rolling(window).sum()`.
+    """
+
+    def __init__(self, window: int, min_periods: Optional[int] = None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self._values = RollingWindow(window)
+        self._reset()
+
+    def _reset(self):
+        self.nobs = 0
+        self.sum = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.same_count = 0
+        self.prev_value = None
+
+    def update(self, value: float) -> float:
+        """Add one value and return the current sum."""
+        value = float(value)
+        reset, removed = self._values.push(value)
+        if reset:
+            self._reset()
+        if self.prev_value is None:
+            self.prev_value = value
+        if removed is not None and not _is_nan(removed):
+            self.nobs -= 1
+            y = -removed - self.compensation_remove
+            t = self.sum + y
+            self.compensation_remove = t - self.sum - y
+            self.sum = t
+        if not _is_nan(value):
+            self.nobs += 1
+            y = value - self.compensation_add
+            t = self.sum + y
+            self.compensation_add = t - self.sum - y
+            self.sum = t
+            if value == self.prev_value:
+                self.same_count += 1
+            else:
+                self.same_count = 1
+            self.prev_value = value
+        return self.value()
+
+    def value(self) -> float:
+        """Current sum (NaN until min_periods observations are in the window)."""
+        if self.nobs == 0 == self.min_periods:
+            return 0.0
+        if self.nobs >= self.min_periods:
+            if self.same_count >= self.nobs:
+                return self.prev_value * self.nobs
+            return self.sum
+        return NAN
+
+
+class RollingVariance:
+    """
+    Rolling variance/std matching `Series.rolling(window).var()` / `.std()`.
+
+    Uses the compensated Welford update pandas applies when values enter
+    and leave the window, including its fallback of recomputing the window
+    from scratch when an update loses most of the sum of squares to
+    cancellation.
+    """
+
+    # Relative drop of the sum of squares treated as catastrophic cancellation
+    INV_COND_TOL = np.finfo(np.float64).eps * 1e3
+
+    def __init__(self, window: int, min_periods: Optional[int] = None, ddof: int = 1):
+        self.window = window
+        self.min_periods = max(window if min_periods is None else min_periods, 1)
+        self.ddof = ddof
+        self._values = RollingWindow(window)
+        self._reset()
+
+    def _reset(self):
+        self.nobs = 0
+        self.mean = 0.0
+        self.ssqdm = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.unstable = False
+
+    def update(self, value: float) -> float:
+        """Add one value and return the current variance."""
+        value = float(value)
+        reset, removed = self._values.push(value)
+        if reset:
+            self._reset()
+        if removed is not None:
+            self._remove(removed)
+        self._add(value)
+        if self.unstable:
+            self._reset()
+            for v in self._values.values:
+                self._add(v)
+            self.unstable = False
+        return self.variance()
+
+    def _add(self, value: float):
+        if _is_nan(value):
+            return
+        prev_ssqdm = self.ssqdm
+        self.nobs += 1
+        prev_mean = self.mean - self.compensation_add
+        y = value - self.compensation_add
+        t = y - self.mean
+        self.compensation_add = t + self.mean - y
+        self.mean = self.mean + t / self.nobs
+        self.ssqdm += (value - prev_mean) * (value - self.mean)
+        if prev_ssqdm * self.INV_COND_TOL > self.ssqdm:
+            self.unstable = True
+
+    def _remove(self, value: float):
+        if _is_nan(value):
+            return
+        prev_ssqdm = self.ssqdm
+        self.nobs -= 1
+        if self.nobs:
+            prev_mean = self.mean - self.compensation_remove
+            y = value - self.compensation_remove
+            t = y - self.mean
+            self.compensation_remove = t + self.mean - y
+            self.mean = self.mean - t / self.nobs
+            self.ssqdm -= (value - prev_mean) * (value - self.mean)
+            if prev_ssqdm * self.INV_COND_TOL > self.ssqdm:
+                self.unstable = True
+        else:
+            self.mean = 0.0
+            self.ssqdm = 0.0
+            self.unstable = False
+
+    def variance(self) -> float:
+        """Current variance (NaN until min_periods observations are in the window)."""
+        if self.nobs >= self.min_periods and self.nobs > self.ddof:
+            return self.ssqdm / (self.nobs - self.ddof)
+        return NAN
+
+    def std(self) -> float:
+        """Current standard deviation (negative rounding residue clips to 0)."""
+        variance = self.variance()
+        if _is_nan(variance):
+            return NAN
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+
+class EWMA:
+    """
+    Exponentially weighted mean matching `Series.ewm(...).mean()`.
+    """
+
+    def __init__(self, span: Optional[float] = None, alpha: Optional[float] = None,
+                 adjust: bool = True, min_periods: int = 0):
+        if alpha is None:
+            if span is None:
+                raise ValueError("Either span or alpha must be given")
+            com = (span - 1) / 2.0
+            alpha = 1.0 / (1.0 + com)
+        self.alpha = alpha
+        self.adjust = adjust
+        self.min_periods = max(int(min_periods), 1)
+        self.old_wt_factor = 1.0 - alpha
+        self.new_wt = 1.0 if adjust else alpha
+        self.weighted = None
+        self.old_wt = 1.0
+        self.nobs = 0
+
+    def update(self, value: float) -> float:
+        """Add one value and return the current weighted mean."""
+        value = float(value)
+        is_observation = not _is_nan(value)
+        self.nobs += is_observation
+
+        if self.weighted is None:
+            self.weighted = value
+        elif not _is_nan(self.weighted):
+            # NaNs still decay the old weight (ignore_na=False)
+            self.old_wt *= self.old_wt_factor
+            if is_observation:
+                if self.weighted != value:
+                    self.weighted = self.old_wt * self.weighted + self.new_wt * value
+                    self.weighted /= (self.old_wt + self.new_wt)
+                if self.adjust:
+                    self.old_wt += self.new_wt
+                else:
+                    self.old_wt = 1.0
+        elif is_observation:
+            self.weighted = value
+
+        return self.value()
+
+    def value(self) -> float:
+        """Current weighted mean (NaN until min_periods observations)."""
+        if self.weighted is None or self.nobs < self.min_periods:
+            return NAN
+        return self.weighted
+
+
+class RollingExtreme:
+    """
+    Rolling max (or min) over the last `window` values using a monotonic deque.
+
+    Matches `Series.rolling(window).max()` / `.min()`, including NaN handling
+    (NaNs are skipped, min_periods counts non-NaN values).
+    """
+
+    def __init__(self, window: int, mode: str = 'max', min_periods: Optional[int] = None):
+        if mode not in ('max', 'min'):
+            raise ValueError("mode must be 'max' or 'min'")
+        self.window = window
+        self.is_max = mode == 'max'
+        self.min_periods = window if min_periods is None else min_periods
+        self._deque = deque()  # (position, value), monotonic in value
+        self._valid = deque()  # positions of non-NaN values in the window
+        self._position = -1
+
+    def update(self, value: float) -> float:
+        """Add one value and return the current extreme."""
+        value = float(value)
+        self._position += 1
+        oldest = self._position - self.window + 1
+
+        while self._deque and self._deque[0][0] < oldest:
+            self._deque.popleft()
+        while self._valid and self._valid[0] < oldest:
+            self._valid.popleft()
+
+        if not _is_nan(value):
+            self._valid.append(self._position)
+            if self.is_max:
+                while self._deque and self._deque[-1][1] <= value:
+                    self._deque.pop()
+            else:
+                while self._deque and self._deque[-1][1] >= value:
+                    self._deque.pop()
+            self._deque.append((self._position, value))
+
+        return self.value()
+
+    def value(self) -> float:
+        """Current extreme (NaN until min_periods non-NaN values)."""
+        if self._deque and len(self._valid) >= max(self.min_periods, 1):
+            return self._deque[0][1]
+        return NAN
+
+
+class StreamingSMA:
+    """Simple moving average, one value per update."""
+
+    def __init__(self, window: int):
+        self._mean = RollingMean(window)
+
+    def update(self, close: float) -> float:
+        return self._mean.update(close)
+
+
+class StreamingEMA:
+    """EMA matching TechnicalIndicators.exponential_moving_average (ewm span, adjust=True)."""
+
+    def __init__(self, window: int):
+        self._ewm = EWMA(span=window)
+
+    def update(self, close: float) -> float:
+        return self._ewm.update(close)
+
+
+class StreamingRSI:
+    """
+    RSI with rolling-mean ('sma', the batch default) or Wilder smoothing.
+    """
+
+    def __init__(self, window: int = 14, smoothing: str = 'sma'):
+        if smoothing == 'sma':
+            self._gain, self._loss = RollingMean(window), RollingMean(window)
+        elif smoothing == 'wilder':
+            self._gain = EWMA(alpha=1.0 / window, adjust=False, min_periods=window)
+            self._loss = EWMA(alpha=1.0 / window, adjust=False, min_periods=window)
+        else:
+            raise ValueError("smoothing must be 'sma' or 'wilder'")
+        self._prev_close = None
+
+    def update(self, close: float) -> float:
+        close = float(close)
+        delta = close - self._prev_close if self._prev_close is not None else NAN
+        self._prev_close = close
+        # Mirrors delta.where(delta > 0, 0) and -delta.where(delta < 0, 0),
+        # including the -0.0 the negation produces
+        gain = self._gain.update(delta if delta > 0 else 0.0)
+        loss = self._loss.update(-(delta if delta < 0 else 0.0))
+        rs = _div(gain, loss)
+        return 100 - _div(100, 1 + rs)
+
+
+class StreamingMACD:
+    """MACD line, signal line and histogram."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self._fast, self._slow, self._signal = EWMA(span=fast), EWMA(span=slow), EWMA(span=signal)
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        macd_line = self._fast.update(close) - self._slow.update(close)
+        signal_line = self._signal.update(macd_line)
+        return macd_line, signal_line, macd_line - signal_line
+
+
+class StreamingBollinger:
+    """Bollinger bands (upper, middle, lower)."""
+
+    def __init__(self, window: int = 20, num_std: float = 2):
+        self.num_std = num_std
+        self._mean, self._var = RollingMean(window), RollingVariance(window)
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        sma = self._mean.update(close)
+        self._var.update(close)
+        std = self._var.std()
+        return sma + (std * self.num_std), sma, sma - (std * self.num_std)
+
+
+class StreamingStochastic:
+    """Stochastic oscillator (%K, %D)."""
+
+    def __init__(self, k_window: int = 14, d_window: int = 3):
+        self._low = RollingExtreme(k_window, 'min')
+        self._high = RollingExtreme(k_window, 'max')
+        self._d = RollingMean(d_window)
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float]:
+        lowest_low = self._low.update(low)
+        highest_high = self._high.update(high)
+        k_percent = 100 * _div(close - lowest_low, highest_high - lowest_low)
+        return k_percent, self._d.update(k_percent)
+
+
+class StreamingWilliamsR:
+    """Williams %R."""
+
+    def __init__(self, window: int = 14):
+        self._high = RollingExtreme(window, 'max')
+        self._low = RollingExtreme(window, 'min')
+
+    def update(self, high: float, low: float, close: float) -> float:
+        highest_high = self._high.update(high)
+        lowest_low = self._low.update(low)
+        return -100 * _div(highest_high - close, highest_high - lowest_low)
+
+
+class StreamingATR:
+    """Average true range over a rolling mean of true ranges."""
+
+    def __init__(self, window: int = 14):
+        self._mean = RollingMean(window)
+        self._prev_close = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        high, low = float(high), float(low)
+        high_low = high - low
+        high_close_prev = abs(high - self._prev_close)
+        low_close_prev = abs(low - self._prev_close)
+        self._prev_close = float(close)
+        # np.maximum propagates NaN, so the first bar has no true range
+        true_range = float(np.maximum(high_low, np.maximum(high_close_prev, low_close_prev)))
+        return self._mean.update(true_range)
+
+
+class StreamingOBV:
+    """On-balance volume."""
+
+    def __init__(self):
+        self._prev_close = None
+        self.obv = 0
+
+    def update(self, close: float, volume: float) -> float:
+        change = close - self._prev_close if self._prev_close is not None else NAN
+        self._prev_close = close
+        if change < 0:
+            volume = -volume
+        elif change == 0:
+            volume = 0
+        self.obv = self.obv + volume
+        return self.obv
+
+
+class StreamingMFI:
+    """Money flow index."""
+
+    def __init__(self, window: int = 14):
+        self._positive, self._negative = RollingSum(window), RollingSum(window)
+        self._prev_typical = NAN
+
+    def update(self, high: float, low: float, close: float, volume: float) -> float:
+        typical_price = (float(high) + float(low) + float(close)) / 3
+        money_flow = typical_price * float(volume)
+        change = typical_price - self._prev_typical
+        self._prev_typical = typical_price
+        positive_flow = self._positive.update(money_flow if change > 0 else 0.0)
+        negative_flow = self._negative.update(money_flow if change < 0 else 0.0)
+        money_ratio = _div(positive_flow, abs(negative_flow))
+        return 100 - _div(100, 1 + money_ratio)
+
+
+class StreamingIndicators:
+    """
+    Incremental version of add_all_indicators for one symbol.
+
+    CCI is not included: its mean absolute deviation needs the whole window
+    on every bar, so it has no O(1) update.
+    """
+
+    def __init__(self):
+        self._sma = {window: StreamingSMA(window) for window in (10, 20, 50)}
+        self._ema = {window: StreamingEMA(window) for window in (12, 26)}
+        self._rsi = StreamingRSI(14)
+        self._macd = StreamingMACD()
+        self._bollinger = StreamingBollinger()
+        self._stochastic = StreamingStochastic()
+        self._atr = StreamingATR(14)
+        self._williams = StreamingWilliamsR()
+        self._obv = StreamingOBV()
+        self._mfi = StreamingMFI(14)
+        self.latest: Dict[str, float] = {}
+
+    def update(self, high: float, low: float, close: float,
+               volume: Optional[float] = None) -> Dict[str, float]:
+        """
+        Feed one bar.
+
+        Args:
+            high: Bar high
+            low: Bar low
+            close: Bar close
+            volume: Bar volume (volume indicators are skipped when None)
+
+        Returns:
+            Dictionary of indicator name -> latest value (add_all_indicators names)
+        """
+        values = {f'SMA_{window}': sma.update(close) for window, sma in self._sma.items()}
+        values.update({f'EMA_{window}': ema.update(close) for window, ema in self._ema.items()})
+        values['RSI_14'] = self._rsi.update(close)
+        values['MACD'], values['MACD_Signal'], values['MACD_Histogram'] = self._macd.update(close)
+        values['BB_Upper'], values['BB_Middle'], values['BB_Lower'] = self._bollinger.update(close)
+        values['Stoch_K'], values['Stoch_D'] = self._stochastic.update(high, low, close)
+        values['ATR_14'] = self._atr.update(high, low, close)
+        values['Williams_R'] = self._williams.update(high, low, close)
+        if volume is not None:
+            values['OBV'] = self._obv.update(close, volume)
+            values['MFI_14'] = self._mfi.update(high, low, close, volume)
+        self.latest = values
+        return values
+
+    @classmethod
+    def from_history(cls, data: pd.DataFrame) -> 'StreamingIndicators':
+        """
+        Build the state by replaying historical bars.
+
+        Args:
+            data: DataFrame with High, Low, Close (and optionally Volume)
+
+        Returns:
+            StreamingIndicators positioned after the last bar
+        """
+        indicators = cls()
+        volumes = data['Volume'].tolist() if 'Volume' in data.columns else [None] * len(data)
+        for high, low, close, volume in zip(data['High'].tolist(), data['Low'].tolist(),
+                                            data['Close'].tolist(), volumes):
+            indicators.update(high, low, close, volume)
+        return indicators
@@ -7,11 +7,191 @@ Includes trend, momentum, volatility, and volume indicators.
 
 import pandas as pd
 import numpy as np
-from typing import Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import logging
 
+from src.utils.indicator_cache import cached_indicator
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on temporary window elements per chunk in rolling_mean_deviation
+WINDOW_CHUNK_ELEMENTS = 1 << 22
+
+# Shortest block of the restarted prefix sums in moving_average_sweep (longer
+# windows use power-of-two multiples of it)
+SWEEP_BLOCK_ROWS = 256
+
+# Longest prefix-sum block; longer windows get a compensated rolling mean,
+# since a plain cumsum's error grows with the rows it runs over
+SWEEP_MAX_BLOCK_ROWS = 4096
+
+
+def rolling_mean_deviation(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling mean absolute deviation over a strided window view.
+    
+    Computes mean(|x - mean(x)|) for every full window with the same NumPy
+    reductions rolling().apply performs per row, in chunks so the temporary
+    (rows x window) block stays bounded. Windows containing NaN give NaN.
+    
+    Args:
+        values: 1D float array, or 2D (time x symbols) with windows along axis 0
+        window: Window length
+        
+    Returns:
+        Array shaped like values (NaN for the first window - 1 rows)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 2:
+        # Lay each symbol's history out contiguously so the window reductions
+        # run in the same order as for a single series
+        return _mean_deviation_rows(np.ascontiguousarray(values.T), window).T
+    return _mean_deviation_rows(values, window)
+
+
+def _mean_deviation_rows(values: np.ndarray, window: int) -> np.ndarray:
+    # Windows run along the last axis; leading axes (symbols) are broadcast
+    result = np.full(values.shape, np.nan)
+    if window <= 0 or values.shape[-1] < window or values.size == 0:
+        return result
+    
+    windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=-1)
+    rows = windows.shape[-2]
+    chunk = max(1, WINDOW_CHUNK_ELEMENTS // (window * max(1, values.size // values.shape[-1])))
+    for start in range(0, rows, chunk):
+        block = windows[..., start:start + chunk, :]
+        means = block.mean(axis=-1)
+        result[..., start + window - 1:start + window - 1 + block.shape[-2]] = \
+            np.abs(block - means[..., None]).mean(axis=-1)
+    return result
+
+
+@cached_indicator('moving_average_sweep')
+def moving_average_sweep(data, windows) -> np.ndarray:
+    """
+    Simple moving averages for many windows from blocked prefix sums.
+    
+    A prefix sum is built once per group of windows and every window is a
+    difference of two shifted slices of it, instead of a separate rolling
+    pass per window. Windows containing NaN give NaN, as with rolling().mean().
+    
+    A single running cumsum loses precision as it grows, so the series is
+    split into blocks, each summed relative to its first value with its own
+    prefix: a window then lies in one block or straddles two, and its error
+    depends on the block length rather than the series length. Windows are
+    grouped by block length (the smallest power-of-two multiple of
+    SWEEP_BLOCK_ROWS holding them), so a long window does not stretch the
+    blocks of the short ones. Windows longer than SWEEP_MAX_BLOCK_ROWS are
+    computed directly with rolling().mean(). On geometric price paths of
+    1k-1M rows, with windows up to the series length, the results agree
+    with simple_moving_average to about 1e-14 relative.
+    
+    Args:
+        data: Price series or 1D array
+        windows: Window lengths, e.g. range(5, 51)
+        
+    Returns:
+        Array of shape (len(windows), len(data)); row i is the SMA for windows[i]
+    """
+    values = np.asarray(data, dtype=np.float64)
+    windows = [int(window) for window in windows]
+    if any(window <= 0 for window in windows):
+        raise ValueError("Moving average windows must be positive")
+    
+    n = len(values)
+    result = np.full((len(windows), n), np.nan)
+    if n == 0 or not windows:
+        return result
+    
+    missing_prefix = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.isnan(values), out=missing_prefix[1:])
+    
+    groups: Dict[int, List[int]] = {}
+    series = None
+    for i, window in enumerate(windows):
+        if window > n:
+            continue
+        if window > SWEEP_MAX_BLOCK_ROWS:
+            series = pd.Series(values) if series is None else series
+            result[i] = series.rolling(window=window).mean().to_numpy()
+        else:
+            groups.setdefault(_sweep_block_rows(window), []).append(i)
+    
+    for block, rows in groups.items():
+        n_blocks = -(-n // block)
+        offsets, prefix = _block_prefix(values, block, n_blocks)
+        # Rows are computed in the (blocks x block) layout: column k of block b
+        # is the window ending at row b * block + k
+        means = np.empty((n_blocks, block))
+        ends = np.arange(1, block)
+        for i in rows:
+            window = windows[i]
+            means[0, :window - 1] = np.nan
+            # Windows inside one block
+            inside = means[:, window - 1:]
+            np.subtract(prefix[:, window:], prefix[:, :-window], out=inside)
+            inside /= window
+            inside += offsets[:, None]
+            if window > 1 and n_blocks > 1:
+                # Windows ending at column k - 1 of block b + 1 start in block b:
+                # the tail of block b plus the first k rows of block b + 1
+                k = ends[:window - 1]
+                sums = prefix[:-1, -1:] - prefix[:-1, block - window + 1:block] + prefix[1:, 1:window]
+                means[1:, :window - 1] = (sums + offsets[:-1, None] * (window - k)
+                                          + offsets[1:, None] * k) / window
+            result[i] = means.ravel()[:n]
+            if missing_prefix[n]:
+                row = result[i, window - 1:]
+                row[missing_prefix[window:] != missing_prefix[:-window]] = np.nan
+    return result
+
+
+def _sweep_block_rows(window: int) -> int:
+    # Smallest power-of-two multiple of SWEEP_BLOCK_ROWS holding the window
+    block = SWEEP_BLOCK_ROWS
+    while block < window:
+        block *= 2
+    return block
+
+
+def _block_prefix(values: np.ndarray, block: int, n_blocks: int):
+    # Each block relative to its first value (0 for an all-NaN block), with
+    # its own prefix starting at 0: prefix[b, k] is the sum of its first k rows
+    padded = np.full(n_blocks * block, np.nan)
+    padded[:len(values)] = values
+    blocks = padded.reshape(n_blocks, block)
+    missing = np.isnan(blocks)
+    first = np.argmax(~missing, axis=1)
+    offsets = np.where(missing.all(axis=1), 0.0, blocks[np.arange(n_blocks), first])
+    prefix = np.zeros((n_blocks, block + 1))
+    np.cumsum(np.where(missing, 0.0, blocks - offsets[:, None]), axis=1, out=prefix[:, 1:])
+    return offsets, prefix
+
+
+@cached_indicator('ema_sweep')
+def ema_sweep(data, spans, adjust: bool = True) -> np.ndarray:
+    """
+    Exponential moving averages for many spans as one matrix.
+    
+    Unlike SMAs, EMA recursions cannot share a prefix, so each span is one
+    compiled ewm pass over a single shared Series; rows are identical to
+    exponential_moving_average (adjust=True) or the recursive form (adjust=False).
+    
+    Args:
+        data: Price series or 1D array
+        spans: EMA spans, e.g. range(5, 51)
+        adjust: Use pandas' adjusted weights (matches exponential_moving_average)
+        
+    Returns:
+        Array of shape (len(spans), len(data)); row i is the EMA for spans[i]
+    """
+    series = pd.Series(np.asarray(data, dtype=np.float64))
+    spans = [int(span) for span in spans]
+    result = np.empty((len(spans), len(series)))
+    for i, span in enumerate(spans):
+        result[i] = series.ewm(span=span, adjust=adjust).mean().to_numpy()
+    return result
+
 
 class TechnicalIndicators:
     """
@@ -19,6 +199,7 @@ class TechnicalIndicators:
     """
     
     @staticmethod
+    @cached_indicator('TechnicalIndicators.simple_moving_average')
     def simple_moving_average(data: pd.Series, window: int) -> pd.Series:
         """
         Calculate Simple Moving Average (SMA).
@@ -33,6 +214,7 @@ class TechnicalIndicators:
         return data.rolling(window=window).mean()
     
     @staticmethod
+    @cached_indicator('TechnicalIndicators.exponential_moving_average')
     def exponential_moving_average(data: pd.Series, window: int) -> pd.Series:
         """
         Calculate Exponential Moving Average (EMA).
@@ -47,20 +229,30 @@ class TechnicalIndicators:
         return data.ewm(span=window).mean()
     
     @staticmethod
-    def relative_strength_index(data: pd.Series, window: int = 14) -> pd.Series:
+    @cached_indicator('TechnicalIndicators.relative_strength_index')
+    def relative_strength_index(data: pd.Series, window: int = 14, smoothing: str = 'sma') -> pd.Series:
         """
         Calculate Relative Strength Index (RSI).
         
         Args:
             data: Price series
             window: Period for RSI calculation (default 14)
+            smoothing: 'sma' for rolling means of gains/losses, 'wilder' for
+                Wilder's smoothing (EWM with alpha = 1/window)
             
         Returns:
             Series with RSI values (0-100)
         """
         delta = data.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+        gain = delta.where(delta > 0, 0)
+        loss = -delta.where(delta < 0, 0)
+        
+        if smoothing == 'wilder':
+            gain = gain.ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+            loss = loss.ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+        else:
+            gain = gain.rolling(window=window).mean()
+            loss = loss.rolling(window=window).mean()
         
         rs = gain / loss
         rsi = 100 - (100 / (1 + rs))
@@ -68,6 +260,7 @@ class TechnicalIndicators:
         return rsi
     
     @staticmethod
+    @cached_indicator('TechnicalIndicators.macd')
     def macd(data: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """
         Calculate MACD (Moving Average Convergence Divergence).
@@ -91,6 +284,7 @@ class TechnicalIndicators:
         return macd_line, signal_line, histogram
     
     @staticmethod
+    @cached_indicator('TechnicalIndicators.bollinger_bands')
     def bollinger_bands(data: pd.Series, window: int = 20, num_std: float = 2) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """
         Calculate Bollinger Bands.
@@ -112,6 +306,7 @@ class TechnicalIndicators:
         return upper_band, sma, lower_band
     
     @staticmethod
+    @cached_indicator('TechnicalIndicators.stochastic_oscillator')
     def stochastic_oscillator(high: pd.Series, low: pd.Series, close: pd.Series, 
                             k_window: int = 14, d_window: int = 3) -> Tuple[pd.Series, pd.Series]:
         """
@@ -136,6 +331,7 @@ class TechnicalIndicators:
         return k_percent, d_percent
     
     @staticmethod
+    @cached_indicator('TechnicalIndicators.average_true_range')
     def average_true_range(high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14) -> pd.Series:
         """
         Calculate Average True Range (ATR).
@@ -159,7 +355,9 @@ class TechnicalIndicators:
         return atr
     
     @staticmethod
-    def commodity_channel_index(high: pd.Series, low: pd.Series, close: pd.Series, window: int = 20) -> pd.Series:
+    @cached_indicator('TechnicalIndicators.commodity_channel_index')
+    def commodity_channel_index(high: pd.Series, low: pd.Series, close: pd.Series, window: int = 20,
+                                method: str = 'vectorized') -> pd.Series:
         """
         Calculate Commodity Channel Index (CCI).
         
@@ -168,21 +366,33 @@ class TechnicalIndicators:
             low: Low price series
             close: Close price series
             window: Period for CCI calculation (default 20)
+            method: 'vectorized' (sliding-window NumPy, default) or 'apply'
+                (rolling().apply, one Python call per row). Both give the
+                same output; 'vectorized' is faster at every size
+                scripts/benchmark_indicators.py measures
             
         Returns:
             Series with CCI values
         """
         typical_price = (high + low + close) / 3
         sma_tp = typical_price.rolling(window=window).mean()
-        mean_deviation = typical_price.rolling(window=window).apply(
-            lambda x: np.mean(np.abs(x - np.mean(x)))
-        )
+        
+        if method == 'vectorized':
+            mean_deviation = typical_price.astype(np.float64)
+            mean_deviation[:] = rolling_mean_deviation(typical_price.to_numpy(dtype=np.float64), window)
+        elif method == 'apply':
+            mean_deviation = typical_price.rolling(window=window).apply(
+                lambda x: np.mean(np.abs(x - np.mean(x)))
+            )
+        else:
+            raise ValueError(f"Unknown CCI method: {method}")
         
         cci = (typical_price - sma_tp) / (0.015 * mean_deviation)
         
         return cci
     
     @staticmethod
+    @cached_indicator('TechnicalIndicators.williams_percent_r')
     def williams_percent_r(high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14) -> pd.Series:
         """
         Calculate Williams %R.
@@ -204,6 +414,7 @@ class TechnicalIndicators:
         return williams_r
     
     @staticmethod
+    @cached_indicator('TechnicalIndicators.on_balance_volume')
     def on_balance_volume(close: pd.Series, volume: pd.Series) -> pd.Series:
         """
         Calculate On-Balance Volume (OBV).
@@ -224,6 +435,7 @@ class TechnicalIndicators:
         return obv.cumsum()
     
     @staticmethod
+    @cached_indicator('TechnicalIndicators.money_flow_index')
     def money_flow_index(high: pd.Series, low: pd.Series, close: pd.Series, 
                         volume: pd.Series, window: int = 14) -> pd.Series:
         """
@@ -252,59 +464,71 @@ class TechnicalIndicators:
         return mfi
 
 
-def add_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
+def standard_indicators(graph, include_volume: bool = True, cci_method: str = 'vectorized') -> dict:
     """
-    Add all technical indicators to a DataFrame with OHLCV data.
+    Pull the add_all_indicators set from an indicator graph.
     
     Args:
-        df: DataFrame with columns ['Open', 'High', 'Low', 'Close', 'Volume']
+        graph: IndicatorGraph over OHLCV data (Series or time x symbol frames)
+        include_volume: Also compute OBV and MFI_14 (requires a Volume column)
+        cci_method: Mean deviation method for the CCI ('vectorized' or 'apply')
         
     Returns:
-        DataFrame with additional technical indicator columns
+        Dictionary of indicator name -> values, in INDICATOR_COLUMNS order
     """
-    try:
-        indicators = TechnicalIndicators()
-        result_df = df.copy()
-        
+    macd, macd_signal, macd_histogram = graph.macd()
+    bb_upper, bb_middle, bb_lower = graph.bollinger_bands()
+    stoch_k, stoch_d = graph.stochastic()
+    
+    results = {
         # Moving Averages
-        result_df['SMA_10'] = indicators.simple_moving_average(df['Close'], 10)
-        result_df['SMA_20'] = indicators.simple_moving_average(df['Close'], 20)
-        result_df['SMA_50'] = indicators.simple_moving_average(df['Close'], 50)
-        result_df['EMA_12'] = indicators.exponential_moving_average(df['Close'], 12)
-        result_df['EMA_26'] = indicators.exponential_moving_average(df['Close'], 26)
-        
+        'SMA_10': graph.sma(10),
+        'SMA_20': graph.sma(20),
+        'SMA_50': graph.sma(50),
+        'EMA_12': graph.ema(12),
+        'EMA_26': graph.ema(26),
         # Momentum Indicators
-        result_df['RSI_14'] = indicators.relative_strength_index(df['Close'], 14)
-        
-        # MACD
-        macd, signal, histogram = indicators.macd(df['Close'])
-        result_df['MACD'] = macd
-        result_df['MACD_Signal'] = signal
-        result_df['MACD_Histogram'] = histogram
-        
-        # Bollinger Bands
-        bb_upper, bb_middle, bb_lower = indicators.bollinger_bands(df['Close'])
-        result_df['BB_Upper'] = bb_upper
-        result_df['BB_Middle'] = bb_middle
-        result_df['BB_Lower'] = bb_lower
-        
-        # Stochastic Oscillator
-        stoch_k, stoch_d = indicators.stochastic_oscillator(df['High'], df['Low'], df['Close'])
-        result_df['Stoch_K'] = stoch_k
-        result_df['Stoch_D'] = stoch_d
-        
+        'RSI_14': graph.rsi(14),
+        'MACD': macd,
+        'MACD_Signal': macd_signal,
+        'MACD_Histogram': macd_histogram,
+        # Bollinger Bands (the middle band is SMA_20)
+        'BB_Upper': bb_upper,
+        'BB_Middle': bb_middle,
+        'BB_Lower': bb_lower,
+        'Stoch_K': stoch_k,
+        'Stoch_D': stoch_d,
         # Volatility Indicators
-        result_df['ATR_14'] = indicators.average_true_range(df['High'], df['Low'], df['Close'])
-        
+        'ATR_14': graph.atr(14),
         # Other Indicators
-        result_df['CCI_20'] = indicators.commodity_channel_index(df['High'], df['Low'], df['Close'])
-        result_df['Williams_R'] = indicators.williams_percent_r(df['High'], df['Low'], df['Close'])
-        
-        # Volume Indicators
-        if 'Volume' in df.columns:
-            result_df['OBV'] = indicators.on_balance_volume(df['Close'], df['Volume'])
-            result_df['MFI_14'] = indicators.money_flow_index(df['High'], df['Low'], df['Close'], df['Volume'])
+        'CCI_20': graph.cci(20, method=cci_method),
+        'Williams_R': graph.williams_r(14),
+    }
+    
+    # Volume Indicators
+    if include_volume:
+        results['OBV'] = graph.obv()
+        results['MFI_14'] = graph.mfi(14)
+    
+    return results
+
+
+def add_all_indicators(df: pd.DataFrame, graph=None) -> pd.DataFrame:
+    """
+    Add all technical indicators to a DataFrame with OHLCV data.
+    
+    Args:
+        df: DataFrame with columns ['Open', 'High', 'Low', 'Close', 'Volume']
+        graph: IndicatorGraph over df to share intermediates with other
+            consumers (a new one is created by default). Results are only
+            taken from the indicator cache when no graph is passed.
         
+    Returns:
+        DataFrame with additional technical indicator columns (df unchanged
+        if computing them fails)
+    """
+    try:
+        result_df = _indicator_frame(df, graph)
         logger.info(f"Added {len(result_df.columns) - len(df.columns)} technical indicators")
         return result_df
         
@@ -313,6 +537,77 @@ def add_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
         return df
 
 
+@cached_indicator('add_all_indicators')
+def _indicator_frame(df: pd.DataFrame, graph=None) -> pd.DataFrame:
+    # Raises on failure, so add_all_indicators' fallback is never cached.
+    # Imported here because indicator_graph builds on this module
+    from src.utils.indicator_graph import IndicatorGraph
+    
+    graph = graph if graph is not None else IndicatorGraph(df)
+    result_df = df.copy()
+    for name, values in standard_indicators(graph, 'Volume' in df.columns).items():
+        result_df[name] = values
+    return result_df
+
+
+# Indicator names produced by add_all_indicators / panel_indicators, in column order
+INDICATOR_COLUMNS = [
+    'SMA_10', 'SMA_20', 'SMA_50', 'EMA_12', 'EMA_26', 'RSI_14',
+    'MACD', 'MACD_Signal', 'MACD_Histogram', 'BB_Upper', 'BB_Middle', 'BB_Lower',
+    'Stoch_K', 'Stoch_D', 'ATR_14', 'CCI_20', 'Williams_R', 'OBV', 'MFI_14',
+]
+
+
+def panel_indicators(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                     volume: Optional[np.ndarray] = None, as_array: bool = False,
+                     dtype=np.float64):
+    """
+    Compute the add_all_indicators set for many symbols at once.
+    
+    Inputs are aligned (time x symbols) arrays. Each indicator is computed in
+    one vectorized pass over all columns instead of one pandas pipeline per
+    symbol, and every column matches add_all_indicators on that symbol alone.
+    Missing bars should be NaN.
+    
+    Args:
+        high: High prices, shape (T, N)
+        low: Low prices, shape (T, N)
+        close: Close prices, shape (T, N)
+        volume: Volumes, shape (T, N); OBV and MFI_14 are skipped without it
+        as_array: Return one stacked array instead of a dictionary
+        dtype: Output dtype (e.g. np.float32 to halve memory for large universes)
+        
+    Returns:
+        Dictionary of indicator name -> (T, N) array, or if as_array is set a
+        tuple of (array of shape (indicators, T, N), list of indicator names)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    if close.ndim != 2:
+        raise ValueError(f"Panel inputs must be 2D (time x symbols), got shape {close.shape}")
+    for name, values in (('high', high), ('low', low), ('volume', volume)):
+        if values is not None and np.shape(values) != close.shape:
+            raise ValueError(f"{name} has shape {np.shape(values)}, expected {close.shape}")
+    
+    from src.utils.indicator_graph import IndicatorGraph
+    
+    panel = {
+        'High': pd.DataFrame(np.asarray(high, dtype=np.float64)),
+        'Low': pd.DataFrame(np.asarray(low, dtype=np.float64)),
+        'Close': pd.DataFrame(close),
+    }
+    if volume is not None:
+        panel['Volume'] = pd.DataFrame(np.asarray(volume))
+    results = standard_indicators(IndicatorGraph(panel), volume is not None)
+    
+    names = [name for name in INDICATOR_COLUMNS if name in results]
+    if as_array:
+        stacked = np.empty((len(names),) + close.shape, dtype=dtype)
+        for i, name in enumerate(names):
+            stacked[i] = results[name].to_numpy()
+        return stacked, names
+    return {name: results[name].to_numpy(dtype=dtype) for name in names}
+
+
 def main():
     """
     Example usage of technical indicators.
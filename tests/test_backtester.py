@@ -0,0 +1,140 @@
+"""
+Array backtest engines against straightforward row-by-row reference loops.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.data_source import generate_synthetic_bars
+from src.strategy.backtester import (
+    align_panel, calculate_slippage, multi_asset_backtest, position_size,
+    simple_backtest_with_costs, simple_backtest_with_risk
+)
+
+
+def _signalled(symbol, periods=400, density=0.1, seed=0):
+    data = generate_synthetic_bars(symbol, periods, end=pd.Timestamp('2026-10-16'))
+    rng = np.random.default_rng(seed)
+    draws = rng.random(periods)
+    data['Signal'] = np.where(draws < density / 2, 'Buy', np.where(draws < density, 'Sell', 'Hold'))
+    return data
+
+
+def _reference_risk(data, initial_capital=100000, risk_per_trade=0.01, stop_loss_pct=0.05, take_profit_pct=0.10):
+    capital, position, entry_price = initial_capital, 0, 0
+    history = []
+    for idx, row in data.iterrows():
+        price, signal = row['Close'], row['Signal']
+        if signal == 'Buy' and position == 0:
+            position = position_size(capital, risk_per_trade, stop_loss_pct, price)
+            entry_price = price
+            capital -= position * price
+        elif signal == 'Sell' and position > 0:
+            capital += position * price
+            position, entry_price = 0, 0
+        if position > 0 and price <= entry_price * (1 - stop_loss_pct):
+            capital += position * price
+            position, entry_price = 0, 0
+        if position > 0 and price >= entry_price * (1 + take_profit_pct):
+            capital += position * price
+            position, entry_price = 0, 0
+        history.append({'Date': idx, 'Portfolio Value': capital + position * price})
+    return pd.DataFrame(history)
+
+
+def _reference_costs(data, initial_capital=100000, commission_pct=0.001, slippage_pct=0.001):
+    cash, position = initial_capital, 0
+    history, transactions = [], []
+    for idx, row in data.iterrows():
+        price = row['Close']
+        history.append({'Date': idx, 'Portfolio Value': cash + position * price,
+                        'Cash': cash, 'Position': position})
+        if row['Signal'] == 'Buy' and cash > 0:
+            shares = int(cash * 0.95 / price)
+            if shares > 0:
+                slippage = calculate_slippage(price, shares, slippage_pct)
+                commission = shares * price * commission_pct
+                total_cost = shares * (price + slippage) + commission
+                if total_cost <= cash:
+                    cash -= total_cost
+                    position += shares
+                    transactions.append((idx, 'Buy', price, shares, commission + slippage * shares))
+        elif row['Signal'] == 'Sell' and position > 0:
+            shares = position
+            slippage = calculate_slippage(price, shares, slippage_pct)
+            commission = shares * price * commission_pct
+            cash += shares * (price - slippage) - commission
+            position = 0
+            transactions.append((idx, 'Sell', price, shares, commission + slippage * shares))
+    return pd.DataFrame(history), transactions
+
+
+def _reference_multi(stock_data_dict, initial_capital=100000):
+    # Union calendar; value = cash after the day's trades plus positions at last known prices
+    dates = sorted(set().union(*(data.index for data in stock_data_dict.values())))
+    cash = initial_capital
+    positions = {ticker: 0 for ticker in stock_data_dict}
+    marks = {ticker: 0.0 for ticker in stock_data_dict}
+    history = []
+    for date in dates:
+        for ticker, data in stock_data_dict.items():
+            if date not in data.index:
+                continue
+            price, signal = data.loc[date, 'Close'], data.loc[date, 'Signal']
+            marks[ticker] = price
+            if signal == 'Buy' and cash >= price:
+                shares = int(cash // price)
+                positions[ticker] += shares
+                cash -= shares * price
+            elif signal == 'Sell' and positions[ticker] > 0:
+                cash += positions[ticker] * price
+                positions[ticker] = 0
+        history.append({'Date': date, 'Portfolio Value': cash + sum(
+            positions[ticker] * marks[ticker] for ticker in stock_data_dict)})
+    return pd.DataFrame(history)
+
+
+@pytest.mark.parametrize('params', [{}, {'stop_loss_pct': 0.02, 'take_profit_pct': 0.03, 'risk_per_trade': 0.05}])
+def test_risk_engine_matches_reference_loop(params):
+    data = _signalled('RISK.NS', density=0.2)
+    result = simple_backtest_with_risk(data, **params)
+    pd.testing.assert_frame_equal(result, _reference_risk(data, **params))
+    assert simple_backtest_with_risk(data.iloc[:0]).empty
+
+
+def test_costs_engine_matches_reference_loop():
+    data = _signalled('COST.NS', density=0.2, seed=1)
+    history, transactions = simple_backtest_with_costs(data)
+    expected_history, expected_transactions = _reference_costs(data)
+
+    pd.testing.assert_frame_equal(history, expected_history)
+    assert len(transactions) == len(expected_transactions) > 0
+    for transaction, (date, kind, price, shares, costs) in zip(transactions, expected_transactions):
+        assert (transaction.date, transaction.type, transaction.price, transaction.shares) == (date, kind, price, shares)
+        assert transaction.costs == costs
+        assert transaction.total == price * shares + costs
+
+
+def test_multi_asset_engine_matches_reference_loop():
+    stock_data = {symbol: _signalled(symbol, seed=seed) for seed, symbol in enumerate(['AAA.NS', 'BBB.NS', 'CCC.NS'])}
+    # Gaps: one ticker lists late, another misses scattered bars
+    stock_data['BBB.NS'] = stock_data['BBB.NS'].iloc[50:]
+    stock_data['CCC.NS'] = stock_data['CCC.NS'].drop(stock_data['CCC.NS'].index[100:400:7])
+
+    result = multi_asset_backtest(stock_data)
+    expected = _reference_multi(stock_data)
+    assert list(result['Date']) == list(expected['Date'])
+    np.testing.assert_allclose(result['Portfolio Value'], expected['Portfolio Value'], rtol=1e-12)
+    assert multi_asset_backtest({}).empty
+
+
+def test_align_panel_keeps_the_last_duplicate_bar():
+    data = _signalled('DUP.NS', periods=5)
+    duplicated = pd.concat([data, data.iloc[[2]].assign(Close=1.0, Signal='Buy')])
+    dates, tickers, prices, buys, sells = align_panel({'DUP.NS': duplicated, 'ONE.NS': data.iloc[:1]})
+
+    assert list(dates) == list(data.index)
+    assert tickers == ['DUP.NS', 'ONE.NS']
+    assert prices[2, 0] == 1.0 and buys[2, 0] and not sells[2, 0]
+    assert np.isnan(prices[1:, 1]).all() and not buys[1:, 1].any()
@@ -0,0 +1,91 @@
+"""
+Streaming aggregation of 1-minute bars into higher timeframes.
+"""
+
+import pandas as pd
+import pytest
+
+from src.data.bar_aggregator import BAR_FIELDS, BarAggregator
+from src.data.data_source import generate_synthetic_bars
+
+RULES = {'5m': '5min', '15m': '15min', '1h': '1h', '1d': '1D'}
+
+
+def _resampled(minutes, timeframe):
+    # Reference: pandas resampling with hourly buckets anchored at 09:15
+    rule = RULES[timeframe]
+    offset = '15min' if timeframe == '1h' else None
+    bars = minutes.resample(rule, offset=offset).agg(
+        {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'})
+    return bars.dropna(subset=['Open'])
+
+
+@pytest.fixture
+def minutes():
+    # Three sessions of NSE minute bars
+    return generate_synthetic_bars('AGG.NS', 3 * 375, '1m', end=pd.Timestamp('2026-10-16 15:29'))
+
+
+def test_streamed_bars_match_pandas_resampling(minutes):
+    closed = []
+    aggregator = BarAggregator(on_bar_close=lambda timeframe, bar: closed.append((timeframe, bar['Date'])))
+    assert aggregator.update_frame(minutes) == len(minutes)
+
+    for timeframe in aggregator.timeframes:
+        streamed = aggregator.get_bars(timeframe)
+        expected = _resampled(minutes, timeframe)
+        assert list(streamed.index) == list(expected.index)
+        pd.testing.assert_frame_equal(streamed.astype(float), expected[BAR_FIELDS].astype(float),
+                                      check_names=False, check_freq=False)
+
+    # Everything but the forming bar of each timeframe has been reported as closed
+    assert sum(timeframe == '1d' for timeframe, _ in closed) == 2
+    assert aggregator.get_bars('1h').index[1].strftime('%H:%M') == '10:15'
+    assert aggregator.last_price() == minutes['Close'].iloc[-1]
+
+
+def test_refeeding_overlapping_frames_does_not_double_count(minutes):
+    once = BarAggregator()
+    once.update_frame(minutes)
+
+    overlapping = BarAggregator()
+    overlapping.update_frame(minutes.iloc[:500])
+    overlapping.update_frame(minutes.iloc[400:900])
+    overlapping.update_frame(minutes.iloc[899:])
+
+    for timeframe in once.timeframes:
+        pd.testing.assert_frame_equal(overlapping.get_bars(timeframe), once.get_bars(timeframe))
+
+
+def test_forming_bar_revision_replaces_volume():
+    aggregator = BarAggregator(timeframes=['5m'])
+    aggregator.update_bar('2026-10-16 09:15', 100, 101, 99, 100.5, 10)
+    aggregator.update_bar('2026-10-16 09:16', 100.5, 102, 100, 101, 20)
+    # The 09:16 bar was still forming when first seen
+    aggregator.update_bar('2026-10-16 09:16', 100.5, 103, 98, 102, 35)
+    # Out-of-order bars are ignored
+    aggregator.update_bar('2026-10-16 09:15', 1, 1, 1, 1, 1000)
+
+    bar = aggregator.current_bar('5m')
+    assert (bar['Open'], bar['High'], bar['Low'], bar['Close'], bar['Volume']) == (100, 103, 98, 102, 45)
+
+
+def test_ticks_accumulate_and_flush_completes_bars():
+    aggregator = BarAggregator(timeframes=['1m', '5m'])
+    for second, price in enumerate([100, 101, 99, 100]):
+        aggregator.update_tick(pd.Timestamp('2026-10-16 09:15') + pd.Timedelta(seconds=15 * second), price, 5)
+    aggregator.update_tick('2026-10-16 09:16:05', 102, 5)
+
+    assert len(aggregator.completed['1m']) == 1
+    first = aggregator.completed['1m'][0]
+    assert (first['Open'], first['High'], first['Low'], first['Close'], first['Volume']) == (100, 101, 99, 100, 20)
+    assert aggregator.current_bar('5m')['Volume'] == 25
+
+    aggregator.flush()
+    assert aggregator.current_bar('5m') is None
+    assert len(aggregator.get_bars('5m')) == 1
+
+
+def test_rejects_unknown_timeframes():
+    with pytest.raises(ValueError):
+        BarAggregator(timeframes=['7m'])
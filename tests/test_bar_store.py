@@ -0,0 +1,79 @@
+"""
+Columnar bar store and incremental top-up fetches.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.data.bar_store import BarStore
+from src.data.data_collector import MarketDataCollector
+from src.data.data_source import ReplayDataSource, generate_synthetic_bars
+
+
+class RecordingSource(ReplayDataSource):
+    """Replay source that records the requests it serves."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requests = []
+
+    def history(self, symbol, period=None, interval='1d', start=None, end=None):
+        data = super().history(symbol, period=period, interval=interval, start=start, end=end)
+        self.requests.append({'period': period, 'start': start, 'rows': len(data)})
+        return data
+
+
+def _assert_same_bars(left, right):
+    # The store keeps nanosecond timestamps whatever the input resolution
+    pd.testing.assert_frame_equal(left, right.set_axis(right.index.as_unit('ns')), check_freq=False)
+
+
+def _bars(periods=300, end='2026-10-16'):
+    return generate_synthetic_bars('TEST', periods=periods, end=pd.Timestamp(end))
+
+
+def test_write_read_round_trip_keeps_index_and_dtypes(tmp_path):
+    store = BarStore(str(tmp_path))
+    data = _bars()
+    store.write('TEST', '1d', data)
+
+    _assert_same_bars(store.read('TEST', '1d'), data)
+    tail = store.read('TEST', '1d', start=data.index[-10])
+    _assert_same_bars(tail, data.iloc[-10:])
+    assert store.last_timestamp('TEST', '1d') == data.index[-1]
+    assert store.row_count('TEST', '1d') == len(data)
+    assert store.symbols('1d') == ['TEST']
+
+
+def test_append_replaces_the_forming_bar(tmp_path):
+    store = BarStore(str(tmp_path))
+    data = _bars()
+    forming = data.iloc[:-5].copy()
+    forming.iloc[-1, forming.columns.get_loc('Close')] = -1.0
+    store.write('TEST', '1d', forming)
+
+    rows = store.append('TEST', '1d', data.iloc[-6:])
+    assert rows == len(data)
+    _assert_same_bars(store.read('TEST', '1d'), data)
+
+
+def test_collector_tops_up_only_new_bars(tmp_path):
+    history = _bars()
+    source = RecordingSource({'TEST': history}, as_of=history.index[-6])
+    collector = MarketDataCollector(store_dir=str(tmp_path), data_source=source, metadata_db=None)
+
+    first = collector.fetch_stock_data('TEST', period='max')
+    assert len(first) == len(history) - 5
+    assert source.requests[-1]['start'] is None
+
+    # A week later, with the in-memory cache gone
+    source.as_of = history.index[-1]
+    collector.cache.clear()
+    second = collector.fetch_stock_data('TEST', period='max')
+
+    top_up = source.requests[-1]
+    assert len(source.requests) == 2
+    assert top_up['start'] == history.index[-6]
+    assert top_up['rows'] == 6
+    _assert_same_bars(second, history)
+    np.testing.assert_array_equal(collector.store.read('TEST', '1d').index, history.index)
@@ -0,0 +1,71 @@
+"""
+Session-aware expiry of cached daily bars.
+"""
+
+from datetime import timedelta
+
+import pandas as pd
+import pytest
+
+import src.data.cache as cache_module
+from src.data.cache import DataCache
+from src.data.trading_calendar import TradingCalendar
+
+
+def _local(calendar, exchange_time):
+    # Exchange wall-clock time -> the naive local time DataCache works in
+    stamp = pd.Timestamp(exchange_time, tz=calendar.timezone)
+    local_tz = stamp.to_pydatetime().astimezone().tzinfo
+    return stamp.tz_convert(local_tz).tz_localize(None).to_pydatetime()
+
+
+def _frozen(now):
+    # datetime whose now() is fixed, for driving DataCache expiry
+    class FrozenDatetime(cache_module.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now if tz is None else now.astimezone(tz)
+    return FrozenDatetime
+
+
+@pytest.fixture
+def calendar():
+    return TradingCalendar()
+
+
+def test_daily_bars_cached_before_open_expire_at_open(calendar):
+    cache = DataCache(calendar=calendar)
+    now = _local(calendar, '2026-10-16 08:45')
+    assert cache.expiry_for('1d', now) == _local(calendar, '2026-10-16 09:15')
+
+
+def test_daily_bars_stay_fresh_briefly_during_session(calendar):
+    cache = DataCache(calendar=calendar, open_session_ttl=timedelta(minutes=2))
+    now = _local(calendar, '2026-10-16 11:00')
+    assert cache.expiry_for('1d', now) - now == timedelta(minutes=2)
+    near_close = _local(calendar, '2026-10-16 15:29')
+    assert cache.expiry_for('1d', near_close) == _local(calendar, '2026-10-16 15:30')
+
+
+def test_intraday_and_calendarless_ttls_unchanged(calendar):
+    now = _local(calendar, '2026-10-16 11:00')
+    assert DataCache(calendar=calendar).expiry_for('5m', now) - now == timedelta(minutes=2)
+    assert DataCache().expiry_for('1d', now) - now == timedelta(hours=4)
+
+
+def test_explicit_expiry_outlives_session_boundary(calendar, monkeypatch):
+    cache = DataCache(calendar=calendar)
+    stored = _local(calendar, '2026-10-16 08:45')
+    until = pd.Timestamp('2026-10-16 09:45', tz=calendar.timezone)
+    data = pd.DataFrame({'Close': [1.0, 2.0]})
+
+    monkeypatch.setattr(cache_module, 'datetime', _frozen(stored))
+    cache.put('warm', data, '1d', expires=until)
+    cache.put('live', data, '1d')
+
+    monkeypatch.setattr(cache_module, 'datetime', _frozen(_local(calendar, '2026-10-16 09:16')))
+    assert cache.get('warm') is not None
+    assert cache.get('live') is None
+
+    monkeypatch.setattr(cache_module, 'datetime', _frozen(_local(calendar, '2026-10-16 09:46')))
+    assert cache.get('warm') is None
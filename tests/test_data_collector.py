@@ -0,0 +1,120 @@
+"""
+MarketDataCollector parallel fetching and compact cleaning.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data.data_collector import MarketDataCollector
+from src.data.data_source import ReplayDataSource
+
+SYMBOLS = [f'S{i}.NS' for i in range(8)]
+
+
+class SlowSource(ReplayDataSource):
+    """Synthetic source with a fixed latency that fails for one symbol."""
+
+    def __init__(self, latency=0.2, failing=None):
+        super().__init__({}, synthetic_periods=100)
+        self.latency = latency
+        self.failing = failing
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def history(self, symbol, *args, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.latency)
+            if symbol == self.failing:
+                raise ConnectionError(f"upstream error for {symbol}")
+            return super().history(symbol, *args, **kwargs)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _collector(source, **kwargs):
+    return MarketDataCollector(store_dir=None, data_source=source, metadata_db=None, **kwargs)
+
+
+def test_fetch_multiple_stocks_runs_in_parallel():
+    source = SlowSource()
+    collector = _collector(source, max_workers=8)
+    started = time.perf_counter()
+    results = collector.fetch_multiple_stocks(SYMBOLS, period='1mo')
+    elapsed = time.perf_counter() - started
+
+    assert sorted(results) == SYMBOLS
+    assert source.max_active > 1
+    assert elapsed < 0.2 * len(SYMBOLS) / 2
+
+
+def test_serial_and_parallel_fetches_agree_and_isolate_failures():
+    serial = _collector(SlowSource(latency=0, failing='S3.NS')).fetch_multiple_stocks(
+        SYMBOLS, period='1mo', max_workers=1)
+    parallel = _collector(SlowSource(latency=0, failing='S3.NS')).fetch_multiple_stocks(
+        SYMBOLS, period='1mo', max_workers=4)
+
+    assert 'S3.NS' not in parallel
+    assert list(parallel) == list(serial) == [symbol for symbol in SYMBOLS if symbol != 'S3.NS']
+    for symbol in serial:
+        pd.testing.assert_frame_equal(serial[symbol], parallel[symbol])
+
+
+def _raw_bars():
+    index = pd.date_range('2026-10-01', periods=6, freq='B', tz='Asia/Kolkata')
+    return pd.DataFrame({
+        'Open': [100.0, np.nan, 102.0, np.nan, 104.0, -105.0],
+        'High': [101.0, 102.5, np.nan, np.nan, 103.0, 106.0],
+        'Low': [99.0, 100.5, 101.0, np.nan, 103.5, 104.0],
+        'Close': [100.5, 102.0, 101.5, np.nan, 103.8, 105.5],
+        'Volume': [1000.0, -2000.0, np.nan, np.nan, 5000.0, 6000.0],
+        'Dividends': 0.0,
+        'Stock Splits': 0.0,
+    }, index=index)
+
+
+def test_compact_cleaning_matches_the_default_cleaning():
+    collector = _collector(SlowSource(latency=0))
+    raw = _raw_bars()
+    default = collector._clean_data(raw.copy())
+    compact = collector._clean_data(raw.copy(), compact=True)
+
+    # Dividends keep the empty OHLCV row alive in the default path; the
+    # compact path only looks at OHLCV and drops it
+    assert list(compact.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+    assert len(compact) == len(raw) - 1
+    expected = default.drop(index=raw.index[3])
+
+    for column in ['Open', 'High', 'Low', 'Close']:
+        assert compact[column].dtype == np.float32
+        np.testing.assert_allclose(compact[column], expected[column].astype(np.float32))
+    assert compact['Volume'].dtype == np.int32
+    np.testing.assert_array_equal(compact['Volume'], expected['Volume'].astype(np.int64))
+    assert (compact['High'] >= compact['Low']).all()
+    assert (compact[['Open', 'High', 'Low', 'Close']] > 0).all().all()
+
+
+def test_compact_volume_widens_when_it_overflows_int32():
+    collector = _collector(SlowSource(latency=0), compact=True)
+    raw = _raw_bars().drop(columns=['Dividends', 'Stock Splits'])
+    raw['Volume'] = 3e9
+    assert collector._clean_data(raw)['Volume'].dtype == np.int64
+
+
+def test_long_format_has_categorical_symbols():
+    collector = _collector(SlowSource(latency=0))
+    frames = collector.fetch_multiple_stocks(SYMBOLS[:3], period='1mo', max_workers=1)
+    long = collector.to_long_format(frames)
+
+    assert long['Symbol'].dtype == 'category'
+    assert list(long['Symbol'].cat.categories) == SYMBOLS[:3]
+    assert len(long) == sum(len(frame) for frame in frames.values())
+    for symbol, frame in frames.items():
+        pd.testing.assert_frame_equal(long[long['Symbol'] == symbol].drop(columns='Symbol'), frame)
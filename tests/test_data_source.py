@@ -0,0 +1,138 @@
+"""
+Data source initialization, replay and request coalescing.
+"""
+
+import threading
+import time
+
+import pandas as pd
+
+import src.data.data_source as data_source
+from src.data.bar_store import BarStore
+
+
+def test_concurrent_first_use_builds_one_source(monkeypatch):
+    create = data_source.create_data_source
+
+    def slow_create(spec):
+        time.sleep(0.1)
+        return create('synthetic')
+
+    monkeypatch.setattr(data_source, 'create_data_source', slow_create)
+    data_source.set_data_source(None)
+    sources = []
+    threads = [threading.Thread(target=lambda: sources.append(data_source.get_data_source()))
+               for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    data_source.set_data_source(None)
+
+    assert len(sources) == 16
+    assert len({id(source) for source in sources}) == 1
+
+
+def test_coalesced_callers_never_share_the_fetched_frame():
+    fetched = []
+
+    class SlowSource(data_source.ReplayDataSource):
+        def history(self, *args, **kwargs):
+            time.sleep(0.1)
+            fetched.append(super().history(*args, **kwargs))
+            return fetched[-1]
+
+    source = data_source.CoalescingDataSource(SlowSource({}, synthetic_periods=100))
+    results = []
+
+    def fetch_and_mutate():
+        data = source.history('TEST.NS', period='1mo')
+        # Callers add columns and rescale prices in place, as the collector does
+        data['Signal'] = 1
+        data['Close'] *= 0
+        results.append(data)
+
+    threads = [threading.Thread(target=fetch_and_mutate) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fetched) == 1
+    assert source.flight.stats()['coalesced'] == 7
+    assert all(result is not fetched[0] for result in results)
+    assert 'Signal' not in fetched[0].columns
+    assert (fetched[0]['Close'] > 0).all()
+
+
+def _replay(**kwargs):
+    return data_source.ReplayDataSource.synthetic(['AAA.NS', 'BBB.NS'], periods=300,
+                                                  end=pd.Timestamp('2026-10-16 15:30'), **kwargs)
+
+
+def test_synthetic_bars_are_deterministic_and_well_formed():
+    first = data_source.generate_synthetic_bars('AAA.NS', 300, end=pd.Timestamp('2026-10-16'))
+    second = data_source.generate_synthetic_bars('AAA.NS', 300, end=pd.Timestamp('2026-10-16'))
+    other = data_source.generate_synthetic_bars('BBB.NS', 300, end=pd.Timestamp('2026-10-16'))
+
+    pd.testing.assert_frame_equal(first, second)
+    assert not first['Close'].equals(other['Close'])
+    assert len(first) == 300 and first.index.is_monotonic_increasing
+    assert (first['High'] >= first[['Open', 'Close']].max(axis=1)).all()
+    assert (first['Low'] <= first[['Open', 'Close']].min(axis=1)).all()
+
+    minutes = data_source.generate_synthetic_bars('AAA.NS', 500, '1m', end=pd.Timestamp('2026-10-16 15:29'))
+    assert len(minutes) == 500
+    assert minutes.index[-1] == pd.Timestamp('2026-10-16 15:29', tz=data_source.MARKET_TIMEZONE)
+
+
+def test_replay_history_honours_period_start_and_end():
+    source = _replay()
+    full = source.history('AAA.NS', period='max')
+    assert len(full) == 300
+
+    month = source.history('AAA.NS', period='1mo')
+    assert month.index[0] >= full.index[-1] - pd.DateOffset(months=1) - pd.Timedelta(days=1)
+    assert month.index[-1] == full.index[-1]
+
+    window = source.history('AAA.NS', start='2026-09-01', end='2026-09-30')
+    assert window.index[0] == full.index[full.index >= pd.Timestamp('2026-09-01', tz=full.index.tz)][0]
+    assert window.index[-1] <= pd.Timestamp('2026-09-30', tz=full.index.tz)
+
+    assert source.symbols() == ['AAA.NS', 'BBB.NS']
+    # Synthetic sources generate unknown symbols on demand; plain replay does not
+    assert len(source.history('NEW.NS', period='max')) == 300
+    assert data_source.ReplayDataSource({'AAA.NS': full}).history('NEW.NS', period='1mo').empty
+
+
+def test_replay_clock_hides_future_bars():
+    source = _replay()
+    full = source.history('AAA.NS', period='max')
+    source.as_of = full.index[199]
+
+    replayed = source.history('AAA.NS', period='max')
+    pd.testing.assert_frame_equal(replayed, full.iloc[:200])
+    # Naive timestamps are read in the index timezone
+    assert source.history('AAA.NS', period='max', end=full.index[99].tz_localize(None)).index[-1] == full.index[99]
+
+
+def test_replay_returns_copies():
+    source = _replay()
+    data = source.history('AAA.NS', period='max')
+    data['Close'] *= 0
+    assert (source.history('AAA.NS', period='max')['Close'] > 0).all()
+
+
+def test_from_bar_store_replays_recorded_bars(tmp_path):
+    recorded = _replay()
+    store = BarStore(str(tmp_path))
+    for symbol in recorded.symbols():
+        store.write(symbol, '1d', recorded.history(symbol, period='max'))
+
+    source = data_source.ReplayDataSource.from_bar_store(str(tmp_path))
+    assert source.symbols() == recorded.symbols()
+    for symbol in recorded.symbols():
+        replayed = source.history(symbol, period='max')
+        expected = recorded.history(symbol, period='max')
+        assert list(replayed.index.as_unit('ns')) == list(expected.index.as_unit('ns'))
+        assert (replayed['Close'].to_numpy() == expected['Close'].to_numpy()).all()
@@ -0,0 +1,102 @@
+"""
+Rate limiting, backoff and throttle detection of the shared HTTP client.
+"""
+
+import time
+
+import pytest
+
+requests = pytest.importorskip('requests')
+
+from src.utils.http_client import (  # noqa: E402
+    HttpClient, TokenBucket, _is_throttle_error, parse_rate_limits
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeHTTPError(Exception):
+    def __init__(self, status_code, message=''):
+        super().__init__(message)
+        self.response = FakeResponse(status_code)
+
+
+class YFRateLimitError(Exception):
+    pass
+
+
+def test_throttle_detection_uses_status_and_type_not_text():
+    assert _is_throttle_error(FakeHTTPError(429))
+    assert not _is_throttle_error(FakeHTTPError(404, 'Too Many Requests for 429.NS'))
+    assert _is_throttle_error(YFRateLimitError('slow down'))
+    assert not _is_throttle_error(ValueError('No data for 5429.T at 429.50'))
+    assert not _is_throttle_error(KeyError('rate limit'))
+
+    wrapped = RuntimeError('download failed')
+    wrapped.__cause__ = FakeHTTPError(429)
+    assert _is_throttle_error(wrapped)
+
+
+def test_token_bucket_limits_sustained_rate():
+    bucket = TokenBucket(rate=50.0, burst=5)
+    started = time.monotonic()
+    waits = [bucket.acquire() for _ in range(15)]
+    elapsed = time.monotonic() - started
+    assert waits[:5] == [0.0] * 5
+    # 10 tokens beyond the burst at 50/s
+    assert 0.15 < elapsed < 0.6
+
+
+def test_call_retries_throttling_with_backoff_and_drains_the_bucket():
+    client = HttpClient(rate_limits={'test': (1000.0, 10)}, backoff_base=0.01, max_retries=3)
+    attempts = []
+
+    def flaky():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise YFRateLimitError('throttled')
+        return 'ok'
+
+    assert client.call('test', flaky) == 'ok'
+    metrics = client.metrics()['test']
+    assert metrics['retries'] == 2
+    assert metrics['throttled'] == 2
+    assert metrics['errors'] == 2
+
+
+def test_call_does_not_retry_other_errors():
+    client = HttpClient(rate_limits={'test': (1000.0, 10)}, backoff_base=0.01)
+    attempts = []
+
+    def broken():
+        attempts.append(1)
+        raise ValueError('HTTP 429 in a symbol name')
+
+    with pytest.raises(ValueError):
+        client.call('test', broken)
+    assert len(attempts) == 1
+
+
+def test_call_gives_up_after_max_retries():
+    client = HttpClient(rate_limits={'test': (1000.0, 10)}, backoff_base=0.001, max_retries=2)
+    attempts = []
+
+    def always_throttled():
+        attempts.append(1)
+        raise FakeHTTPError(429)
+
+    with pytest.raises(FakeHTTPError):
+        client.call('test', always_throttled)
+    assert len(attempts) == 3
+
+
+def test_parse_rate_limits():
+    assert parse_rate_limits('yfinance=4:8, api.kite.trade=2.5') == {
+        'yfinance': (4.0, 8), 'api.kite.trade': (2.5, 3)}
+    with pytest.raises(ValueError):
+        parse_rate_limits('yfinance=fast')
+    with pytest.raises(ValueError):
+        parse_rate_limits('yfinance=0:1')
@@ -0,0 +1,41 @@
+"""
+Indicator cache keying and failure handling.
+"""
+
+import pytest
+
+from src.data.data_source import generate_synthetic_bars
+from src.utils.indicator_cache import (
+    disable_indicator_cache, enable_indicator_cache, get_indicator_cache
+)
+from src.utils.technical_indicators import TechnicalIndicators, add_all_indicators
+
+
+@pytest.fixture
+def cache(tmp_path):
+    enable_indicator_cache(disk_dir=str(tmp_path))
+    yield get_indicator_cache()
+    disable_indicator_cache()
+
+
+def test_equivalent_calls_share_one_entry(cache):
+    close = generate_synthetic_bars('TEST', periods=200)['Close']
+    results = [
+        TechnicalIndicators.relative_strength_index(close),
+        TechnicalIndicators.relative_strength_index(close, 14),
+        TechnicalIndicators.relative_strength_index(close, window=14),
+    ]
+    assert len(cache._entries) == 1
+    assert all(result.equals(results[0]) for result in results)
+
+
+def test_add_all_indicators_fallback_is_not_cached(cache, tmp_path):
+    data = generate_synthetic_bars('TEST', periods=200)
+    broken = data.drop(columns=['High'])
+    assert add_all_indicators(broken) is broken
+    assert len(cache._entries) == 0
+    assert not list(tmp_path.glob('*.pkl'))
+
+    result = add_all_indicators(data)
+    assert len(result.columns) > len(data.columns)
+
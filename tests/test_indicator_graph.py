@@ -0,0 +1,90 @@
+"""
+IndicatorGraph parity with the standalone TechnicalIndicators methods.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.data_source import generate_synthetic_bars
+from src.strategy.signal_generator import SignalGenerator
+from src.utils.indicator_graph import IndicatorGraph
+from src.utils.technical_indicators import TechnicalIndicators as TI, add_all_indicators
+
+
+@pytest.fixture(params=['clean', 'gappy'])
+def bars(request):
+    data = generate_synthetic_bars('GRAPH.NS', 300, end=pd.Timestamp('2026-10-16'))
+    if request.param == 'gappy':
+        # A missing bar mid-series must propagate exactly as in the standalone methods
+        data.iloc[120] = np.nan
+    return data
+
+
+def _standalone(data):
+    high, low, close, volume = data['High'], data['Low'], data['Close'], data['Volume']
+    return {
+        'sma': TI.simple_moving_average(close, 20),
+        'ema': TI.exponential_moving_average(close, 12),
+        'rsi': TI.relative_strength_index(close, 14),
+        'rsi_wilder': TI.relative_strength_index(close, 14, smoothing='wilder'),
+        'macd': TI.macd(close),
+        'bollinger': TI.bollinger_bands(close),
+        'stochastic': TI.stochastic_oscillator(high, low, close),
+        'atr': TI.average_true_range(high, low, close),
+        'cci': TI.commodity_channel_index(high, low, close),
+        'cci_apply': TI.commodity_channel_index(high, low, close, method='apply'),
+        'williams_r': TI.williams_percent_r(high, low, close),
+        'obv': TI.on_balance_volume(close, volume),
+        'mfi': TI.money_flow_index(high, low, close, volume),
+    }
+
+
+def _from_graph(graph):
+    return {
+        'sma': graph.sma(20),
+        'ema': graph.ema(12),
+        'rsi': graph.rsi(14),
+        'rsi_wilder': graph.rsi(14, smoothing='wilder'),
+        'macd': graph.macd(),
+        'bollinger': graph.bollinger_bands(),
+        'stochastic': graph.stochastic(),
+        'atr': graph.atr(),
+        'cci': graph.cci(),
+        'cci_apply': IndicatorGraph(graph.data).cci(method='apply'),
+        'williams_r': graph.williams_r(),
+        'obv': graph.obv(),
+        'mfi': graph.mfi(),
+    }
+
+
+def test_graph_nodes_are_identical_to_standalone_methods(bars):
+    expected = _standalone(bars)
+    actual = _from_graph(IndicatorGraph(bars))
+    for name, values in expected.items():
+        values = values if isinstance(values, tuple) else (values,)
+        graph_values = actual[name] if isinstance(actual[name], tuple) else (actual[name],)
+        for left, right in zip(graph_values, values):
+            pd.testing.assert_series_equal(left, right, check_names=False, obj=name)
+
+
+def test_nodes_are_computed_once_and_shared(bars):
+    graph = IndicatorGraph(bars)
+    add_all_indicators(bars, graph)
+    nodes = graph.stats()['nodes']
+
+    # BB_Middle and SMA_20 are one node; the crossover and RSI signals reuse the indicator pass
+    assert graph.bollinger_bands()[1] is graph.sma(20)
+    generator = SignalGenerator()
+    generator.generate_ma_crossover_signals(bars, short_window=10, long_window=50, graph=graph)
+    generator.generate_rsi_signals(bars, graph=graph)
+    assert graph.stats()['nodes'] == nodes
+    assert graph.stats()['hits'] > 0
+
+
+def test_unknown_inputs_raise(bars):
+    graph = IndicatorGraph(bars[['Close']])
+    with pytest.raises(KeyError):
+        graph.atr()
+    with pytest.raises(ValueError):
+        graph.rolling('median', 5)
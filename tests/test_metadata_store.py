@@ -0,0 +1,111 @@
+"""
+Persistent symbol metadata and its refresh policy.
+"""
+
+import threading
+
+import pytest
+
+import src.data.metadata_store as metadata_store
+from src.data.data_source import ReplayDataSource
+from src.data.metadata_store import MetadataStore
+
+INFOS = {
+    'AAA.NS': {'longName': 'Alpha Ltd', 'sector': 'Energy', 'beta': 1.2, 'marketCap': 5e11},
+    'BBB.NS': {'longName': 'Beta Ltd', 'sector': 'Technology', 'beta': 0.8},
+}
+
+
+class CountingSource(ReplayDataSource):
+    """Replay source that counts info calls and fails for one symbol."""
+
+    def __init__(self, failing=None):
+        super().__init__(infos=INFOS)
+        self.failing = failing
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def info(self, symbol):
+        with self._lock:
+            self.calls.append(symbol)
+        if symbol == self.failing:
+            raise ConnectionError(f"upstream error for {symbol}")
+        return super().info(symbol)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MetadataStore(str(tmp_path / 'metadata.db'), data_source=CountingSource(failing='BAD.NS'))
+
+
+def _age(store, symbol, days):
+    # Backdate a row's last refresh
+    row = store.get_many([symbol])[symbol]
+    updated = metadata_store.datetime.fromisoformat(row['updated']) - metadata_store.timedelta(days=days)
+    with store._connect() as conn:
+        conn.execute("UPDATE metadata SET updated = ? WHERE symbol = ?", (updated.isoformat(), symbol))
+
+
+def test_upsert_maps_info_fields_to_columns(store):
+    store.upsert(INFOS)
+    rows = store.get_many(['AAA.NS', 'BBB.NS', 'CCC.NS'])
+
+    assert sorted(rows) == ['AAA.NS', 'BBB.NS']
+    assert rows['AAA.NS']['company_name'] == 'Alpha Ltd'
+    assert rows['AAA.NS']['market_cap'] == 5e11
+    assert rows['BBB.NS']['market_cap'] is None
+    assert rows['BBB.NS']['info'] == INFOS['BBB.NS']
+    assert store.data_source.calls == []
+
+    # The table survives reopening
+    reopened = MetadataStore(store.db_path, data_source=store.data_source)
+    assert reopened.get_sector('AAA.NS', fetch_missing=False) == 'Energy'
+
+
+def test_get_fetches_once_and_refreshes_when_stale(store):
+    source = store.data_source
+    assert store.get('AAA.NS')['sector'] == 'Energy'
+    assert store.get('AAA.NS')['sector'] == 'Energy'
+    assert source.calls == ['AAA.NS']
+
+    _age(store, 'AAA.NS', 8)
+    assert store.stale_symbols(['AAA.NS', 'BBB.NS']) == ['AAA.NS', 'BBB.NS']
+    assert store.get('AAA.NS', refresh_if_stale=False) is not None
+    assert source.calls == ['AAA.NS']
+    store.get('AAA.NS')
+    assert source.calls == ['AAA.NS', 'AAA.NS']
+    assert store.stale_symbols(['AAA.NS']) == []
+
+
+def test_get_sector_answers_stale_rows_locally(store):
+    source = store.data_source
+    assert store.get_sector('AAA.NS', fetch_missing=False) is None
+    assert source.calls == []
+    assert store.get_sector('AAA.NS') == 'Energy'
+
+    _age(store, 'AAA.NS', 30)
+    assert store.get_sector('AAA.NS') == 'Energy'
+    assert source.calls == ['AAA.NS']
+
+    # Failed fetches are not stored
+    assert store.get_sector('BAD.NS') is None
+    assert store.get_many(['BAD.NS']) == {}
+
+
+def test_refresh_many_fetches_only_missing_or_stale(store):
+    source = store.data_source
+    store.upsert({'AAA.NS': INFOS['AAA.NS']})
+
+    results = store.refresh_many(['AAA.NS', 'BBB.NS', 'BAD.NS'])
+    assert results == {'AAA.NS': True, 'BBB.NS': True, 'BAD.NS': False}
+    assert sorted(source.calls) == ['BAD.NS', 'BBB.NS']
+
+    results = store.refresh_many(['AAA.NS', 'BBB.NS'], force=True)
+    assert results == {'AAA.NS': True, 'BBB.NS': True}
+    assert sorted(source.calls) == ['AAA.NS', 'BAD.NS', 'BBB.NS', 'BBB.NS']
+
+
+def test_info_round_trips_values_json_cannot_encode(store):
+    store.upsert({'AAA.NS': {'sector': 'Energy', 'listed': metadata_store.datetime(2001, 1, 1)}})
+    info = store.get_many(['AAA.NS'])['AAA.NS']['info']
+    assert info['listed'] == '2001-01-01 00:00:00'
@@ -0,0 +1,41 @@
+"""
+Monte Carlo resampling checks.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.strategy.backtester import risk_metrics
+from src.strategy.monte_carlo import monte_carlo, path_metrics, portfolio_returns
+
+
+def _returns(rows=500):
+    return np.random.default_rng(0).normal(3e-4, 0.01, rows)
+
+
+def test_path_metrics_match_risk_metrics():
+    portfolio = pd.DataFrame({'Portfolio Value': 100000 * np.cumprod(1 + _returns())})
+    metrics = path_metrics(portfolio_returns(portfolio))
+    for name, value in risk_metrics(portfolio).items():
+        assert metrics[name][0] == pytest.approx(value, rel=1e-10)
+
+
+@pytest.mark.parametrize('kwargs', [{'n_samples': 0}, {'n_samples': -1},
+                                    {'chunk_size': 0}, {'chunk_size': -5}])
+def test_monte_carlo_rejects_bad_sizes(kwargs):
+    with pytest.raises(ValueError, match='at least 1'):
+        monte_carlo(_returns(), **kwargs)
+
+
+def test_monte_carlo_drops_non_finite_returns():
+    returns = np.r_[_returns(), np.inf, -np.inf, np.nan]
+    distribution = monte_carlo(returns, n_samples=50, seed=1)
+    assert len(distribution) == 50
+    assert np.isfinite(distribution.to_numpy()).all()
+
+
+def test_monte_carlo_independent_of_n_jobs():
+    serial = monte_carlo(_returns(), n_samples=300, seed=2, chunk_size=100)
+    parallel = monte_carlo(_returns(), n_samples=300, seed=2, chunk_size=100, n_jobs=2)
+    pd.testing.assert_frame_equal(serial, parallel)
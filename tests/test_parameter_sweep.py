@@ -0,0 +1,86 @@
+"""
+Parameter sweeps: resuming from the results file and parallel parity.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.data_source import generate_synthetic_bars
+from src.strategy.parameter_sweep import (
+    evaluate_rsi_threshold, load_results, parameter_grid, rsi_threshold_arrays, run_sweep
+)
+
+evaluated = []
+
+
+def recording_evaluate(arrays, params):
+    # Module level so spawn workers can unpickle it
+    evaluated.append(params)
+    if params['threshold'] < 0:
+        raise ValueError('negative threshold')
+    return {'score': float(arrays['Close'].sum() * params['threshold'] + params['window'])}
+
+
+@pytest.fixture
+def arrays():
+    evaluated.clear()
+    return {'Close': np.arange(10, dtype=np.float64)}
+
+
+def test_parameter_grid_order():
+    assert parameter_grid({'a': [1, 2], 'b': ['x', 'y']}) == [
+        {'a': 1, 'b': 'x'}, {'a': 1, 'b': 'y'}, {'a': 2, 'b': 'x'}, {'a': 2, 'b': 'y'}]
+
+
+def test_resume_skips_finished_combinations(tmp_path, arrays):
+    path = str(tmp_path / 'sweep' / 'results.jsonl')
+    combinations = parameter_grid({'threshold': [-0.5, 0.1, 0.2], 'window': np.array([5, 10])})
+
+    first = run_sweep(arrays, combinations[:4], recording_evaluate, path, max_workers=1)
+    assert len(first) == 4 and first['error'].notna().sum() == 2
+    # NumPy parameters are written as plain JSON numbers
+    assert [row['window'] for row in load_results(path)] == [5, 10, 5, 10]
+
+    # A crash left half a line behind
+    with open(path, 'a') as f:
+        f.write('{"threshold": 0.2, "wind')
+    evaluated.clear()
+    resumed = run_sweep(arrays, combinations, recording_evaluate, path, max_workers=1)
+
+    # Failed combinations are retried; finished ones are not
+    assert [(params['threshold'], params['window']) for params in evaluated] == [
+        (-0.5, 5), (-0.5, 10), (0.2, 5), (0.2, 10)]
+    assert len(resumed) == 6
+    ok = resumed[resumed['error'].isna()]
+    assert sorted(zip(ok['threshold'], ok['window'])) == [(0.1, 5), (0.1, 10), (0.2, 5), (0.2, 10)]
+    assert len(load_results(path)) == 8
+
+    # Nothing left to do; combinations outside the requested grid are ignored
+    evaluated.clear()
+    again = run_sweep(arrays, combinations[2:4], recording_evaluate, path, max_workers=1)
+    assert evaluated == [] and len(again) == 2
+
+
+def test_resume_disabled_overwrites(tmp_path, arrays):
+    path = str(tmp_path / 'results.jsonl')
+    combinations = parameter_grid({'threshold': [0.1], 'window': [5, 10]})
+    run_sweep(arrays, combinations, recording_evaluate, path, max_workers=1)
+    run_sweep(arrays, combinations, recording_evaluate, path, max_workers=1, resume=False)
+    assert len(evaluated) == 4
+    assert len(load_results(path)) == 2
+
+
+def test_parallel_sweep_matches_in_process():
+    data = generate_synthetic_bars('SWEEP.NS', 500, end=pd.Timestamp('2026-10-16'))
+    arrays = rsi_threshold_arrays(data)
+    combinations = parameter_grid({'threshold': [0.01, 0.03], 'rsi_oversold': [30, 40], 'rsi_overbought': [70]})
+
+    serial = run_sweep(arrays, combinations, evaluate_rsi_threshold, max_workers=1)
+    parallel = run_sweep(arrays, combinations, evaluate_rsi_threshold, max_workers=2)
+
+    keys = ['threshold', 'rsi_oversold', 'rsi_overbought']
+    serial = serial.sort_values(keys).reset_index(drop=True)
+    parallel = parallel.sort_values(keys).reset_index(drop=True)
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert 'error' not in parallel
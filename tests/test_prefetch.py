@@ -0,0 +1,93 @@
+"""
+Pre-open cache warm-up scheduling and hit rate at the open.
+"""
+
+import pandas as pd
+import pytest
+
+import src.data.cache as cache_module
+from src.data.data_collector import MarketDataCollector
+from src.data.data_source import ReplayDataSource
+from src.data.prefetch import CacheWarmer
+
+SYMBOLS = ['AAA.NS', 'BBB.NS']
+
+
+class CountingSource(ReplayDataSource):
+    """Synthetic source that counts history calls."""
+
+    def __init__(self):
+        super().__init__({}, synthetic_periods=120)
+        self.calls = 0
+
+    def history(self, *args, **kwargs):
+        self.calls += 1
+        return super().history(*args, **kwargs)
+
+
+def _exchange(warmer, wall_clock):
+    return pd.Timestamp(wall_clock, tz=warmer.calendar.timezone)
+
+
+def _freeze(monkeypatch, when):
+    # Drive DataCache expiry from a fixed local time
+    local = when.tz_convert(when.to_pydatetime().astimezone().tzinfo).tz_localize(None).to_pydatetime()
+
+    class FrozenDatetime(cache_module.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return local if tz is None else local.astimezone(tz)
+    monkeypatch.setattr(cache_module, 'datetime', FrozenDatetime)
+
+
+@pytest.fixture
+def warmer():
+    source = CountingSource()
+    collector = MarketDataCollector(store_dir=None, data_source=source, metadata_db=None)
+    # The trading bot's history window
+    return CacheWarmer(collector, symbols=SYMBOLS, history=[('60d', '1d')],
+                       lead_minutes=30, hold_minutes=30, status_path=None)
+
+
+def test_due_only_in_the_lead_window_until_warm(warmer):
+    assert not warmer.is_warm(_exchange(warmer, '2026-10-16 08:00'))
+    assert not warmer.due(_exchange(warmer, '2026-10-16 08:00'))
+    assert not warmer.maybe_warm(_exchange(warmer, '2026-10-16 08:00'))
+    assert warmer.due(_exchange(warmer, '2026-10-16 08:50'))
+
+    assert warmer.maybe_warm(_exchange(warmer, '2026-10-16 08:50'))
+    assert warmer.status['symbols'] == SYMBOLS
+    assert warmer.is_warm(_exchange(warmer, '2026-10-16 12:00'))
+    assert not warmer.due(_exchange(warmer, '2026-10-16 12:00'))
+    assert not warmer.maybe_warm(_exchange(warmer, '2026-10-16 12:00'))
+
+    # Stale after the close; due again before Monday's open, not over the weekend
+    assert not warmer.is_warm(_exchange(warmer, '2026-10-16 16:00'))
+    assert not warmer.due(_exchange(warmer, '2026-10-17 10:00'))
+    assert warmer.due(_exchange(warmer, '2026-10-19 08:50'))
+
+
+def test_due_during_an_unwarmed_session(warmer):
+    assert warmer.due(_exchange(warmer, '2026-10-16 11:00'))
+    assert warmer.warm_expiry(_exchange(warmer, '2026-10-16 11:00')) == _exchange(warmer, '2026-10-16 11:30')
+
+
+def test_first_cycle_after_open_is_a_cache_hit(warmer, monkeypatch):
+    _freeze(monkeypatch, _exchange(warmer, '2026-10-16 08:45'))
+    assert warmer.maybe_warm(_exchange(warmer, '2026-10-16 08:45'))
+    source = warmer.collector.data_source
+    fetched = source.calls
+    misses = warmer.collector.cache.misses
+
+    # The bot's first cycle, one minute into the session
+    _freeze(monkeypatch, _exchange(warmer, '2026-10-16 09:16'))
+    for symbol in SYMBOLS:
+        assert warmer.collector.fetch_stock_data(symbol, period='60d') is not None
+        assert warmer.get_indicators(symbol, period='60d') is not None
+    assert source.calls == fetched
+    assert warmer.collector.cache.misses == misses
+
+    # Warmed entries go stale hold_minutes into the session
+    _freeze(monkeypatch, _exchange(warmer, '2026-10-16 09:46'))
+    warmer.collector.fetch_stock_data(SYMBOLS[0], period='60d')
+    assert source.calls == fetched + 1
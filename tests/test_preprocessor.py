@@ -0,0 +1,80 @@
+"""
+Lazy feature registry parity with the original eager preprocessing.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.data_source import generate_synthetic_bars
+from src.data.preprocessor import DEFAULT_FEATURES, compute_features, preprocess_data
+from src.utils.indicator_graph import IndicatorGraph
+
+
+def _eager_preprocess(data):
+    # The column-by-column implementation the registry replaced
+    data = data.copy()
+    data['Log returns'] = np.log(data['Close'] / data['Close'].shift(1))
+    data['Volatility'] = data['Log returns'].rolling(window=30).std()
+    data['SMA_50'] = data['Close'].rolling(window=50).mean()
+    data['EMA_20'] = data['Close'].ewm(span=20, adjust=False).mean()
+    data['BB_Middle'] = data['Close'].rolling(window=20).mean()
+    data['BB_Std'] = data['Close'].rolling(window=20).std()
+    data['BB_Upper'] = data['BB_Middle'] + 2 * data['BB_Std']
+    data['BB_Lower'] = data['BB_Middle'] - 2 * data['BB_Std']
+    delta = data['Close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    data['RSI_14'] = 100 - (100 / (1 + gain / loss))
+    ema12 = data['Close'].ewm(span=12, adjust=False).mean()
+    ema26 = data['Close'].ewm(span=26, adjust=False).mean()
+    data['MACD'] = ema12 - ema26
+    data['MACD_Signal'] = data['MACD'].ewm(span=9, adjust=False).mean()
+    return data.dropna()
+
+
+@pytest.fixture
+def bars():
+    return generate_synthetic_bars('FEAT.NS', 300, end=pd.Timestamp('2026-10-16'))
+
+
+def test_default_features_match_the_eager_implementation(bars):
+    original = bars.copy()
+    result = preprocess_data(bars)
+
+    pd.testing.assert_frame_equal(bars, original)
+    expected = _eager_preprocess(bars)
+    assert list(result.columns) == list(bars.columns) + DEFAULT_FEATURES
+    pd.testing.assert_frame_equal(result, expected[result.columns], check_exact=False, rtol=1e-12)
+
+
+def test_subset_computes_only_what_it_needs(bars):
+    graph = IndicatorGraph(bars)
+    features = compute_features(bars, ['MACD'], graph)
+    assert list(features) == ['MACD']
+    assert ('rolling', 'std', 20, 'Close') not in graph._nodes
+
+    # MACD_Signal reuses the memoized EMAs and MACD line
+    misses = graph.misses
+    compute_features(bars, ['MACD_Signal'], graph)
+    assert graph.misses == misses
+
+
+def test_parametric_and_passthrough_features(bars):
+    frame = bars.assign(Custom=1.0)
+    features = compute_features(frame, ['SMA_10', 'EMA_5', 'RSI_7', 'Custom'])
+
+    pd.testing.assert_series_equal(features['SMA_10'], bars['Close'].rolling(10).mean())
+    pd.testing.assert_series_equal(features['EMA_5'], bars['Close'].ewm(span=5, adjust=False).mean())
+    assert features['RSI_7'].dropna().between(0, 100).all()
+    pd.testing.assert_series_equal(features['Custom'], frame['Custom'])
+
+    with pytest.raises(KeyError):
+        compute_features(bars, ['NOT_A_FEATURE'])
+
+
+def test_preprocess_replaces_stale_feature_columns(bars):
+    stale = bars.assign(SMA_50=0.0)
+    result = preprocess_data(stale, features=['SMA_50'])
+    assert list(result.columns) == list(bars.columns) + ['SMA_50']
+    pd.testing.assert_series_equal(result['SMA_50'], bars['Close'].rolling(50).mean().dropna(), check_names=False)
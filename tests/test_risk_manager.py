@@ -0,0 +1,65 @@
+"""
+Risk checks never wait on metadata fetches.
+"""
+
+import threading
+import time
+
+import pytest
+
+import src.risk.risk_manager as risk_manager
+from src.data.metadata_store import MetadataStore
+
+
+class BlockingSource:
+    """Data source whose info() blocks until released."""
+
+    name = 'blocking'
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = []
+
+    def info(self, symbol):
+        self.calls.append(symbol)
+        self.release.wait(5)
+        return {'sector': 'Energy', 'longName': symbol}
+
+
+class OpenCalendar:
+    def is_session_day(self, date=None):
+        return True
+
+    def is_open(self, timestamp=None):
+        return True
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = BlockingSource()
+    store = MetadataStore(str(tmp_path / 'metadata.db'), data_source=source)
+    monkeypatch.setattr(risk_manager, 'get_metadata_store', lambda: store)
+    manager = risk_manager.RiskManager(initial_capital=100000)
+    manager.calendar = OpenCalendar()
+    yield manager
+    source.release.set()
+
+
+def test_unknown_symbol_is_validated_without_waiting(manager):
+    source = manager.metadata.data_source
+    started = time.perf_counter()
+    ok, message = manager.validate_trade('NEW.NS', 'BUY', 10, 100.0)
+    assert ok, message
+    # The fetch was handed to a background thread that is still blocked
+    assert time.perf_counter() - started < 1
+
+    thread = manager.metadata.refresh_in_background(['NEW.NS'])
+    assert thread is None   # already in flight
+    source.release.set()
+    for worker in threading.enumerate():
+        if worker.name == 'metadata-refresh':
+            worker.join(5)
+    assert source.calls == ['NEW.NS']
+    assert manager.lookup_sector('NEW.NS') == 'Energy'
+    assert manager.metadata.refresh_in_background(['NEW.NS']) is None
@@ -0,0 +1,41 @@
+"""
+Parity of the streaming rolling variance with pandas.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.streaming_indicators import RollingVariance
+
+
+def _prices(seed, decimals):
+    rng = np.random.default_rng(seed)
+    prices = np.round(100 * np.cumprod(1 + rng.normal(0, 0.02, 2000)), decimals)
+    prices[rng.random(len(prices)) < 0.08] = np.nan
+    prices[500:520] = prices[499]
+    return prices
+
+
+def test_rolling_variance_two_bar_window():
+    variance = RollingVariance(2)
+    result = [variance.update(value) for value in [1, 2, 4, 8, 16]]
+    expected = pd.Series([1, 2, 4, 8, 16], dtype=float).rolling(2).var().tolist()
+    np.testing.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize('window', [2, 3, 4, 20])
+@pytest.mark.parametrize('ddof', [0, 1])
+@pytest.mark.parametrize('decimals', [1, 6])
+def test_rolling_variance_matches_pandas_with_nan_gaps(window, ddof, decimals):
+    prices = _prices(window * 10 + decimals, decimals)
+    variance = RollingVariance(window, ddof=ddof)
+    result_var, result_std = [], []
+    for price in prices:
+        variance.update(price)
+        result_var.append(variance.variance())
+        result_std.append(variance.std())
+
+    rolling = pd.Series(prices).rolling(window)
+    np.testing.assert_array_equal(result_var, rolling.var(ddof=ddof).to_numpy())
+    np.testing.assert_array_equal(result_std, rolling.std(ddof=ddof).to_numpy())
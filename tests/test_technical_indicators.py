@@ -0,0 +1,97 @@
+"""
+Technical indicator regression checks.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.data_source import generate_synthetic_bars
+from src.utils.technical_indicators import (
+    INDICATOR_COLUMNS, TechnicalIndicators, add_all_indicators, moving_average_sweep, panel_indicators
+)
+
+
+def _bars(rows, dtype):
+    rng = np.random.default_rng(7)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, rows))
+    high = close * (1 + rng.uniform(0, 0.01, rows))
+    low = close * (1 - rng.uniform(0, 0.01, rows))
+    return tuple(pd.Series(values.astype(dtype)) for values in (high, low, close))
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.float32])
+@pytest.mark.parametrize('rows', [0, 5, 300])
+def test_cci_methods_agree(dtype, rows):
+    high, low, close = _bars(rows, dtype)
+    vectorized = TechnicalIndicators.commodity_channel_index(high, low, close, method='vectorized')
+    applied = TechnicalIndicators.commodity_channel_index(high, low, close, method='apply')
+    default = TechnicalIndicators.commodity_channel_index(high, low, close)
+    pd.testing.assert_series_equal(vectorized, applied)
+    pd.testing.assert_series_equal(default, vectorized)
+
+
+def test_cci_rejects_unknown_method():
+    high, low, close = _bars(50, np.float64)
+    with pytest.raises(ValueError, match='Unknown CCI method'):
+        TechnicalIndicators.commodity_channel_index(high, low, close, method='auto')
+
+
+@pytest.mark.parametrize('drift', [1, -1])
+def test_moving_average_sweep_accuracy(drift):
+    rng = np.random.default_rng(11)
+    rows = 200_000
+    close = 100 * np.exp(np.cumsum(rng.normal(drift * np.log(100) / rows, 0.01, rows)))
+    close[rng.random(rows) < 0.001] = np.nan
+    # Several prefix-sum block groups, plus directly computed windows near n
+    windows = [1, 5, 20, 50, 300, 1000, 4096, rows // 3, rows - 1, rows]
+    result = moving_average_sweep(close, windows)
+    for row, window in zip(result, windows):
+        expected = TechnicalIndicators.simple_moving_average(pd.Series(close), window).to_numpy()
+        np.testing.assert_array_equal(np.isnan(row), np.isnan(expected))
+        valid = ~np.isnan(expected)
+        np.testing.assert_allclose(row[valid], expected[valid], rtol=1e-13)
+
+
+def _panel(symbols, periods=250):
+    # Aligned (time x symbol) arrays; the last symbol listed late, so its first bars are NaN
+    frames = {symbol: generate_synthetic_bars(symbol, periods, end=pd.Timestamp('2026-10-16'))
+              for symbol in symbols}
+    frames[symbols[-1]] = frames[symbols[-1]].iloc[60:]
+    index = frames[symbols[0]].index
+    columns = {column: np.column_stack([frames[symbol][column].reindex(index).to_numpy(dtype=np.float64)
+                                        for symbol in symbols])
+               for column in ['High', 'Low', 'Close', 'Volume']}
+    return frames, columns
+
+
+def test_panel_matches_add_all_indicators_per_symbol():
+    symbols = ['AAA.NS', 'BBB.NS', 'CCC.NS']
+    frames, columns = _panel(symbols)
+    panel = panel_indicators(columns['High'], columns['Low'], columns['Close'], columns['Volume'])
+    assert list(panel) == INDICATOR_COLUMNS
+
+    for j, symbol in enumerate(symbols):
+        expected = add_all_indicators(frames[symbol])
+        offset = len(columns['Close']) - len(expected)
+        for name in INDICATOR_COLUMNS:
+            np.testing.assert_allclose(panel[name][offset:, j], expected[name].to_numpy(),
+                                       rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=name)
+            assert np.isnan(panel[name][:offset, j]).all()
+
+
+def test_panel_output_formats_and_validation():
+    _, columns = _panel(['AAA.NS', 'BBB.NS'])
+    stacked, names = panel_indicators(columns['High'], columns['Low'], columns['Close'],
+                                      as_array=True, dtype=np.float32)
+    assert names == [name for name in INDICATOR_COLUMNS if name not in ('OBV', 'MFI_14')]
+    assert stacked.shape == (len(names),) + columns['Close'].shape
+    assert stacked.dtype == np.float32
+
+    reference = panel_indicators(columns['High'], columns['Low'], columns['Close'])
+    np.testing.assert_allclose(stacked[names.index('RSI_14')], reference['RSI_14'], rtol=1e-5, equal_nan=True)
+
+    with pytest.raises(ValueError):
+        panel_indicators(columns['High'][:, 0], columns['Low'][:, 0], columns['Close'][:, 0])
+    with pytest.raises(ValueError):
+        panel_indicators(columns['High'][1:], columns['Low'], columns['Close'])
@@ -0,0 +1,62 @@
+"""
+NSE trading calendar sessions, holidays and coverage warnings.
+"""
+
+import logging
+
+import pandas as pd
+import pytest
+
+from src.data.trading_calendar import HOLIDAYS_FILE, TradingCalendar
+
+
+@pytest.fixture
+def calendar():
+    return TradingCalendar.from_config(HOLIDAYS_FILE)
+
+
+def _at(calendar, wall_clock):
+    return pd.Timestamp(wall_clock, tz=calendar.timezone)
+
+
+def test_holidays_and_weekends_are_not_sessions(calendar):
+    assert calendar.is_session_day('2026-10-19')
+    assert not calendar.is_session_day('2026-10-20')   # holiday
+    assert not calendar.is_session_day('2026-10-17')   # Saturday
+    assert calendar.is_open(_at(calendar, '2026-10-19 10:00'))
+    assert not calendar.is_open(_at(calendar, '2026-10-20 10:00'))
+    assert not calendar.is_open(_at(calendar, '2026-10-19 15:31'))
+
+
+def test_next_open_and_close_skip_a_holiday(calendar):
+    after_close = _at(calendar, '2026-10-19 16:00')
+    assert calendar.next_open(after_close) == _at(calendar, '2026-10-21 09:15')
+    assert calendar.next_close(after_close) == _at(calendar, '2026-10-21 15:30')
+    assert calendar.previous_close(_at(calendar, '2026-10-21 09:00')) == _at(calendar, '2026-10-19 15:30')
+    assert not calendar.was_open_between(after_close, _at(calendar, '2026-10-21 09:00'))
+    assert calendar.sessions_between('2026-10-16', '2026-10-21').strftime('%m-%d').tolist() == [
+        '10-16', '10-19', '10-21']
+
+
+def test_sessions_mask_matches_scalar_checks(calendar):
+    index = pd.date_range('2026-10-16 09:00', '2026-10-21 16:00', freq='30min', tz=calendar.timezone)
+    expected = [calendar.is_open(timestamp) for timestamp in index]
+    assert calendar.sessions_mask(index).tolist() == expected
+
+
+def test_years_outside_the_holiday_table_warn_once(calendar, caplog):
+    assert calendar.holiday_years == frozenset({2023, 2024, 2025, 2026})
+    with caplog.at_level(logging.WARNING, logger='src.data.trading_calendar'):
+        calendar.is_open(_at(calendar, '2026-10-19 10:00'))
+        assert not caplog.records
+        calendar.is_open(_at(calendar, '2019-03-04 10:00'))
+        calendar.is_session_day('2019-03-05')
+        calendar.sessions_mask(pd.DatetimeIndex(['2019-03-06']), intraday=False)
+    assert len(caplog.records) == 1
+    assert '2019' in caplog.records[0].getMessage()
+
+
+def test_weekday_only_calendar_does_not_warn(caplog):
+    with caplog.at_level(logging.WARNING, logger='src.data.trading_calendar'):
+        TradingCalendar().is_open(pd.Timestamp('2019-03-04 10:00', tz='Asia/Kolkata'))
+    assert not caplog.records
@@ -0,0 +1,98 @@
+"""
+Per-bar data-quality flags.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import validation
+from src.data.data_collector import MarketDataCollector
+from src.data.data_source import ReplayDataSource
+from src.data.trading_calendar import TradingCalendar
+from src.data.validation import FLAG_COLUMN, describe_flags, summarize_flags, validate_bars
+
+
+def _bars(rows=30):
+    rng = np.random.default_rng(3)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, rows))
+    return pd.DataFrame({
+        'Open': close * 0.999,
+        'High': close * 1.01,
+        'Low': close * 0.99,
+        'Close': close,
+        'Volume': rng.integers(1000, 2000, rows).astype(float),
+    }, index=pd.bdate_range('2026-01-05', periods=rows))
+
+
+@pytest.fixture
+def calendar():
+    return TradingCalendar(holidays=['2026-10-20'], start_year=2026, end_year=2026)
+
+
+def test_clean_bars_have_no_flags():
+    assert not validate_bars(_bars()).any()
+
+
+@pytest.mark.parametrize('flag, column, value', [
+    (validation.MISSING_PRICE, 'Open', lambda bar: np.nan),
+    (validation.NONPOSITIVE_PRICE, 'Low', lambda bar: -1.0),
+    (validation.HIGH_BELOW_LOW, 'High', lambda bar: bar['Low'] * 0.5),
+    (validation.OUTSIDE_RANGE, 'Open', lambda bar: bar['High'] * 1.5),
+    (validation.ZERO_VOLUME, 'Volume', lambda bar: 0.0),
+])
+def test_each_price_flag_marks_only_the_bad_bar(flag, column, value):
+    data = _bars()
+    data.iloc[10, data.columns.get_loc(column)] = value(data.iloc[10])
+    flags = validate_bars(data)
+    assert flags[10] & flag
+    assert not (np.delete(flags, 10) & flag).any()
+
+
+def test_outlier_return_and_stale_repeat():
+    data = _bars()
+    data.iloc[10, :4] = data.iloc[10, :4] * 3
+    data.iloc[20] = data.iloc[19]
+    flags = validate_bars(data)
+    assert flags[10] & validation.OUTLIER_RETURN
+    assert flags[20] & validation.STALE_REPEAT
+    assert not (flags[:10] & validation.OUTLIER_RETURN).any()
+    assert describe_flags(flags[20]) == ['stale_repeat']
+    assert summarize_flags(flags)['stale_repeat'] == 1
+
+
+def test_daily_calendar_gaps_and_sessions(calendar):
+    # Fri, Mon, Wed (Tue is a holiday), Fri (Thu missing), Sat
+    days = ['2026-10-16', '2026-10-19', '2026-10-21', '2026-10-23', '2026-10-24']
+    data = _bars(len(days)).set_axis(pd.DatetimeIndex(days))
+    flags = validate_bars(data, '1d', calendar)
+    gaps = (flags & validation.CALENDAR_GAP) > 0
+    out = (flags & validation.OUT_OF_SESSION) > 0
+    assert gaps.tolist() == [False, False, False, True, False]
+    assert out.tolist() == [False, False, False, False, True]
+
+
+def test_intraday_calendar_gaps_and_sessions(calendar):
+    times = [
+        '2026-10-16 09:15', '2026-10-16 09:20',
+        '2026-10-16 09:30',                     # 09:25 missing
+        '2026-10-16 16:00',                     # after the close
+        '2026-10-19 09:15',                     # next session, not a gap
+        '2026-10-22 09:15',                     # 21 Oct session skipped
+    ]
+    index = pd.DatetimeIndex(times).tz_localize(calendar.timezone)
+    data = _bars(len(times)).set_axis(index)
+    flags = validate_bars(data, '5m', calendar)
+    gaps = (flags & validation.CALENDAR_GAP) > 0
+    out = (flags & validation.OUT_OF_SESSION) > 0
+    assert gaps.tolist() == [False, False, True, True, False, True]
+    assert out.tolist() == [False, False, False, True, False, False]
+
+
+def test_collector_validation_is_opt_in():
+    source = ReplayDataSource({}, synthetic_periods=60)
+    plain = MarketDataCollector(store_dir=None, data_source=source, metadata_db=None)
+    checked = MarketDataCollector(store_dir=None, data_source=source, metadata_db=None, validate=True)
+    assert FLAG_COLUMN not in plain.fetch_stock_data('TEST.NS', period='1mo').columns
+    flags = checked.fetch_stock_data('TEST.NS', period='1mo')[FLAG_COLUMN]
+    assert flags.dtype == np.uint16
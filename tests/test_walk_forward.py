@@ -0,0 +1,62 @@
+"""
+Walk-forward fold layout and forecast caching.
+"""
+
+import numpy as np
+import pytest
+
+import src.strategy.walk_forward as walk_forward
+from src.data.data_source import generate_synthetic_bars
+from src.strategy.walk_forward import walk_forward_analysis, walk_forward_splits
+
+
+def test_expanding_splits_cover_the_tail_in_order():
+    splits = walk_forward_splits(1000, n_splits=4, train_size=252, test_size=63)
+    assert splits[0] == (0, 748, 748, 811)
+    assert splits[-1] == (0, 937, 937, 1000)
+    for (_, train_end, test_start, test_end), (_, next_train_end, next_start, _) in zip(splits, splits[1:]):
+        assert train_end == test_start
+        assert next_start == test_end == next_train_end
+
+
+def test_rolling_splits_keep_a_fixed_training_window():
+    splits = walk_forward_splits(1000, n_splits=4, train_size=252, test_size=63, window='rolling')
+    assert all(train_end - train_start == 252 for train_start, train_end, _, _ in splits)
+    assert splits[0] == (496, 748, 748, 811)
+
+
+def test_splits_reject_too_little_data_and_unknown_windows():
+    # 4 * 63 test rows leave 251 < 252 training rows
+    with pytest.raises(ValueError, match='too few'):
+        walk_forward_splits(503, n_splits=4, train_size=252, test_size=63)
+    assert walk_forward_splits(504, n_splits=4, train_size=252, test_size=63)
+    with pytest.raises(ValueError, match='Unknown window'):
+        walk_forward_splits(1000, window='sliding')
+
+
+def test_rerun_is_served_from_the_forecast_cache(tmp_path, monkeypatch):
+    calls = []
+
+    def naive(train, steps):
+        calls.append(len(train))
+        return np.full(steps, train['Close'].iloc[-1])
+
+    def drift(train, steps):
+        calls.append(len(train))
+        return train['Close'].iloc[-1] * np.ones(steps) * 1.001
+
+    monkeypatch.setitem(walk_forward.FORECASTERS, 'stub', naive)
+    data = generate_synthetic_bars('TEST.NS', periods=400)
+    kwargs = dict(n_splits=3, train_size=200, test_size=20, models=('stub',),
+                  max_workers=1, cache_dir=str(tmp_path))
+
+    first = walk_forward_analysis(data, **kwargs)
+    assert len(calls) == 3
+    second = walk_forward_analysis(data, **kwargs)
+    assert len(calls) == 3
+    np.testing.assert_array_equal(first['mse'], second['mse'])
+
+    # A changed forecaster must not reuse the old forecasts
+    monkeypatch.setitem(walk_forward.FORECASTERS, 'stub', drift)
+    walk_forward_analysis(data, **kwargs)
+    assert len(calls) == 6
@@ -7,7 +7,6 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 import plotly.utils
-import yfinance as yf
 from datetime import datetime, timedelta
 import json
 import os
@@ -25,6 +24,7 @@ os.makedirs('logs', exist_ok=True)
 
 # Import blueprints
 from apps.symbol_manager import symbol_bp
+from src.data.data_source import get_data_source
 
 # Register blueprints
 app.register_blueprint(symbol_bp)
@@ -179,45 +179,17 @@ def get_stock_data(symbol):
             # For other stocks, remove any exchange suffixes
             clean_symbol = symbol.split('.')[0]
         
-        # Get the ticker object
-        ticker = yf.Ticker(clean_symbol)
+        data_source = get_data_source()
         
-        # Try to fetch data with a 1-month period first
-        try:
-            data = yf.download(
-                clean_symbol, 
-                period="1mo",
-                progress=False
-            )
-            if data.empty:
-                raise ValueError("Empty data returned")
-        except:
-            # If 1mo fails, try 3mo
+        # Try a 1-month period first and widen it if nothing comes back
+        data = pd.DataFrame()
+        for period in ['1mo', '3mo', '6mo', '1y']:
             try:
-                data = yf.download(
-                    clean_symbol, 
-                    period="3mo",
-                    progress=False
-                )
-                if data.empty:
-                    raise ValueError("Empty data returned")
-            except:
-                # If 3mo fails, try 6mo
-                try:
-                    data = yf.download(
-                        clean_symbol, 
-                        period="6mo",
-                        progress=False
-                    )
-                    if data.empty:
-                        raise ValueError("Empty data returned")
-                except:
-                    # Final fallback to 1y
-                    data = yf.download(
-                        clean_symbol, 
-                        period="1y",
-                        progress=False
-                    )
+                data = data_source.history(clean_symbol, period=period)
+            except Exception:
+                continue
+            if not data.empty:
+                break
         
         if data.empty:
             return jsonify({
@@ -235,15 +207,15 @@ def get_stock_data(symbol):
         # Get current quote for accurate pricing
         try:
             # First try to get real-time data
-            current_info = ticker.fast_info
-            current_price = current_info.last_price
+            quote = data_source.latest_quote(clean_symbol) or {}
+            current_price = quote.get('last_price')
             
             # If real-time price is not available, use the last close
             if current_price is None:
                 current_price = data['Close'].iloc[-1]
             
             # Try to get previous close
-            prev_close = current_info.previous_close
+            prev_close = quote.get('previous_close')
             if prev_close is None:
                 prev_close = data['Close'].iloc[-2]
         except:
@@ -349,7 +321,7 @@ def health_check():
 def search_symbols(query):
     """Search for stock symbols by company name"""
     try:
-        search_results = yf.Ticker(query).info
+        search_results = get_data_source().info(query)
         results = [{
             'symbol': search_results.get('symbol', query),
             'name': search_results.get('shortName', query),